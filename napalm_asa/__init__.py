@@ -14,5 +14,6 @@
 
 """napalm-asa package."""
 from napalm_asa.asa import ASADriver  # noqa
+from napalm_asa.asa_async import AsyncASADriver  # noqa
 
-__all__ = ("ASADriver",)
+__all__ = ("ASADriver", "AsyncASADriver")
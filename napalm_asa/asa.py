@@ -21,27 +21,207 @@ Read https://napalm.readthedocs.io for more information.
 from __future__ import unicode_literals
 
 import requests
-import re
+import functools
+import inspect
 import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+from urllib.parse import urlparse
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
-from collections import OrderedDict
-
-# import third party lib
-from netaddr import IPNetwork
 
 # Napalm base imports
-from napalm.base.helpers import sanitize_configs
 from napalm.base import NetworkDriver
 from napalm.base.exceptions import (
+    CommitError,
     ConnectionException,
     CommandErrorException,
+    MergeConfigException,
+    ReplaceConfigException,
 )
 from napalm_asa._SUPPORTED_INTERFACES_ENDPOINTS import SUPPORTED_INTERFACES_ENDPOINTS
-from napalm_asa.constants import ASA_SANITIZE_FILTERS
+from napalm_asa.constants import (
+    ASA_ACCESS_DIRECTIONS,
+    ASA_CONFIG_SECTIONS,
+    ASA_MAX_PAGE_LIMIT,
+    ASA_OBJECT_COLLECTIONS,
+)
+from napalm_asa.config_cache import FileConfigCache, MemoryConfigCache
+from napalm_asa.token_store import FileTokenStore
+from napalm_asa.utils.config_diff import (
+    config_command_lines,
+    diff_configs,
+    merge_diff,
+    replace_commands,
+)
+from napalm_asa.utils.config_model import parse_config
+from napalm_asa.utils.http import make_session, shared_session
+from napalm_asa.utils.json_codec import get_json_loads, iter_json_strings
+from napalm_asa.utils.retry import AIMDLimiter, RetryPolicy
+from napalm_asa.utils.sanitizer import (
+    sanitize_config,
+    sanitize_configs,
+    sanitize_lines,
+)
+from napalm_asa.utils.singleflight import SingleFlight
+from napalm_asa.utils.parsers import (
+    iter_access_rules,
+    iter_arp_entries,
+    iter_rest_objects,
+    parse_interfaces,
+    parse_interfaces_details,
+    parse_cli_error,
+    parse_interfaces_ip,
+    parse_show_checksum,
+    parse_show_interface,
+    parse_show_inventory,
+    parse_show_version,
+)
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
 
+def _session_from_args(host, optional_args):
+    """Build, or get the shared, HTTP session configured by ``optional_args``."""
+    settings = {
+        "pool_connections": optional_args.get("pool_connections", 10),
+        "pool_maxsize": optional_args.get("pool_maxsize", 10),
+        "pool_block": optional_args.get("pool_block", False),
+        "keep_alive": optional_args.get("keep_alive", True),
+        "compression": optional_args.get("compression", True),
+    }
+    if optional_args.get("share_session", False):
+        return shared_session(host, **settings)
+
+    return make_session(**settings)
+
+
+def _cli_batches(commands, batch_size=None, batch_bytes=None):
+    """
+    Split ``commands`` into batches of at most ``batch_size`` commands and
+    ``batch_bytes`` bytes of JSON payload. A command larger than
+    ``batch_bytes`` is sent in a batch of its own.
+    """
+    batches = []
+    batch = []
+    size = 0
+    for command in commands:
+        command_size = len(json.dumps(command).encode("utf-8")) + 2
+        if batch and (
+            (batch_size and len(batch) >= batch_size)
+            or (batch_bytes and size + command_size > batch_bytes)
+        ):
+            batches.append(batch)
+            batch = []
+            size = 0
+        batch.append(command)
+        size += command_size
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def _config_chunks(commands, chunk_size=None, chunk_bytes=None):
+    """
+    Split config ``commands`` into /cli chunks of at most ``chunk_size``
+    commands and ``chunk_bytes`` bytes of JSON payload.
+
+    Every request starts in global configuration mode, so chunks end before a
+    top-level command. A section larger than a chunk is split, and its
+    continuation chunks start with its header again. Yield lists of ``(index,
+    command)``, ``index`` being the position of the command in ``commands``.
+    """
+
+    def fits(count, size):
+        return (not chunk_size or count <= chunk_size) and (
+            not chunk_bytes or size <= chunk_bytes
+        )
+
+    sections = []
+    for index, line in enumerate(commands):
+        command = line.strip()
+        entry = (index, command, len(json.dumps(command).encode("utf-8")) + 2)
+        if line[:1].isspace() and sections:
+            sections[-1].append(entry)
+        else:
+            sections.append([entry])
+
+    chunk = []
+    size = 0
+    for section in sections:
+        section_size = sum(entry[2] for entry in section)
+        if chunk and not fits(len(chunk) + len(section), size + section_size):
+            yield [entry[:2] for entry in chunk]
+            chunk = []
+            size = 0
+        if fits(len(chunk) + len(section), size + section_size):
+            chunk.extend(section)
+            size += section_size
+            continue
+
+        header = section[0]
+        for entry in section:
+            if chunk and not fits(len(chunk) + 1, size + entry[2]):
+                yield [entry[:2] for entry in chunk]
+                chunk = [header]
+                size = header[2]
+            chunk.append(entry)
+            size += entry[2]
+
+    if chunk:
+        yield [entry[:2] for entry in chunk]
+
+
+def _cli_results(batches, outcomes):
+    """
+    Reassemble the outputs of the /cli batches, in the order of the commands.
+
+    ``outcomes`` holds the response or the exception of each batch. If a batch
+    failed, raise a CommandErrorException whose ``results`` attribute holds
+    the outputs of the commands that ran, and ``failures`` the error of each
+    command that did not.
+    """
+    results = {}
+    failures = {}
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, Exception):
+            for command in batch:
+                failures[command] = str(outcome)
+            continue
+        for command, result in zip(batch, outcome["response"]):
+            results[command] = result
+
+    if failures:
+        error = CommandErrorException(
+            "{} of {} commands failed: {}".format(
+                len(failures),
+                len(failures) + len(results),
+                next(iter(failures.values())),
+            )
+        )
+        error.results = results
+        error.failures = failures
+        raise error
+
+    return results
+
+
+def _iter_lines(fragments):
+    """Regroup text fragments into lines, keeping their trailing newline."""
+    pending = ""
+    for fragment in fragments:
+        lines = (pending + fragment).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
 class RespFetcherHttps:
     """Response fetcher."""
 
@@ -51,6 +231,16 @@ class RespFetcherHttps:
         password="insieme",
         base_url="https://172.21.128.227/api",
         timeout=30,
+        token_store=None,
+        alive_freshness=0,
+        token_idle_timeout=None,
+        retry_policy=None,
+        limiter=None,
+        hooks=None,
+        json_codec=None,
+        coalesce=True,
+        session=None,
+        verify=False,
     ):
         """Class init."""
         self.username = username
@@ -58,7 +248,21 @@ class RespFetcherHttps:
         self.base_url = base_url
         self.timeout = timeout
         self.token = ""
-        self.session = requests.Session()
+        self.token_store = token_store
+        self.token_key = "{}@{}".format(username, base_url)
+        self.alive_freshness = alive_freshness
+        self.token_idle_timeout = token_idle_timeout
+        self.token_acquired = None
+        self.last_success = None
+        self._auth_lock = threading.Lock()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.limiter = limiter
+        self.hooks = hooks if hooks is not None else []
+        self.host = urlparse(base_url).netloc
+        self.json_loads = get_json_loads(json_codec)
+        self.single_flight = SingleFlight() if coalesce else None
+        self.session = session if session is not None else make_session()
+        self.verify = verify
         self.headers = {"Content-Type": "application/json"}
 
     def get_auth_token(self):
@@ -70,16 +274,15 @@ class RespFetcherHttps:
                 auth=(self.username, self.password),
                 data="",
                 timeout=self.timeout,
-                verify=False,
+                verify=self.verify,
             )
             if (
                 token_request.status_code == 204
                 and "X-Auth-Token" in token_request.headers.keys()
             ):
-                self.token = token_request.headers["X-Auth-Token"]
-                self.session.headers.update(
-                    {"X-Auth-Token": token_request.headers["X-Auth-Token"]}
-                )
+                self._set_token(token_request.headers["X-Auth-Token"])
+                if self.token_store is not None:
+                    self.token_store.set(self.token_key, self.token)
                 return (True, None)
             else:
                 return (False, token_request.status_code)
@@ -94,38 +297,180 @@ class RespFetcherHttps:
                 full_url,
                 auth=(self.username, self.password),
                 timeout=self.timeout,
-                verify=False,
+                verify=self.verify,
             )
             if token_delete_request.status_code == 204:
-                self.session.headers.pop("X-Auth-Token", None)
+                self.token = ""
+                self.token_acquired = None
+                self.last_success = None
+                if self.token_store is not None:
+                    self.token_store.delete(self.token_key)
                 return (True, None)
             else:
                 return (False, token_delete_request.status_code)
         except requests.exceptions.RequestException as e:
             raise ConnectionException(str(e))
 
-    def get_resp(self, endpoint="", data=None, params={}, throw=True):
-        """Get response from device and returne parsed json."""
-        full_url = self.base_url + endpoint
-        f = None
+    def _set_token(self, token, verified=True):
+        self.token = token
+        self.token_acquired = time.monotonic()
+        self.last_success = self.token_acquired if verified else None
+
+    def _reauth(self, stale_token):
+        """
+        Replace ``stale_token`` with a new token.
+
+        Concurrent callers that saw the same stale token wait for the first one
+        to re-authenticate and then reuse its token.
+        """
+        with self._auth_lock:
+            if self.token != stale_token:
+                return True
+            auth_result, code = self.get_auth_token()
+            return auth_result
+
+    @property
+    def token_age(self):
+        """Seconds since the current token was acquired, or None."""
+        if self.token_acquired is None:
+            return None
+        return time.monotonic() - self.token_acquired
+
+    def load_token(self):
+        """Use the token kept in the token store, if any."""
+        if self.token_store is None:
+            return False
+
+        token = self.token_store.get(self.token_key)
+        if not token:
+            return False
+
+        self._set_token(token, verified=False)
+        return True
+
+    def _send(self, full_url, data, params, stream=False):
+        """Send one request, within the concurrency limit."""
+        # The token is sent per request, the shared session is never modified.
+        headers = self.headers
+        token = self.token
+        if token:
+            headers = dict(headers)
+            headers["X-Auth-Token"] = token
+        if self.limiter is not None:
+            self.limiter.acquire()
+        start = time.monotonic()
+        overloaded = True
         try:
             if data is not None:
                 f = self.session.post(
                     full_url,
                     data=data,
-                    headers=self.headers,
+                    headers=headers,
                     timeout=self.timeout,
                     params=params,
-                    verify=False,
+                    verify=self.verify,
+                    stream=stream,
                 )
             else:
                 f = self.session.get(
                     full_url,
-                    headers=self.headers,
+                    headers=headers,
                     timeout=self.timeout,
                     params=params,
-                    verify=False,
+                    verify=self.verify,
+                    stream=stream,
                 )
+            overloaded = f.status_code in self.retry_policy.statuses
+            return f
+        finally:
+            if self.limiter is not None:
+                self.limiter.release(time.monotonic() - start, overloaded)
+
+    def _emit(self, hook_name, event):
+        for hook in self.hooks:
+            getattr(hook, hook_name)(event)
+
+    def _send_with_retries(self, full_url, data, params, event=None):
+        """Send a request, retrying GETs as allowed by the retry policy."""
+        attempt = 0
+        while True:
+            if event is not None:
+                event["retries"] = attempt
+            try:
+                f = self._send(full_url, data, params)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                # Only GETs are idempotent, a /cli POST may carry config commands.
+                if data is not None or not self.retry_policy.can_retry(attempt):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt))
+            else:
+                if (
+                    data is not None
+                    or f.status_code not in self.retry_policy.statuses
+                    or not self.retry_policy.can_retry(attempt)
+                ):
+                    return f
+                time.sleep(
+                    self.retry_policy.delay(attempt, f.headers.get("Retry-After"))
+                )
+            attempt += 1
+
+    def _current_token(self, reauth):
+        """Return the token to send, renewing it first if it has been idle too long."""
+        token = self.token
+        if (
+            reauth
+            and token
+            and self.token_idle_timeout
+            and self.last_success is not None
+            and time.monotonic() - self.last_success > self.token_idle_timeout
+        ):
+            # The device has already dropped the idle token, skip the 401.
+            self._reauth(token)
+            token = self.token
+        return token
+
+    def _start_event(self, endpoint, data, params):
+        if not self.hooks:
+            return None
+        event = {
+            "host": self.host,
+            "method": "GET" if data is None else "POST",
+            "endpoint": endpoint,
+            "offset": params.get("offset", 0),
+        }
+        self._emit("request_start", event)
+        return event
+
+    def get_resp(self, endpoint="", data=None, params={}, throw=True, reauth=True):
+        """Get response from device and returne parsed json."""
+        full_url = self.base_url + endpoint
+        f = None
+        token = self._current_token(reauth)
+        start = time.monotonic()
+        event = self._start_event(endpoint, data, params)
+        try:
+            if data is None and self.single_flight is not None:
+                # Concurrent identical GETs share one request.
+                key = (full_url, tuple(sorted(params.items())), self.token)
+                f, shared = self.single_flight.do(
+                    key, self._send_with_retries, full_url, data, params, event
+                )
+                if shared and event is not None:
+                    event["coalesced"] = True
+            else:
+                f = self._send_with_retries(full_url, data, params, event)
+            if event is not None:
+                event["status"] = f.status_code
+                event["bytes"] = len(f.content)
+            if f.status_code == 401 and reauth and token:
+                # The token expired or was revoked, get a new one and retry once.
+                if self._reauth(token):
+                    return self.get_resp(endpoint, data, params, throw, reauth=False)
+
             if f.status_code != 200:
                 if throw:
                     errMsg = "Operation returned an error: {}".format(f.status_code)
@@ -133,18 +478,82 @@ class RespFetcherHttps:
                 else:
                     return False
 
-            return f.json()
-        except requests.exceptions.RequestException as e:
+            self.last_success = time.monotonic()
+            return self.json_loads(f.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if event is not None:
+                event["error"] = e
             if throw:
                 raise ConnectionException(str(e))
             else:
                 return False
+        finally:
+            if event is not None:
+                event["duration"] = time.monotonic() - start
+                self._emit("request_end", event)
+
+    def stream_resp(self, endpoint="", data=None, chunk_size=65536, reauth=True):
+        """
+        Yield the raw body of a response in chunks of ``chunk_size`` bytes.
+
+        The body is never held in memory as a whole. Requests are not retried,
+        except once after a 401, before any chunk was yielded.
+        """
+        full_url = self.base_url + endpoint
+        token = self._current_token(reauth)
+        start = time.monotonic()
+        event = self._start_event(endpoint, data, {})
+        f = None
+        try:
+            f = self._send(full_url, data, {}, stream=True)
+            if event is not None:
+                event["status"] = f.status_code
+                event["bytes"] = 0
+            if f.status_code == 401 and reauth and token and self._reauth(token):
+                f.close()
+                for chunk in self.stream_resp(endpoint, data, chunk_size, False):
+                    yield chunk
+                return
+
+            if f.status_code != 200:
+                errMsg = "Operation returned an error: {}".format(f.status_code)
+                raise CommandErrorException(errMsg)
+
+            for chunk in f.iter_content(chunk_size):
+                if event is not None:
+                    event["bytes"] += len(chunk)
+                yield chunk
+            self.last_success = time.monotonic()
+        except requests.exceptions.RequestException as e:
+            if event is not None:
+                event["error"] = e
+            raise ConnectionException(str(e))
+        finally:
+            if f is not None:
+                f.close()
+            if event is not None:
+                event["duration"] = time.monotonic() - start
+                self._emit("request_end", event)
 
     def has_active_token(self):
+        """
+        Check that the device still accepts the auth token.
+
+        A token used successfully within the last ``alive_freshness`` seconds is
+        assumed active without asking the device.
+        """
         status = False
-        if "X-Auth-Token" in self.session.headers:
+        if (
+            self.token
+            and self.alive_freshness
+            and self.last_success is not None
+            and time.monotonic() - self.last_success < self.alive_freshness
+        ):
+            return True
+
+        if self.token:
             response = self.get_resp("/monitoring/serialnumber", throw=False)
-            if "kind" in response and response["kind"] == "object#QuerySerialNumber":
+            if response and response.get("kind") == "object#QuerySerialNumber":
                 status = True
 
         return status
@@ -160,12 +569,128 @@ class ASADriver(NetworkDriver):
         self.password = password
         self.hostname = hostname
         self.port = optional_args.get("port", 443)
+        self.page_limit = optional_args.get("page_limit")
+        self.parallel_pages = optional_args.get("parallel_pages", False)
+        if self.parallel_pages and not self.page_limit:
+            self.page_limit = ASA_MAX_PAGE_LIMIT
+        self.page_workers = optional_args.get("page_workers", 4)
+        self.snapshot_cache = optional_args.get("snapshot_cache", False)
+        self.snapshot_cache_ttl = optional_args.get("snapshot_cache_ttl", 60)
+        self._snapshots = {}
+        self._snapshots_lock = threading.Lock()
+        self.bulk_interface_details = optional_args.get("bulk_interface_details", False)
+        self.fast_facts = optional_args.get("fast_facts", False)
+        self.cli_batch_size = optional_args.get("cli_batch_size")
+        self.cli_batch_bytes = optional_args.get("cli_batch_bytes")
+        self.cli_workers = optional_args.get("cli_workers", 4)
+        self.config_chunk_size = optional_args.get("config_chunk_size", 500)
+        self.config_chunk_bytes = optional_args.get("config_chunk_bytes")
+        self.commit_progress = optional_args.get("commit_progress")
+        self.write_memory = optional_args.get("write_memory", False)
+        self.hooks = list(optional_args.get("hooks", ()))
         self.timeout = timeout
         self.up = False
+        self.candidate_config = None
+        self.config_replace = False
+        self._config_model = None
         self.base_url = "https://{}:{}/api".format(self.hostname, self.port)
+        # Label of the device in the hook events, as RespFetcherHttps sets it.
+        self._host_label = urlparse(self.base_url).netloc
+        self.config_cache = optional_args.get("config_cache")
+        if self.config_cache is True:
+            self.config_cache = MemoryConfigCache()
+        elif isinstance(self.config_cache, str):
+            self.config_cache = FileConfigCache(self.config_cache)
+        elif not self.config_cache:
+            self.config_cache = None
+        self.token_store = optional_args.get("token_store")
+        if isinstance(self.token_store, str):
+            self.token_store = FileTokenStore(self.token_store)
         self.device = RespFetcherHttps(
-            self.username, self.password, self.base_url, self.timeout
+            self.username,
+            self.password,
+            self.base_url,
+            self.timeout,
+            token_store=self.token_store,
+            alive_freshness=optional_args.get("alive_freshness", 0),
+            token_idle_timeout=optional_args.get("token_idle_timeout"),
+            retry_policy=optional_args.get("retry_policy")
+            or RetryPolicy(
+                retries=optional_args.get("retries", 0),
+                backoff=optional_args.get("retry_backoff", 0.5),
+            ),
+            limiter=self._make_limiter(optional_args),
+            hooks=self.hooks,
+            json_codec=optional_args.get("json_codec"),
+            coalesce=optional_args.get("coalesce_requests", True),
+            session=_session_from_args(
+                "{}:{}".format(self.hostname, self.port), optional_args
+            ),
+            verify=optional_args.get("verify", False),
         )
+        if self.hooks:
+            self._instrument_methods()
+
+    @staticmethod
+    def _make_limiter(optional_args):
+        """Build the concurrency limiter requested in ``optional_args``, if any."""
+        if "limiter" in optional_args:
+            return optional_args["limiter"]
+        if optional_args.get("max_concurrency"):
+            return AIMDLimiter(
+                optional_args["max_concurrency"],
+                latency_target=optional_args.get("latency_target"),
+            )
+        return None
+
+    def _emit(self, hook_name, event):
+        for hook in self.hooks:
+            getattr(hook, hook_name)(event)
+
+    def _instrument_methods(self):
+        """
+        Report a span to the hooks for every call of the NAPALM API methods.
+
+        The wrappers are set on the instance, so the class keeps the method
+        signatures checked against NetworkDriver.
+        """
+        for name in dir(NetworkDriver):
+            if name.startswith("_") or not inspect.isfunction(
+                getattr(NetworkDriver, name)
+            ):
+                continue
+            if getattr(type(self), name) is getattr(NetworkDriver, name):
+                continue
+            setattr(self, name, self._spanned(name, getattr(self, name)))
+
+    def _spanned(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            event = {"host": self._host_label, "getter": name}
+            self._emit("span_start", event)
+            start = time.monotonic()
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                event["error"] = e
+                raise
+            finally:
+                event["duration"] = time.monotonic() - start
+                self._emit("span_end", event)
+
+        return wrapper
+
+    def _emit_page(self, endpoint, number, page):
+        if self.hooks and page:
+            self._emit(
+                "page",
+                {
+                    "host": self._host_label,
+                    "endpoint": endpoint,
+                    "page": number,
+                    "items": len(page.get("items", ())),
+                },
+            )
 
     def _authenticate(self):
         """Authenticate with device."""
@@ -173,6 +698,10 @@ class ASADriver(NetworkDriver):
 
         return auth_result
 
+    def _resume_token(self):
+        """Reuse the stored auth token if the device still accepts it."""
+        return self.device.load_token() and self.device.has_active_token()
+
     def _delete_token(self):
         """Delete auth token."""
 
@@ -180,67 +709,235 @@ class ASADriver(NetworkDriver):
 
         return delete_result
 
+    def _get_page(self, endpoint, data=None, offset=0, throw=True):
+        """Fetch one page of a collection, starting at ``offset``."""
+        params = {}
+        if offset:
+            params["offset"] = offset
+        if self.page_limit:
+            params["limit"] = self.page_limit
+
+        if not params:
+            if data is None:
+                return self.device.get_resp(endpoint)
+            return self.device.get_resp(endpoint, data)
+
+        return self.device.get_resp(
+            endpoint=endpoint, data=data, params=params, throw=throw
+        )
+
+    def _iter_pages(self, endpoint, data=None, throw=True, parallel=None):
+        """
+        Yield the pages of a (possibly paginated) response, in order.
+
+        The first page carries ``rangeInfo``, so the offsets of the remaining
+        pages are known up front and can be fetched concurrently.
+        """
+        if data is not None:
+            data = json.dumps(data)
+        if parallel is None:
+            parallel = self.parallel_pages
+
+        response = self._get_page(endpoint, data, throw=throw)
+        self._emit_page(endpoint, 1, response)
+        yield response
+
+        if not response or "rangeInfo" not in response:
+            return
+
+        total = response["rangeInfo"]["total"]
+        fetched_items = len(response["items"])
+        if response["rangeInfo"]["limit"] >= total or fetched_items == 0:
+            return
+
+        if parallel:
+            offsets = iter(range(fetched_items, total, fetched_items))
+            with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+                window = deque(
+                    executor.submit(self._get_page, endpoint, data, offset, throw)
+                    for offset in islice(offsets, self.page_workers)
+                )
+                try:
+                    number = 1
+                    while window:
+                        page = window.popleft().result()
+                        for offset in islice(offsets, 1):
+                            window.append(
+                                executor.submit(
+                                    self._get_page, endpoint, data, offset, throw
+                                )
+                            )
+                        if not page:
+                            return
+                        number += 1
+                        self._emit_page(endpoint, number, page)
+                        yield page
+                finally:
+                    for future in window:
+                        future.cancel()
+        else:
+            number = 1
+            while fetched_items < total:
+                page = self._get_page(endpoint, data, fetched_items, throw)
+                if not page or not page["items"]:
+                    return
+                fetched_items = fetched_items + len(page["items"])
+                number += 1
+                self._emit_page(endpoint, number, page)
+                yield page
+
+    def _iter_items(self, endpoint, data=None, throw=True, parallel=None):
+        """Yield the items of a paginated collection, page by page."""
+        for page in self._iter_pages(endpoint, data, throw, parallel):
+            if not page:
+                return
+            for item in page.get("items", ()):
+                yield item
+
     def _send_request(self, endpoint, data=None, throw=True):
         """Send request method."""
-        if data is None:
-            response = self.device.get_resp(endpoint)
-        else:
-            response = self.device.get_resp(endpoint, json.dumps(data))
-
-        if "rangeInfo" in response:
-            if response["rangeInfo"]["limit"] < response["rangeInfo"]["total"]:
-                fetched_items = len(response["items"])
-                while fetched_items < response["rangeInfo"]["total"]:
-                    offset = fetched_items
-                    params = {"offset": offset}
-                    if data is None:
-                        r = self.device.get_resp(
-                            endpoint=endpoint, params=params, throw=throw
-                        )
-                    else:
-                        r = self.device.get_resp(
-                            endpoint=endpoint,
-                            data=json.dumps(data),
-                            params=params,
-                            throw=throw,
-                        )
+        pages = self._iter_pages(endpoint, data, throw)
+        response = next(pages)
 
-                    fetched_items = fetched_items + len(r["items"])
-                    response["items"] = response["items"] + r["items"]
+        if response and "rangeInfo" in response:
+            items = list(response["items"])
+            for page in pages:
+                items.extend(page["items"])
+            response["items"] = items
 
         return response
 
-    def _get_interfaces_details(self, interfaces):
-        commands = []
-        for interface in interfaces:
-            commands.append("show interface " + interface)
+    def _iter_arp_table(self, compact=False, parallel=None):
+        """Yield the ARP table entries, page by page."""
+        return iter_arp_entries(
+            self._iter_items("/monitoring/arp", parallel=parallel), compact
+        )
 
-        results = self.cli(commands)
+    def _iter_access_rules(self, directions=None, compact=False, parallel=None):
+        """Yield the access rules of ``directions``, interface by interface."""
+        for direction in directions or ASA_ACCESS_DIRECTIONS:
+            if direction not in ASA_ACCESS_DIRECTIONS:
+                raise ValueError(
+                    "Unknown access rule direction {}, expected one of {}".format(
+                        direction, ", ".join(ASA_ACCESS_DIRECTIONS)
+                    )
+                )
+            groups_endpoint = ASA_ACCESS_DIRECTIONS[direction]
+            if groups_endpoint is None:
+                interfaces = [None]
+            else:
+                interfaces = (
+                    group["interface"]["name"]
+                    for group in self._iter_items(groups_endpoint)
+                )
+            for interface in interfaces:
+                if interface is None:
+                    endpoint = "/access/{}/rules".format(direction)
+                else:
+                    endpoint = "/access/{}/{}/rules".format(direction, interface)
+                for rule in iter_access_rules(
+                    self._iter_items(endpoint, parallel=parallel),
+                    interface,
+                    direction,
+                    compact,
+                ):
+                    yield rule
+
+    def _iter_objects(self, collection, parallel=None):
+        """Yield the objects of an /objects collection, page by page."""
+        if collection not in ASA_OBJECT_COLLECTIONS:
+            raise ValueError(
+                "Unknown object collection {}, expected one of {}".format(
+                    collection, ", ".join(ASA_OBJECT_COLLECTIONS)
+                )
+            )
 
-        ifs_details = {}
-        for command, details in results.items():
-            if_name = re.search(r"show interface (.*)", command).group(1)
-            match_mac = re.search(r"MAC address (.{14}),", details)
-            mac = ""
-            if match_mac is not None:
-                mac = match_mac.group(1)
+        return iter_rest_objects(
+            self._iter_items("/objects/" + collection, parallel=parallel)
+        )
 
-            match_if_status = re.search(
-                r"line protocol is (.{2,4})\n", results[command]
-            )
-            if match_if_status.group(1) == "up":
-                if_up = True
+    def _get_snapshot(self, endpoint):
+        """Return the response of ``endpoint``, served from the snapshot cache if fresh."""
+        if not self.snapshot_cache:
+            return self._send_request(endpoint, throw=False)
+
+        now = time.monotonic()
+        with self._snapshots_lock:
+            snapshot = self._snapshots.get(endpoint)
+        if snapshot is not None and now - snapshot[0] < self.snapshot_cache_ttl:
+            return snapshot[1]
+
+        response = self._send_request(endpoint, throw=False)
+        if response:
+            with self._snapshots_lock:
+                self._snapshots[endpoint] = (now, response)
+
+        return response
+
+    def _invalidate_snapshots(self, endpoint=None):
+        """Drop the cached snapshot of ``endpoint``, or of every endpoint."""
+        with self._snapshots_lock:
+            if endpoint is None:
+                self._snapshots.clear()
             else:
-                if_up = False
+                self._snapshots.pop(endpoint, None)
+
+    def _get_interfaces_responses(self):
+        responses = []
+
+        for endpoint in SUPPORTED_INTERFACES_ENDPOINTS:
+            responses.append(self._get_snapshot(endpoint))
 
-            match_mtu = re.search(r"MTU (.{1,4})\n", details)
-            mtu = 0
-            if match_mtu is not None:
-                mtu = int(match_mtu.group(1))
+        return responses
 
-            ifs_details[if_name] = {"mac_address": mac, "is_up": if_up, "mtu": mtu}
+    def _get_fast_facts(self, facts):
+        """
+        Fill ``facts`` from a single /cli request and the interface endpoints.
 
-        return ifs_details
+        The CLI request is sent concurrently with the interface endpoints, and
+        the interface list comes from the REST data alone, without the
+        per-interface "show interface" details.
+        """
+        commands = [
+            "show hostname",
+            "show hostname fqdn",
+            "show version",
+            "show inventory",
+        ]
+
+        with ThreadPoolExecutor(
+            max_workers=1 + len(SUPPORTED_INTERFACES_ENDPOINTS)
+        ) as executor:
+            cli_future = executor.submit(self.cli, commands)
+            responses = list(
+                executor.map(self._get_snapshot, SUPPORTED_INTERFACES_ENDPOINTS)
+            )
+            results = cli_future.result()
+
+        facts.update(parse_show_version(results["show version"]))
+        inventory = parse_show_inventory(results["show inventory"])
+        if inventory:
+            facts["serial_number"] = facts["serial_number"] or inventory[0]["sn"]
+            facts["model"] = facts["model"] or inventory[0]["pid"]
+
+        facts["hostname"] = results["show hostname"].replace("\n", "")
+        facts["fqdn"] = results["show hostname fqdn"].replace("\n", "")
+        facts["interface_list"] = list(parse_interfaces(responses))
+
+        return facts
+
+    def _get_interfaces_details(self, interfaces):
+        if self.bulk_interface_details:
+            results = self.cli(["show interface"])
+            return parse_show_interface(results["show interface"])
+
+        commands = []
+        for interface in interfaces:
+            commands.append("show interface " + interface)
+
+        results = self.cli(commands)
+
+        return parse_interfaces_details(results)
 
     def open(self):
         """
@@ -250,6 +947,10 @@ class ASADriver(NetworkDriver):
         and credentials are valid before moving on to other, more complex,
         requests.
         """
+        if self.token_store is not None and self._resume_token():
+            self.up = True
+            return True
+
         auth_result, code = self._authenticate()
         if auth_result:
             self.up = True
@@ -262,18 +963,173 @@ class ASADriver(NetworkDriver):
 
     def close(self):
         """Mark the connection to the device as closed."""
+        if self.token_store is not None:
+            # Keep the token alive on the device for the next open().
+            self.up = False
+            self._invalidate_snapshots()
+            return True
+
         delete_result, code = self._delete_token()
 
         if delete_result:
             self.up = False
+            self._invalidate_snapshots()
             return True
         else:
             raise ConnectionException(
                 "Cannot connect to {}. Error {}".format(self.hostname, code)
             )
 
+    def _get_config_sections(self, sections, full=False, sanitized=False):
+        """Return the given sections of the running config, from one /cli request."""
+        commands = []
+        for section in sections:
+            if section not in ASA_CONFIG_SECTIONS:
+                raise ValueError(
+                    "Unknown config section {}, expected one of {}".format(
+                        section, ", ".join(sorted(ASA_CONFIG_SECTIONS))
+                    )
+                )
+            commands.append(
+                "show running-config {}{}".format(
+                    "all " if full else "", ASA_CONFIG_SECTIONS[section]
+                )
+            )
+
+        results = self.cli(commands)
+
+        config = {}
+        for section, command in zip(sections, commands):
+            config[section] = results[command]
+            if sanitized:
+                config[section] = sanitize_config(config[section])
+
+        return config
+
+    def _get_config_checksum(self):
+        """Return the checksum of the running config."""
+        results = self.cli(["show checksum"])
+
+        return parse_show_checksum(results["show checksum"])
+
+    def _get_startup_config(self, checksum):
+        """
+        Return the startup config, from the config cache if ``checksum`` matches.
+
+        The checksum only changes when the config is saved, so it identifies the
+        startup config. It must be read before the config: a save in between is
+        then caught by the next call instead of being cached as the current one.
+        """
+        if checksum:
+            cached = self.config_cache.get(self.hostname)
+            if cached is not None and cached[0] == checksum:
+                return cached[1]
+
+        startup = self.cli(["show startup-config"])["show startup-config"]
+        if checksum:
+            self.config_cache.set(self.hostname, checksum, startup)
+
+        return startup
+
+    def _get_live_running_config(self):
+        """Return the running config, always read from the device."""
+        return self.cli(["show running-config"])["show running-config"]
+
+    def _get_config_model(self):
+        """
+        Return the running config parsed in an ASAConfig.
+
+        With the config cache, the model is kept and parsed again only when
+        the running config differs from the one it was parsed from.
+        """
+        running = self._get_live_running_config()
+        cached = self._config_model
+        if cached is not None and cached[0] == running:
+            return cached[1]
+
+        model = parse_config(running)
+        if self.config_cache is not None:
+            self._config_model = (running, model)
+
+        return model
+
+    def _get_config_if_changed(self, checksum, sanitized=False):
+        """Return the current checksum, and the running config if it changed."""
+        current = self._get_config_checksum()
+        if current and current == checksum:
+            return current, None
+
+        running = self._get_live_running_config()
+        if sanitized:
+            running = sanitize_config(running)
+
+        return current, running
+
+    def _stream_config(self, retrieve, sink, sanitized=False, chunk_size=65536):
+        """
+        Write the configs to ``sink`` as they are received.
+
+        Each config is fetched with its own /cli request, decoded and, if
+        asked, sanitized chunk by chunk. ``sink`` is a path or a file-like
+        object receiving every config, or a dict of them keyed by config name.
+        Return the number of characters written, by config name.
+        """
+        retrieve = retrieve.lower()
+        written = {}
+
+        with ExitStack() as stack:
+            # A path is opened once, the configs sharing it follow each other.
+            files = {}
+            for name, command in (
+                ("startup", "show startup-config"),
+                ("running", "show running-config"),
+            ):
+                if retrieve not in (name, "all"):
+                    continue
+
+                target = sink[name] if isinstance(sink, dict) else sink
+                if isinstance(target, str):
+                    if target not in files:
+                        files[target] = stack.enter_context(
+                            open(target, "w", encoding="utf-8", newline="")
+                        )
+                    target = files[target]
+
+                chunks = self.device.stream_resp(
+                    "/cli", json.dumps({"commands": [command]}), chunk_size
+                )
+                text = (fragment for i, fragment in iter_json_strings(chunks))
+                if sanitized:
+                    text = sanitize_lines(_iter_lines(text))
+                written[name] = self._write_all(target, text)
+
+        return written
+
+    @staticmethod
+    def _write_all(config_file, text):
+        count = 0
+        for part in text:
+            config_file.write(part)
+            count += len(part)
+        return count
+
+    def _send_cli_batch(self, batch):
+        try:
+            return self._send_request("/cli", {"commands": batch})
+        except (CommandErrorException, ConnectionException) as e:
+            return e
+
     def cli(self, commands):
         """Run CLI commands via the API."""
+        batches = _cli_batches(commands, self.cli_batch_size, self.cli_batch_bytes)
+        if len(batches) > 1:
+            # Batches run concurrently, a failed batch doesn't stop the others.
+            with ThreadPoolExecutor(
+                max_workers=min(self.cli_workers, len(batches))
+            ) as executor:
+                outcomes = list(executor.map(self._send_cli_batch, batches))
+            return _cli_results(batches, outcomes)
+
         data = {"commands": commands}
 
         response = self._send_request("/cli", data)
@@ -298,6 +1154,9 @@ class ASADriver(NetworkDriver):
             "interface_list": [],
         }
 
+        if self.fast_facts:
+            return self._get_fast_facts(facts)
+
         serialNumber = self._send_request("/monitoring/serialnumber")
         facts["serial_number"] = serialNumber["serialNumber"]
 
@@ -319,25 +1178,9 @@ class ASADriver(NetworkDriver):
 
     def get_interfaces(self):
         """Get Interfaces."""
-        interfaces = OrderedDict()
-        responses = []
+        responses = self._get_interfaces_responses()
 
-        for endpoint in SUPPORTED_INTERFACES_ENDPOINTS:
-            responses.append(self._send_request(endpoint, throw=False))
-
-        for response in responses:
-            if response["rangeInfo"]["total"] > 0:
-
-                for int_info in response["items"]:
-                    interfaces[int_info["hardwareID"]] = {
-                        "is_up": False,
-                        "is_enabled": not int_info["shutdown"],
-                        "description": int_info["interfaceDesc"],
-                        "last_flapped": -1.0,
-                        "speed": 0,
-                        "mtu": 0,
-                        "mac_address": "",
-                    }
+        interfaces = parse_interfaces(responses)
 
         ifs = []
         for if_name in interfaces:
@@ -346,9 +1189,12 @@ class ASADriver(NetworkDriver):
         ifs_details = self._get_interfaces_details(ifs)
 
         for if_name, details in ifs_details.items():
+            if if_name not in interfaces:
+                continue
             interfaces[if_name]["mac_address"] = details["mac_address"]
             interfaces[if_name]["is_up"] = details["is_up"]
             interfaces[if_name]["mtu"] = details["mtu"]
+            interfaces[if_name]["speed"] = details["speed"]
 
         return interfaces
 
@@ -360,8 +1206,13 @@ class ASADriver(NetworkDriver):
         startup_cmd = "show startup-config"
         running_cmd = "show running-config"
 
+        checksum_cmd = "show checksum"
+
         if retrieve.lower() in ["startup", "all"]:
-            commands.append(startup_cmd)
+            if self.config_cache is not None:
+                commands.append(checksum_cmd)
+            else:
+                commands.append(startup_cmd)
         if retrieve.lower() in ["running", "all"]:
             commands.append(running_cmd)
 
@@ -369,74 +1220,169 @@ class ASADriver(NetworkDriver):
             results = self.cli(commands)
 
         if retrieve.lower() in ["startup", "all"]:
-            config["startup"] = results[startup_cmd]
+            if self.config_cache is not None:
+                checksum = parse_show_checksum(results[checksum_cmd])
+                config["startup"] = self._get_startup_config(checksum)
+            else:
+                config["startup"] = results[startup_cmd]
         if retrieve.lower() in ["running", "all"]:
             config["running"] = results[running_cmd]
 
         if sanitized:
-            return sanitize_configs(config, ASA_SANITIZE_FILTERS)
+            return sanitize_configs(config)
 
         return config
 
     def get_interfaces_ip(self):
         """Get interfaces ip."""
-        interfaces = {}
-        responses = []
-
-        for endpoint in SUPPORTED_INTERFACES_ENDPOINTS:
-            responses.append(self._send_request(endpoint, throw=False))
-
-        for response in responses:
-            if response["rangeInfo"]["total"] > 0:
-                for int_info in response["items"]:
-                    if int_info["ipAddress"] != "NoneSelected":
-                        interfaces[int_info["hardwareID"]] = {}
-                        ipv4 = int_info["ipAddress"]
-                        ip = ipv4["ip"]["value"]
-                        mask = ipv4["netMask"]["value"]
-                        network = ip + "/" + mask
-                        prefix_length = IPNetwork(network).prefixlen
-                        interfaces[int_info["hardwareID"]]["ipv4"] = {
-                            ip: {"prefix_length": prefix_length}
-                        }
-
-                    if len(int_info["ipv6Info"]["ipv6Addresses"]) > 0:
-                        if int_info["hardwareID"] not in interfaces:
-                            interfaces[int_info["hardwareID"]] = {}
-
-                        interfaces[int_info["hardwareID"]]["ipv6"] = {}
-                        for ipv6 in int_info["ipv6Info"]["ipv6Addresses"]:
-                            ip = ipv6["address"]["value"]
-                            prefix_length = ipv6["prefixLength"]
-                            interfaces[int_info["hardwareID"]]["ipv6"][ip] = {
-                                "prefix_length": prefix_length
-                            }
+        responses = self._get_interfaces_responses()
 
-        return interfaces
+        return parse_interfaces_ip(responses)
 
     def get_arp_table(self, vrf=""):
         """Get ARP Table."""
-        arp_table = []
-        response = self._send_request("/monitoring/arp")
-
-        if response["rangeInfo"]["total"] > 0:
-            for item in response["items"]:
-                mac = item["macAddress"].replace(".", "")
-                regex = re.compile(r".{2}")
-                mac = ":".join(re.findall(regex, mac))
-                arp_table.append(
-                    {
-                        "interface": item["interface"],
-                        "ip": item["ipAddress"],
-                        "mac": mac,
-                        "age": 0.0,
-                    }
-                )
-
-        return arp_table
+        return list(self._iter_arp_table())
 
     def is_alive(self):
         """Check if connection is still valid."""
         status = {"is_alive": self.device.has_active_token()}
 
         return status
+
+    @staticmethod
+    def _read_candidate(filename, config, exception):
+        if filename is not None:
+            try:
+                with open(filename) as f:
+                    config = f.read()
+            except IOError as e:
+                raise exception("Cannot read {}: {}".format(filename, e))
+        if config is None:
+            raise exception("filename or config param must be provided.")
+        return config
+
+    def load_replace_candidate(self, filename=None, config=None):
+        """Load a full config, replacing the running config on commit."""
+        self.candidate_config = self._read_candidate(
+            filename, config, ReplaceConfigException
+        )
+        self.config_replace = True
+
+    def load_merge_candidate(self, filename=None, config=None):
+        """Load config commands, merged into the running config on commit."""
+        self.candidate_config = self._read_candidate(
+            filename, config, MergeConfigException
+        )
+        self.config_replace = False
+
+    def compare_config(self):
+        """Compare the running config with the candidate held in memory."""
+        if self.candidate_config is None:
+            return ""
+
+        running = self._get_live_running_config()
+        if self.config_replace:
+            return diff_configs(running, self.candidate_config)
+
+        return merge_diff(running, self.candidate_config)
+
+    def discard_config(self):
+        """Discard the loaded candidate."""
+        self.candidate_config = None
+        self.config_replace = False
+
+    def _push_config(self, commands, lines=None):
+        """
+        Send config commands through /cli, one chunk after the other.
+
+        Stop after the first chunk with a failed command and raise a
+        CommitError. Its ``errors`` attribute lists the ``command_index``
+        (1-based position in ``commands``), ``line``, ``command`` and ``error``
+        of every failed command of the chunk, and ``sent`` holds the number of
+        commands sent to the device. ``lines`` gives the candidate line of
+        every command, ``line`` is None without it.
+        """
+        total = len(commands)
+        sent = 0
+        for chunk in _config_chunks(
+            commands, self.config_chunk_size, self.config_chunk_bytes
+        ):
+            try:
+                response = self._send_request(
+                    "/cli", {"commands": [command for index, command in chunk]}
+                )
+            except (CommandErrorException, ConnectionException) as e:
+                error = CommitError(
+                    "Commit failed after {} of {} commands: {}".format(sent, total, e)
+                )
+                error.errors = []
+                error.sent = sent
+                raise error
+
+            errors = []
+            for (index, command), output in zip(chunk, response["response"]):
+                message = parse_cli_error(output)
+                if message:
+                    errors.append(
+                        {
+                            "command_index": index + 1,
+                            "line": lines[index] if lines else None,
+                            "command": command,
+                            "error": message,
+                        }
+                    )
+            sent = chunk[-1][0] + 1
+            if errors:
+                first = errors[0]
+                if first["line"] is None:
+                    where = "command {}".format(first["command_index"])
+                else:
+                    where = "line {}".format(first["line"])
+                error = CommitError(
+                    "{} commands failed, first at {}: {}: {}".format(
+                        len(errors), where, first["command"], first["error"]
+                    )
+                )
+                error.errors = errors
+                error.sent = sent
+                raise error
+
+            if self.commit_progress is not None:
+                self.commit_progress(sent, total)
+
+    def commit_config(self, message="", revert_in=None):
+        """Push the candidate through /cli, in chunks, and save it if asked."""
+        if message:
+            raise NotImplementedError(
+                "Commit message not implemented for this platform"
+            )
+        if revert_in is not None:
+            raise NotImplementedError(
+                "Commit confirm not implemented for this platform"
+            )
+        if self.candidate_config is None:
+            raise CommitError("No candidate config loaded.")
+
+        lines = None
+        if self.config_replace:
+            running = self._get_live_running_config()
+            commands = replace_commands(running, self.candidate_config)
+        else:
+            # Errors of a merge point at the line of the candidate.
+            pairs = config_command_lines(self.candidate_config)
+            lines = [number for number, _ in pairs]
+            commands = [command for _, command in pairs]
+
+        try:
+            self._push_config(commands, lines)
+        finally:
+            # Even a partial push leaves the cached state behind the device.
+            self._invalidate_snapshots()
+            self._config_model = None
+            if self.config_cache is not None:
+                self.config_cache.delete(self.hostname)
+
+        if self.write_memory:
+            self._push_config(["write memory"])
+
+        self.discard_config()
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Asyncio variant of the Cisco ASA driver.
+
+The getters fan out independent REST calls concurrently, so a getter costs
+roughly the slowest round trip instead of the sum of all of them.
+"""
+
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from napalm.base.exceptions import CommandErrorException, ConnectionException
+
+from napalm_asa._SUPPORTED_INTERFACES_ENDPOINTS import SUPPORTED_INTERFACES_ENDPOINTS
+from napalm_asa.asa import (
+    RespFetcherHttps,
+    _cli_batches,
+    _cli_results,
+    _session_from_args,
+)
+from napalm_asa.utils.parsers import (
+    parse_arp_table,
+    parse_interfaces,
+    parse_interfaces_details,
+    parse_interfaces_ip,
+    parse_show_interface,
+)
+from napalm_asa.utils.sanitizer import sanitize_configs
+
+
+class AsyncRespFetcherHttps:
+    """Asyncio front-end for RespFetcherHttps.
+
+    Requests run on a private thread pool and at most ``max_concurrency`` of
+    them are in flight against the device at any time.
+    """
+
+    def __init__(self, fetcher, max_concurrency=4):
+        """Class init."""
+        self.fetcher = fetcher
+        self.max_concurrency = max_concurrency
+        self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        """Return the concurrency semaphore bound to the running loop."""
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+
+        return self._semaphore
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking fetcher call on the thread pool."""
+        loop = asyncio.get_event_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        async with self._get_semaphore():
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def get_auth_token(self):
+        """Authenticate with user and password to get an auth token."""
+        return await self._run(self.fetcher.get_auth_token)
+
+    async def delete_token(self):
+        """Delete auth token."""
+        return await self._run(self.fetcher.delete_token)
+
+    async def get_resp(self, endpoint="", data=None, params=None, throw=True):
+        """Get response from device and return parsed json."""
+        if params is None:
+            return await self._run(self.fetcher.get_resp, endpoint, data)
+
+        return await self._run(
+            self.fetcher.get_resp,
+            endpoint=endpoint,
+            data=data,
+            params=params,
+            throw=throw,
+        )
+
+    async def has_active_token(self):
+        """Check if the auth token is still valid."""
+        return await self._run(self.fetcher.has_active_token)
+
+    def shutdown(self):
+        """Release the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class AsyncASADriver:
+    """Asyncio driver for Cisco ASA.
+
+    Exposes the same getters as ASADriver, as coroutines.
+    """
+
+    def __init__(self, hostname, username, password, timeout=60, optional_args=None):
+        """Class init."""
+        optional_args = optional_args or dict()
+        self.username = username
+        self.password = password
+        self.hostname = hostname
+        self.port = optional_args.get("port", 443)
+        self.timeout = timeout
+        self.max_concurrency = optional_args.get("max_concurrency", 4)
+        self.page_limit = optional_args.get("page_limit")
+        self.bulk_interface_details = optional_args.get("bulk_interface_details", False)
+        self.cli_batch_size = optional_args.get("cli_batch_size")
+        self.cli_batch_bytes = optional_args.get("cli_batch_bytes")
+        self.up = False
+        self.base_url = "https://{}:{}/api".format(self.hostname, self.port)
+        self.device = AsyncRespFetcherHttps(
+            RespFetcherHttps(
+                self.username,
+                self.password,
+                self.base_url,
+                self.timeout,
+                hooks=list(optional_args.get("hooks", ())),
+                json_codec=optional_args.get("json_codec"),
+                session=_session_from_args(
+                    "{}:{}".format(self.hostname, self.port), optional_args
+                ),
+                verify=optional_args.get("verify", False),
+            ),
+            self.max_concurrency,
+        )
+
+    async def __aenter__(self):
+        """Open the connection when entering the context."""
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        """Close the connection when leaving the context."""
+        await self.close()
+
+    async def _authenticate(self):
+        """Authenticate with device."""
+        return await self.device.get_auth_token()
+
+    async def _delete_token(self):
+        """Delete auth token."""
+        return await self.device.delete_token()
+
+    async def _send_request(self, endpoint, data=None, throw=True):
+        """Send request method, fetching the remaining pages concurrently."""
+        if data is not None:
+            data = json.dumps(data)
+
+        params = {}
+        if self.page_limit:
+            params["limit"] = self.page_limit
+
+        if params:
+            response = await self.device.get_resp(
+                endpoint=endpoint, data=data, params=params, throw=throw
+            )
+        else:
+            response = await self.device.get_resp(endpoint, data)
+
+        if response and "rangeInfo" in response:
+            page_size = len(response["items"])
+            total = response["rangeInfo"]["total"]
+            if response["rangeInfo"]["limit"] < total and page_size > 0:
+                pages = await asyncio.gather(
+                    *[
+                        self.device.get_resp(
+                            endpoint=endpoint,
+                            data=data,
+                            params=dict(params, offset=offset),
+                            throw=throw,
+                        )
+                        for offset in range(page_size, total, page_size)
+                    ]
+                )
+                items = list(response["items"])
+                for page in pages:
+                    # A failed page is False with throw=False, keep the pages
+                    # before it as the sync driver does.
+                    if not page:
+                        break
+                    items.extend(page["items"])
+                response["items"] = items
+
+        return response
+
+    async def _get_interfaces_responses(self):
+        """Fetch all the /interfaces/* endpoints concurrently."""
+        return await asyncio.gather(
+            *[
+                self._send_request(endpoint, throw=False)
+                for endpoint in SUPPORTED_INTERFACES_ENDPOINTS
+            ]
+        )
+
+    async def _get_interfaces_details(self, interfaces):
+        if self.bulk_interface_details:
+            results = await self.cli(["show interface"])
+            return parse_show_interface(results["show interface"])
+
+        commands = []
+        for interface in interfaces:
+            commands.append("show interface " + interface)
+
+        results = await self.cli(commands)
+
+        return parse_interfaces_details(results)
+
+    async def open(self):
+        """Open a connection to the device."""
+        auth_result, code = await self._authenticate()
+        if auth_result:
+            self.up = True
+            return True
+        else:
+            self.up = False
+            raise ConnectionException(
+                "Cannot connect to {}. Error {}".format(self.hostname, code)
+            )
+
+    async def close(self):
+        """Mark the connection to the device as closed."""
+        delete_result, code = await self._delete_token()
+
+        if delete_result:
+            self.up = False
+            self.device.shutdown()
+            return True
+        else:
+            raise ConnectionException(
+                "Cannot connect to {}. Error {}".format(self.hostname, code)
+            )
+
+    async def cli(self, commands):
+        """Run CLI commands via the API."""
+        batches = _cli_batches(commands, self.cli_batch_size, self.cli_batch_bytes)
+        if len(batches) > 1:
+            outcomes = await asyncio.gather(
+                *[self._send_request("/cli", {"commands": batch}) for batch in batches],
+                return_exceptions=True,
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, Exception) and not isinstance(
+                    outcome, (CommandErrorException, ConnectionException)
+                ):
+                    raise outcome
+            return _cli_results(batches, outcomes)
+
+        data = {"commands": commands}
+
+        response = await self._send_request("/cli", data)
+
+        result_dict = {}
+
+        for i, result in enumerate(response["response"]):
+            result_dict[commands[i]] = result
+
+        return result_dict
+
+    async def get_facts(self):
+        """Get Facts."""
+        facts = {
+            "uptime": 0.0,
+            "vendor": "Cisco Systems",
+            "os_version": "",
+            "serial_number": "",
+            "model": "",
+            "hostname": "",
+            "fqdn": "",
+            "interface_list": [],
+        }
+
+        (
+            serialNumber,
+            deviceDetails,
+            results_from_cli,
+            interfaces,
+        ) = await asyncio.gather(
+            self._send_request("/monitoring/serialnumber"),
+            self._send_request("/monitoring/device/components/version"),
+            self.cli(["show hostname", "show hostname fqdn"]),
+            self.get_interfaces(),
+        )
+
+        facts["serial_number"] = serialNumber["serialNumber"]
+        facts["os_version"] = deviceDetails["asaVersion"]
+        facts["uptime"] = deviceDetails["upTimeinSeconds"]
+        facts["model"] = deviceDetails["deviceType"]
+        facts["hostname"] = results_from_cli["show hostname"].replace("\n", "")
+        facts["fqdn"] = results_from_cli["show hostname fqdn"].replace("\n", "")
+
+        for if_name in interfaces:
+            facts["interface_list"].append(if_name)
+
+        return facts
+
+    async def get_interfaces(self):
+        """Get Interfaces."""
+        responses = await self._get_interfaces_responses()
+
+        interfaces = parse_interfaces(responses)
+
+        ifs_details = await self._get_interfaces_details(list(interfaces))
+
+        for if_name, details in ifs_details.items():
+            if if_name not in interfaces:
+                continue
+            interfaces[if_name]["mac_address"] = details["mac_address"]
+            interfaces[if_name]["is_up"] = details["is_up"]
+            interfaces[if_name]["mtu"] = details["mtu"]
+            interfaces[if_name]["speed"] = details["speed"]
+
+        return interfaces
+
+    async def get_config(self, retrieve="all", full=False, sanitized=False):
+        """Get config."""
+        config = {"startup": "", "running": "", "candidate": ""}
+
+        commands = []
+        startup_cmd = "show startup-config"
+        running_cmd = "show running-config"
+
+        if retrieve.lower() in ["startup", "all"]:
+            commands.append(startup_cmd)
+        if retrieve.lower() in ["running", "all"]:
+            commands.append(running_cmd)
+
+        if retrieve.lower() in ["running", "startup", "all"]:
+            results = await self.cli(commands)
+
+        if retrieve.lower() in ["startup", "all"]:
+            config["startup"] = results[startup_cmd]
+        if retrieve.lower() in ["running", "all"]:
+            config["running"] = results[running_cmd]
+
+        if sanitized:
+            return sanitize_configs(config)
+
+        return config
+
+    async def get_interfaces_ip(self):
+        """Get interfaces ip."""
+        responses = await self._get_interfaces_responses()
+
+        return parse_interfaces_ip(responses)
+
+    async def get_arp_table(self, vrf=""):
+        """Get ARP Table."""
+        response = await self._send_request("/monitoring/arp")
+
+        return parse_arp_table(response)
+
+    async def is_alive(self):
+        """Check if connection is still valid."""
+        status = {"is_alive": await self.device.has_active_token()}
+
+        return status
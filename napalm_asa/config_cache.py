@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Caches of saved configs, keyed by the device "show checksum".
+
+The ASA recalculates the checksum when the config is saved, so the checksum
+identifies the saved config, not the running one. With a config cache,
+ASADriver.get_config() asks the device for the checksum first and only
+downloads the startup config when it changed. The running config is always
+read from the device, as it may hold changes not yet written to memory.
+"""
+
+from __future__ import unicode_literals
+
+import json
+import os
+import re
+import threading
+
+from napalm_asa.utils.files import write_json_atomic
+
+
+class ConfigCache:
+    """Base class of config caches. Entries are keyed by device hostname."""
+
+    def get(self, host):
+        """Return the ``(checksum, startup_config)`` stored for ``host``, or None."""
+        raise NotImplementedError
+
+    def set(self, host, checksum, config):
+        """Store the startup config of ``host`` and its checksum."""
+        raise NotImplementedError
+
+    def delete(self, host):
+        """Drop the entry of ``host``, if any."""
+        raise NotImplementedError
+
+
+class MemoryConfigCache(ConfigCache):
+    """Keep the configs in memory, for the drivers of one process."""
+
+    def __init__(self):
+        """Class init."""
+        self._configs = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            return self._configs.get(host)
+
+    def set(self, host, checksum, config):
+        with self._lock:
+            self._configs[host] = (checksum, config)
+
+    def delete(self, host):
+        with self._lock:
+            self._configs.pop(host, None)
+
+
+class FileConfigCache(ConfigCache):
+    """
+    Keep the configs in a directory, one JSON file per device.
+
+    Files are readable by their owner only and are replaced atomically, so a
+    job reading the cache never sees a partial config.
+    """
+
+    def __init__(self, directory):
+        """Class init."""
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, host):
+        return os.path.join(
+            self.directory, "{}.json".format(re.sub(r"[^\w.-]", "_", host))
+        )
+
+    def get(self, host):
+        try:
+            with open(self._path(host)) as cache_file:
+                entry = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if "startup" not in entry:
+            # Written by a version caching the running config.
+            return None
+        return entry["checksum"], entry["startup"]
+
+    def set(self, host, checksum, config):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, mode=0o700)
+        write_json_atomic(
+            self._path(host),
+            {"checksum": checksum, "startup": config},
+            prefix=".napalm-asa-config",
+        )
+
+    def delete(self, host):
+        try:
+            os.unlink(self._path(host))
+        except (IOError, OSError):
+            pass
@@ -1,3 +1,47 @@
+# Largest page size accepted by the REST API "limit" query parameter.
+ASA_MAX_PAGE_LIMIT = 100
+
+# Sections of the running config retrievable on their own, with the argument of
+# "show running-config" returning them.
+ASA_CONFIG_SECTIONS = {
+    "aaa": "aaa",
+    "aaa-server": "aaa-server",
+    "access-group": "access-group",
+    "access-list": "access-list",
+    "class-map": "class-map",
+    "crypto": "crypto",
+    "group-policy": "group-policy",
+    "interface": "interface",
+    "logging": "logging",
+    "nat": "nat",
+    "ntp": "ntp",
+    "object": "object",
+    "object-group": "object-group",
+    "policy-map": "policy-map",
+    "route": "route",
+    "router": "router",
+    "snmp-server": "snmp-server",
+    "ssh": "ssh",
+    "tunnel-group": "tunnel-group",
+    "username": "username",
+}
+
+# Directions of the access rules, with the REST collection listing where the
+# rules of that direction are applied, None when the rules are global.
+ASA_ACCESS_DIRECTIONS = {
+    "in": "/access/in",
+    "out": "/access/out",
+    "global": None,
+}
+
+# Collections of objects and object-groups under /objects of the REST API.
+ASA_OBJECT_COLLECTIONS = (
+    "networkobjects",
+    "networkobjectgroups",
+    "networkservices",
+    "networkservicegroups",
+)
+
 ASA_SANITIZE_FILTERS = {
     r"^(\s+enable password)\s.*$": r"\1 <removed>",
     r"^(\snmp-server community).*$": r"\1 <removed>",
@@ -18,3 +62,31 @@ ASA_SANITIZE_FILTERS = {
     r"^((tacacs|radius) server [^\n]+\n(\s+[^\n]+\n)*\s+key) [^\n]+$": r"\1 <removed>",
     r"^(\s+ppp (chap|pap) password \d) .+$": r"\1 <removed>",
 }
+
+# Substrings found in every line matched by the filter of ASA_SANITIZE_FILTERS
+# with the same pattern, so the sanitizer only runs a filter on the lines
+# containing one of them. None runs the filter on every line.
+ASA_SANITIZE_FILTER_KEYWORDS = {
+    r"^(\s+enable password)\s.*$": ("enable password",),
+    r"^(\snmp-server community).*$": ("nmp-server community",),
+    r"^(\s+username .+ (password|secret)) .+$": ("username",),
+    r"^(\snmp-server host \S+( vrf \S+)?( version (1|2c|3))?)\s+\S+((\s+\S*)*)\s*$": (
+        "nmp-server host",
+    ),
+    r"^(\s+(?:password|secret)) (?:\d )?\S+$": ("password", "secret"),
+    r"^(.*wpa-psk ascii \d) (\S+)$": ("wpa-psk ascii",),
+    r"^(.*key 7) (\d.+)$": ("key 7",),
+    r"^(tacacs-server (.+ )?key) .+$": ("tacacs-server",),
+    r"^(crypto isakmp key) (\S+) (.*)$": ("crypto isakmp key",),
+    r"^(\s+ip ospf message-digest-key \d+ md5) .+$": ("message-digest-key",),
+    r"^(\s+ip ospf authentication-key) .+$": ("authentication-key",),
+    r"^(\s+neighbor \S+ password) .+$": ("neighbor",),
+    r"^(\s+vrrp \d+ authentication text) .+$": ("authentication text",),
+    r"^(\s+standby \d+ authentication) .{1,8}$": ("standby",),
+    r"^(\s+standby \d+ authentication md5 key-string) .+?( timeout \d+)?$": (
+        "standby",
+    ),
+    r"^(\s+key-string) .+$": ("key-string",),
+    r"^((tacacs|radius) server [^\n]+\n(\s+[^\n]+\n)*\s+key) [^\n]+$": None,
+    r"^(\s+ppp (chap|pap) password \d) .+$": ("ppp",),
+}
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+ASA specific operations that are not part of the NAPALM driver API.
+
+NAPALM drivers may only expose the public methods defined by NetworkDriver,
+so the extra operations live here and take an opened ASADriver.
+"""
+
+from __future__ import unicode_literals
+
+
+def iter_items(device, endpoint, parallel=None):
+    """
+    Yield the items of a REST collection page by page.
+
+    Only one page is held in memory at a time, unless ``parallel`` is set, in
+    which case a few pages are fetched ahead concurrently. ``parallel``
+    defaults to the ``parallel_pages`` optional argument of the driver.
+    """
+    return device._iter_items(endpoint, parallel=parallel)
+
+
+def invalidate_cache(device, endpoint=None):
+    """
+    Drop the snapshots kept by the ``snapshot_cache`` optional argument.
+
+    Invalidates only ``endpoint`` if given, otherwise every cached endpoint.
+    """
+    device._invalidate_snapshots(endpoint)
+
+
+def stream_config(device, retrieve, sink, sanitized=False, chunk_size=65536):
+    """
+    Write the startup and/or running config to ``sink`` as they are received.
+
+    ``sink`` is a path or a file-like object that receives every retrieved
+    config, startup first, or a dict of them keyed by ``"startup"`` and
+    ``"running"``. The configs are decoded and sanitized chunk by chunk, so
+    memory stays bounded by ``chunk_size`` whatever the size of the configs.
+    Returns the number of characters written, by config name.
+    """
+    return device._stream_config(retrieve, sink, sanitized, chunk_size)
+
+
+def get_config_checksum(device):
+    """Return the checksum of the running config, as reported by "show checksum"."""
+    return device._get_config_checksum()
+
+
+def get_config_if_changed(device, checksum, sanitized=False):
+    """
+    Download the running config only if it changed since ``checksum``.
+
+    Returns a ``(checksum, running_config)`` tuple, where ``running_config``
+    is None if the device still reports ``checksum``. Store the returned
+    checksum for the next call. The ASA only updates the checksum when the
+    config is saved, unsaved changes are not detected.
+    """
+    return device._get_config_if_changed(checksum, sanitized)
+
+
+def get_config_model(device):
+    """
+    Return the running config parsed in a napalm_asa.utils.config_model.ASAConfig.
+
+    The model indexes the interfaces, objects, object-groups, access-lists and
+    NAT rules, and what references each object. The running config is always
+    read from the device. With the ``config_cache`` optional argument, it is
+    only parsed again when it differs from the one of the previous model.
+    """
+    return device._get_config_model()
+
+
+def get_config_sections(device, sections, full=False, sanitized=False):
+    """
+    Return sections of the running config, such as ``"access-list"`` or ``"nat"``.
+
+    All the sections are fetched with a single /cli request and returned in a
+    dict keyed by section. The known sections are the keys of
+    napalm_asa.constants.ASA_CONFIG_SECTIONS. ``full`` includes the default
+    settings, as "show running-config all" does.
+    """
+    return device._get_config_sections(list(sections), full, sanitized)
+
+
+def iter_arp_table(device, compact=False, parallel=None):
+    """
+    Yield the entries of the ARP table, one page of the table in memory at a time.
+
+    Entries are the dicts of get_arp_table, or the lighter
+    napalm_asa.utils.parsers.ArpEntry named tuples if ``compact`` is set.
+    """
+    return device._iter_arp_table(compact, parallel)
+
+
+def iter_access_rules(device, directions=None, compact=False, parallel=None):
+    """
+    Yield the access rules, one page of rules in memory at a time.
+
+    Rules are read from the REST /access collections of ``directions``, any of
+    ``"in"``, ``"out"`` and ``"global"``, all of them by default, interface by
+    interface and in order. They are dicts, or the lighter
+    napalm_asa.utils.parsers.AccessRule named tuples if ``compact`` is set.
+    """
+    return device._iter_access_rules(directions, compact, parallel)
+
+
+def iter_objects(device, collection="networkobjects", parallel=None):
+    """
+    Yield the objects or object-groups of an /objects collection, page by page.
+
+    ``collection`` is one of napalm_asa.constants.ASA_OBJECT_COLLECTIONS. Each
+    object is a dict with its ``name``, ``type`` and ``description``, and its
+    ``value`` or, for an object-group, its ``members``.
+    """
+    return device._iter_objects(collection, parallel)
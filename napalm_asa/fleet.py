@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Run getters across a fleet of ASAs with a bounded number of workers.
+
+    from napalm_asa import fleet
+
+    with fleet.DriverPool() as pool:
+        for result in fleet.run(hosts, ["get_facts"], max_workers=32, pool=pool,
+                                username="admin", password="secret"):
+            print(result.host, result.error or result.results)
+"""
+
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+
+from napalm_asa.asa import ASADriver
+
+FleetResult = namedtuple(
+    "FleetResult", ["host", "results", "failed", "error", "elapsed"]
+)
+FleetResult.__doc__ = """Outcome of one host.
+
+``results`` maps getter name to its return value and ``failed`` maps getter
+name to the exception it raised. ``error`` holds the exception that aborted
+the whole host (connection failure or timeout), or None.
+"""
+
+
+class DriverPool:
+    """Keep drivers open between fleet runs, so each host authenticates once."""
+
+    def __init__(self, driver=ASADriver):
+        """Class init."""
+        self.driver = driver
+        self._drivers = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    @staticmethod
+    def _key(host):
+        return (
+            host["hostname"],
+            host["username"],
+            host["optional_args"].get("port", 443),
+        )
+
+    def acquire(self, host):
+        """Return an open driver for ``host``, reusing a pooled one if possible."""
+        with self._lock:
+            device = self._drivers.pop(self._key(host), None)
+
+        if device is None:
+            device = self.driver(
+                host["hostname"],
+                host["username"],
+                host["password"],
+                timeout=host["timeout"],
+                optional_args=host["optional_args"],
+            )
+            device.open()
+
+        return device
+
+    def release(self, host, device):
+        """Give ``device`` back to the pool."""
+        with self._lock:
+            previous = self._drivers.get(self._key(host))
+            self._drivers[self._key(host)] = device
+
+        if previous is not None and previous is not device:
+            self.discard(previous)
+
+    @staticmethod
+    def discard(device):
+        """Close ``device`` without returning it to the pool."""
+        try:
+            device.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close every pooled driver."""
+        with self._lock:
+            devices = list(self._drivers.values())
+            self._drivers.clear()
+
+        for device in devices:
+            self.discard(device)
+
+
+class _Job:
+    """Book-keeping for one host while it is being collected."""
+
+    def __init__(self, host):
+        self.host = host
+        self.started = None
+        self.abandoned = False
+
+
+def _host_spec(host, username, password, timeout, optional_args):
+    """Normalise a hostname or host dict into a full host spec."""
+    if not isinstance(host, dict):
+        host = {"hostname": host}
+
+    spec = {
+        "username": username,
+        "password": password,
+        "timeout": timeout,
+        "optional_args": optional_args or {},
+    }
+    spec.update(host)
+
+    return spec
+
+
+def _collect(pool, job, getters):
+    """Run ``getters`` against one host. Executed on a worker thread."""
+    job.started = time.time()
+    results = {}
+    failed = {}
+
+    try:
+        device = pool.acquire(job.host)
+    except Exception as e:
+        return FleetResult(
+            job.host["hostname"], results, failed, e, time.time() - job.started
+        )
+
+    for getter in getters:
+        if isinstance(getter, (tuple, list)):
+            name, kwargs = getter
+        else:
+            name, kwargs = getter, {}
+        try:
+            results[name] = getattr(device, name)(**kwargs)
+        except Exception as e:
+            failed[name] = e
+        if job.abandoned:
+            break
+
+    if job.abandoned:
+        pool.discard(device)
+    else:
+        pool.release(job.host, device)
+
+    return FleetResult(
+        job.host["hostname"], results, failed, None, time.time() - job.started
+    )
+
+
+def run(
+    hosts,
+    getters,
+    max_workers=10,
+    timeout=None,
+    pool=None,
+    username=None,
+    password=None,
+    driver_timeout=60,
+    optional_args=None,
+):
+    """Run ``getters`` on every host with at most ``max_workers`` in parallel.
+
+    ``hosts`` are hostnames or dicts with ``hostname`` and optionally
+    ``username``, ``password``, ``timeout`` and ``optional_args`` overriding
+    the defaults given here. ``getters`` are driver method names, or
+    ``(name, kwargs)`` pairs.
+
+    Results are yielded as FleetResult, in completion order. A host that
+    takes longer than ``timeout`` seconds is reported with a TimeoutError and
+    its driver is discarded once the worker gets back.
+
+    Without a ``pool`` every driver is closed at the end of the run.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        for host in hosts:
+            job = _Job(
+                _host_spec(host, username, password, driver_timeout, optional_args)
+            )
+            pending[executor.submit(_collect, pool, job, getters)] = job
+
+        while pending:
+            wait_for = timeout
+            if timeout is not None:
+                deadlines = [
+                    job.started + timeout
+                    for job in pending.values()
+                    if job.started is not None
+                ]
+                if deadlines:
+                    wait_for = max(min(deadlines) - time.time(), 0)
+
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                yield future.result()
+
+            if timeout is None:
+                continue
+
+            now = time.time()
+            for future, job in list(pending.items()):
+                if job.started is not None and now - job.started >= timeout:
+                    job.abandoned = True
+                    pending.pop(future)
+                    yield FleetResult(
+                        job.host["hostname"],
+                        {},
+                        {},
+                        TimeoutError(
+                            "{} timed out after {}s".format(
+                                job.host["hostname"], timeout
+                            )
+                        ),
+                        now - job.started,
+                    )
+    finally:
+        for future, job in pending.items():
+            job.abandoned = True
+            future.cancel()
+        executor.shutdown(wait=False)
+        if own_pool:
+            pool.close()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Instrumentation hooks and a metrics collector.
+
+Hooks are passed to the driver with ``optional_args={"hooks": [...]}``.
+Every hook method receives a dict describing the event, ``host`` is the
+``hostname:port`` of the device in all of them:
+
+- request_start / request_end: ``host``, ``method``, ``endpoint``, ``offset``,
+  and at the end ``status``, ``bytes``, ``duration``, ``retries`` and
+  ``error`` (the exception, if the request failed). ``coalesced`` is set
+  when the response was shared with a concurrent identical request.
+- page: ``host``, ``endpoint``, ``page`` (starting at 1) and ``items``.
+- span_start / span_end: ``host``, ``getter``, and at the end ``duration``
+  and ``error``.
+"""
+
+from __future__ import unicode_literals
+
+import json
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Hooks:
+    """Base class of instrumentation hooks, every event is ignored."""
+
+    def request_start(self, event):
+        """Call before a REST request is sent."""
+
+    def request_end(self, event):
+        """Call once a REST request, including its retries, completed."""
+
+    def page(self, event):
+        """Call for every page of a paginated collection."""
+
+    def span_start(self, event):
+        """Call when a driver method is entered."""
+
+    def span_end(self, event):
+        """Call when a driver method returns or raises."""
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, buckets, value):
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    return ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels
+    )
+
+
+class MetricsCollector(Hooks):
+    """
+    Aggregate the hook events into latency histograms and counters.
+
+    Requests are labelled by host, method and endpoint, getters by host and
+    getter. Export with to_prometheus() or to_json().
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Class init."""
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests = defaultdict(lambda: _Histogram(self.buckets))
+        self._getters = defaultdict(lambda: _Histogram(self.buckets))
+        self._statuses = defaultdict(int)
+        self._bytes = defaultdict(int)
+        self._retries = defaultdict(int)
+        self._pages = defaultdict(int)
+        self._errors = defaultdict(int)
+
+    def request_end(self, event):
+        key = (event["host"], event["method"], event["endpoint"])
+        with self._lock:
+            self._requests[key].observe(self.buckets, event["duration"])
+            self._statuses[key + (event.get("status") or "error",)] += 1
+            self._bytes[key] += event.get("bytes", 0)
+            self._retries[key] += event.get("retries", 0)
+
+    def page(self, event):
+        with self._lock:
+            self._pages[(event["host"], event["endpoint"])] += 1
+
+    def span_end(self, event):
+        key = (event["host"], event["getter"])
+        with self._lock:
+            self._getters[key].observe(self.buckets, event["duration"])
+            if event.get("error") is not None:
+                self._errors[key] += 1
+
+    def to_dict(self):
+        """Return the collected metrics as plain data."""
+        with self._lock:
+            requests = [
+                {
+                    "host": host,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": histogram.count,
+                    "duration_sum": histogram.sum,
+                    "buckets": dict(zip(self.buckets, histogram.counts)),
+                    "bytes": self._bytes[(host, method, endpoint)],
+                    "retries": self._retries[(host, method, endpoint)],
+                    "pages": self._pages.get((host, endpoint), 0),
+                    "statuses": {
+                        str(status): count
+                        for (h, m, e, status), count in self._statuses.items()
+                        if (h, m, e) == (host, method, endpoint)
+                    },
+                }
+                for (host, method, endpoint), histogram in sorted(
+                    self._requests.items()
+                )
+            ]
+            getters = [
+                {
+                    "host": host,
+                    "getter": getter,
+                    "count": histogram.count,
+                    "duration_sum": histogram.sum,
+                    "buckets": dict(zip(self.buckets, histogram.counts)),
+                    "errors": self._errors[(host, getter)],
+                }
+                for (host, getter), histogram in sorted(self._getters.items())
+            ]
+
+        return {"requests": requests, "getters": getters}
+
+    def to_json(self):
+        """Return the collected metrics as a JSON document."""
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @staticmethod
+    def _histogram_lines(name, labels, histogram, buckets):
+        lines = []
+        for bound, count in zip(buckets, histogram.counts):
+            lines.append(
+                "{}_bucket{{{}}} {}".format(
+                    name, _labels(labels + [("le", repr(float(bound)))]), count
+                )
+            )
+        lines.append(
+            "{}_bucket{{{}}} {}".format(
+                name, _labels(labels + [("le", "+Inf")]), histogram.count
+            )
+        )
+        lines.append("{}_sum{{{}}} {}".format(name, _labels(labels), histogram.sum))
+        lines.append("{}_count{{{}}} {}".format(name, _labels(labels), histogram.count))
+        return lines
+
+    def to_prometheus(self):
+        """Return the collected metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines.append(
+                "# HELP napalm_asa_request_duration_seconds REST request latency."
+            )
+            lines.append("# TYPE napalm_asa_request_duration_seconds histogram")
+            for (host, method, endpoint), histogram in sorted(self._requests.items()):
+                labels = [("host", host), ("method", method), ("endpoint", endpoint)]
+                lines.extend(
+                    self._histogram_lines(
+                        "napalm_asa_request_duration_seconds",
+                        labels,
+                        histogram,
+                        self.buckets,
+                    )
+                )
+
+            lines.append("# HELP napalm_asa_requests_total REST requests by status.")
+            lines.append("# TYPE napalm_asa_requests_total counter")
+            for (host, method, endpoint, status), count in sorted(
+                self._statuses.items(), key=lambda item: str(item[0])
+            ):
+                labels = [
+                    ("host", host),
+                    ("method", method),
+                    ("endpoint", endpoint),
+                    ("status", status),
+                ]
+                lines.append(
+                    "napalm_asa_requests_total{{{}}} {}".format(_labels(labels), count)
+                )
+
+            for name, help_text, counters in (
+                ("response_bytes_total", "REST response bytes.", self._bytes),
+                ("retries_total", "REST request retries.", self._retries),
+            ):
+                lines.append("# HELP napalm_asa_{} {}".format(name, help_text))
+                lines.append("# TYPE napalm_asa_{} counter".format(name))
+                for (host, method, endpoint), count in sorted(counters.items()):
+                    labels = [
+                        ("host", host),
+                        ("method", method),
+                        ("endpoint", endpoint),
+                    ]
+                    lines.append(
+                        "napalm_asa_{}{{{}}} {}".format(name, _labels(labels), count)
+                    )
+
+            lines.append(
+                "# HELP napalm_asa_pages_total Pages of paginated collections."
+            )
+            lines.append("# TYPE napalm_asa_pages_total counter")
+            for (host, endpoint), count in sorted(self._pages.items()):
+                labels = [("host", host), ("endpoint", endpoint)]
+                lines.append(
+                    "napalm_asa_pages_total{{{}}} {}".format(_labels(labels), count)
+                )
+
+            lines.append(
+                "# HELP napalm_asa_getter_duration_seconds Driver method latency."
+            )
+            lines.append("# TYPE napalm_asa_getter_duration_seconds histogram")
+            for (host, getter), histogram in sorted(self._getters.items()):
+                lines.extend(
+                    self._histogram_lines(
+                        "napalm_asa_getter_duration_seconds",
+                        [("host", host), ("getter", getter)],
+                        histogram,
+                        self.buckets,
+                    )
+                )
+
+            lines.append(
+                "# HELP napalm_asa_getter_errors_total Driver methods that raised."
+            )
+            lines.append("# TYPE napalm_asa_getter_errors_total counter")
+            for (host, getter), count in sorted(self._errors.items()):
+                labels = [("host", host), ("getter", getter)]
+                lines.append(
+                    "napalm_asa_getter_errors_total{{{}}} {}".format(
+                        _labels(labels), count
+                    )
+                )
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Poll getters of an ASA and yield only what changed since the previous poll.
+
+    from napalm_asa.poller import ASAPoller
+
+    poller = ASAPoller(device, ["get_interfaces", "get_arp_table", "get_facts"],
+                       interval=30, intervals={"get_facts": 3600})
+    for change in poller.run():
+        print(change.getter, change.kind, change.key, change.value)
+"""
+
+from __future__ import unicode_literals
+
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+PollChange = namedtuple("PollChange", ["getter", "kind", "key", "value"])
+PollChange.__doc__ = """One change found by a poll.
+
+``kind`` is ``"add"``, ``"remove"`` or ``"change"``. ``key`` identifies the
+record within the getter result, like the interface name of get_interfaces
+or the ``(interface, ip)`` of an ARP entry, and ``value`` is the new record,
+None for a removal.
+"""
+
+# Fields identifying the entries of the getters returning lists.
+KEY_FIELDS = {
+    "get_arp_table": ("interface", "ip"),
+}
+
+
+def _freeze(value):
+    """Turn dicts and lists into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _fingerprint(record):
+    """Hash a record, flat dicts without sorting their items."""
+    if isinstance(record, dict):
+        try:
+            return hash(frozenset(record.items()))
+        except TypeError:
+            pass
+    return hash(_freeze(record))
+
+
+def _records(name, result):
+    """Yield the ``(key, record)`` pairs of a getter result."""
+    if isinstance(result, dict):
+        for pair in result.items():
+            yield pair
+    elif isinstance(result, list):
+        fields = KEY_FIELDS.get(name)
+        if fields is None:
+            for record in result:
+                yield _freeze(record), record
+            return
+        # Decoded JSON repeats equal strings, like the interface of every ARP
+        # entry, share them between the keys kept in the state.
+        share = {}.setdefault
+        get_key = itemgetter(*fields)
+        for record in result:
+            key = get_key(record)
+            if len(fields) == 1:
+                key = (key,)
+            yield tuple(map(share, key, key)), record
+    else:
+        yield None, result
+
+
+class _Getter:
+    """Schedule and last state of one polled getter."""
+
+    def __init__(self, name, kwargs, interval, keys):
+        self.name = name
+        self.kwargs = kwargs
+        self.interval = interval
+        self.keys = keys
+        self.due = 0.0
+        # Key of every record, with the hash of the record.
+        self.state = None
+
+
+class ASAPoller:
+    """
+    Poll getters of a driver, each at its own interval, and report the changes.
+
+    ``getters`` are driver method names, or ``(name, kwargs)`` pairs. They are
+    polled every ``interval`` seconds, unless ``intervals`` maps their name to
+    another interval. A getter result is split in records: the items of a
+    dict, or the entries of a list keyed by their KEY_FIELDS, or the whole
+    entry. ``keys`` may map a getter name to a function doing that split,
+    returning ``(key, record)`` pairs.
+
+    Only the hash of every record is kept between polls, so the state stays
+    small, and the changes are reported with the new records only. The hashes
+    are those of the running interpreter, the state is not meant to be saved.
+    The first poll of a getter reports every record as added.
+    """
+
+    def __init__(self, driver, getters, interval=30, intervals=None, keys=None):
+        """Class init."""
+        self.driver = driver
+        self.failed = {}
+        intervals = intervals or {}
+        keys = keys or {}
+        self._getters = []
+        for getter in getters:
+            if isinstance(getter, (tuple, list)):
+                name, kwargs = getter
+            else:
+                name, kwargs = getter, {}
+            self._getters.append(
+                _Getter(name, kwargs, intervals.get(name, interval), keys.get(name))
+            )
+
+    def next_due(self):
+        """Return the time.monotonic() time at which the next getter is due."""
+        return min(getter.due for getter in self._getters)
+
+    def reset(self):
+        """Forget the last states, the next poll reports every record as added."""
+        for getter in self._getters:
+            getter.state = None
+            getter.due = 0.0
+
+    def _diff(self, getter, result):
+        split = getter.keys or (lambda result: _records(getter.name, result))
+        previous = getter.state or {}
+        state = {}
+        changes = []
+        for key, record in split(result):
+            fingerprint = _fingerprint(record)
+            state[key] = fingerprint
+            old = previous.get(key)
+            if old is None:
+                changes.append(PollChange(getter.name, "add", key, record))
+            elif old != fingerprint:
+                changes.append(PollChange(getter.name, "change", key, record))
+        for key in previous:
+            if key not in state:
+                changes.append(PollChange(getter.name, "remove", key, None))
+
+        getter.state = state
+        return changes
+
+    def poll(self, now=None):
+        """
+        Run the getters that are due and return their changes.
+
+        A getter that raises keeps its last state, its exception is kept in
+        ``failed`` until it succeeds again.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        changes = []
+        for getter in self._getters:
+            if getter.due > now:
+                continue
+            # Keep to the schedule, unless a poll overran the next one.
+            getter.due += getter.interval
+            if getter.due <= now:
+                getter.due = now + getter.interval
+            try:
+                result = getattr(self.driver, getter.name)(**getter.kwargs)
+            except Exception as e:
+                self.failed[getter.name] = e
+                continue
+            self.failed.pop(getter.name, None)
+            changes.extend(self._diff(getter, result))
+
+        return changes
+
+    def run(self, cycles=None):
+        """
+        Poll until stopped, or ``cycles`` times, sleeping until a getter is due.
+
+        Yields the PollChange of every poll as they are found.
+        """
+        count = 0
+        while cycles is None or count < cycles:
+            delay = self.next_due() - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            for change in self.poll():
+                yield change
+            count += 1
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Dravetech AB. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+"""
+Stores for REST API auth tokens.
+
+With a token store, ASADriver.open() reuses a still valid token instead of
+authenticating again, and close() leaves the token on the device.
+"""
+
+from __future__ import unicode_literals
+
+import json
+import os
+import threading
+import time
+
+from napalm_asa.utils.files import file_lock, write_json_atomic
+
+
+class TokenStore:
+    """Base class of token stores. Tokens are keyed by user and API URL."""
+
+    def get(self, key):
+        """Return the token stored for ``key``, or None."""
+        raise NotImplementedError
+
+    def set(self, key, token):
+        """Store ``token`` for ``key``."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Forget the token stored for ``key``."""
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    """Keep tokens in memory, shared by the drivers of one process."""
+
+    def __init__(self):
+        """Class init."""
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._tokens.get(key)
+
+    def set(self, key, token):
+        with self._lock:
+            self._tokens[key] = token
+
+    def delete(self, key):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Keep tokens in a JSON file, shared across processes.
+
+    The file is readable by its owner only and is replaced atomically on
+    every write, so concurrent collectors never read a partial file. Updates
+    hold a lock on ``path`` + ".lock", so collectors writing at the same time
+    do not lose each other's tokens.
+    """
+
+    def __init__(self, path):
+        """Class init."""
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as token_file:
+                return json.load(token_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._read().get(key)
+        if entry is None:
+            return None
+        return entry["token"]
+
+    def set(self, key, token):
+        with self._lock, file_lock(self.path):
+            tokens = self._read()
+            tokens[key] = {"token": token, "stored": time.time()}
+            write_json_atomic(self.path, tokens, prefix=".napalm-asa-tokens")
+
+    def delete(self, key):
+        with self._lock, file_lock(self.path):
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                write_json_atomic(self.path, tokens, prefix=".napalm-asa-tokens")
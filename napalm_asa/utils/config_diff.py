@@ -0,0 +1,356 @@
+"""
+Section aware diff of ASA configurations.
+
+A config is split into sections: a top-level command with its indented
+children, all the entries of an access-list, or all the manual NAT rules.
+Sections are matched across the two configs by a dict lookup on their header,
+and unchanged sections are skipped with a single comparison of their text.
+Only the lines of changed sections are compared: lines are matched by hash,
+and the order of the matched lines is kept with a longest increasing
+subsequence, so a diff runs in O(n log n) instead of the quadratic time of
+difflib, and never compares characters.
+
+Diffs follow the napalm conventions: added lines start with ``+``, removed
+lines with ``-``, and the header of a changed section is shown unprefixed.
+"""
+
+from __future__ import unicode_literals
+
+import re
+from bisect import bisect_left
+
+# A top-level command and its children, or a run of entries of the same
+# access-list, or a run of NAT rules.
+_SECTION_RE = re.compile(
+    r"^(?:access-list (\S+) [^\n]*(?:\naccess-list \1 [^\n]*)*"
+    r"|(nat) [^\n]*(?:\nnat [^\n]*)*"
+    r"|([^\n]*)((?:\n[ \t][^\n]*)*))",
+    re.M,
+)
+# Commands that are not configuration: comments, the banner of show
+# running-config and its checksum. Children without a command are dropped too.
+_COMMENT_PREFIXES = ("!", ":", "Cryptochecksum:", "ASA Version ", "PIX Version ")
+_IGNORED_PREFIXES = (" ", "\t") + _COMMENT_PREFIXES
+
+
+def _normalize(config):
+    # Trailing whitespace is rare, a regex would try every space.
+    if "\r" in config:
+        config = config.replace("\r\n", "\n")
+    for blank in (" \n", "\t\n"):
+        while blank in config:
+            config = config.replace(blank, "\n")
+    return config.rstrip()
+
+
+def _strip_comments(body):
+    return "\n".join(
+        line for line in body.split("\n") if not line.lstrip().startswith("!")
+    )
+
+
+def parse_sections(config):
+    """
+    Split an ASA config into its sections.
+
+    Return a dict, in config order, mapping a section key to a ``(header,
+    body)`` tuple. Commands are keyed by their line and the number of commands
+    with the same line before them, ``header`` is the command and ``body`` the
+    text of its children. Access-list entries and NAT rules are grouped in a
+    section keyed by ``"access-list <name>"`` or ``"nat"``, with no header and
+    the entries as body. Sections compare equal by comparing their body.
+    """
+    sections = {}
+    occurrences = {}
+    ordered = {}
+
+    for match in _SECTION_RE.finditer(_normalize(config)):
+        acl, nat, header, body = match.groups()
+        if acl is not None:
+            name = "access-list " + acl
+        elif nat is not None:
+            name = "nat"
+        elif not header or header.startswith(_IGNORED_PREFIXES):
+            continue
+        else:
+            body = body[1:]
+            if "!" in body:
+                body = _strip_comments(body)
+            count = occurrences.get(header, 0)
+            occurrences[header] = count + 1
+            sections[(header, count)] = (header, body)
+            continue
+
+        entries = ordered.get(name)
+        if entries is None:
+            entries = ordered[name] = []
+            sections[(name, 0)] = None
+        entries.append(match.group())
+
+    for name, entries in ordered.items():
+        sections[(name, 0)] = (None, "\n".join(entries))
+
+    return sections
+
+
+def _lines(body):
+    return body.split("\n") if body else []
+
+
+def _keep_order(pairs):
+    """
+    Return the longest subsequence of ``pairs`` increasing on their second item.
+
+    ``pairs`` are sorted on their first item, so the result lists the lines
+    matched on both sides that can stay in place.
+    """
+    tails = []
+    tail_indexes = []
+    previous = [None] * len(pairs)
+
+    for index, (_, position) in enumerate(pairs):
+        length = bisect_left(tails, position)
+        if length == len(tails):
+            tails.append(position)
+            tail_indexes.append(index)
+        else:
+            tails[length] = position
+            tail_indexes[length] = index
+        previous[index] = tail_indexes[length - 1] if length else None
+
+    kept = []
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        kept.append(pairs[index])
+        index = previous[index]
+    kept.reverse()
+
+    return kept
+
+
+def _matches(old, new):
+    """
+    Return the ``(new_index, old_index)`` pairs of the lines kept in place.
+
+    A line matches the same line, counting duplicates, on the other side.
+    """
+    positions = {}
+    occurrences = {}
+    for index, line in enumerate(old):
+        count = occurrences.get(line, 0)
+        occurrences[line] = count + 1
+        positions[(line, count)] = index
+
+    occurrences = {}
+    pairs = []
+    for index, line in enumerate(new):
+        count = occurrences.get(line, 0)
+        occurrences[line] = count + 1
+        position = positions.get((line, count))
+        if position is not None:
+            pairs.append((index, position))
+
+    return _keep_order(pairs)
+
+
+def diff_lines(old, new):
+    """
+    Yield the ``(sign, line)`` changes turning the ``old`` lines into ``new``.
+
+    ``sign`` is ``"-"`` or ``"+"``. Matched lines that moved are reported as
+    removed and added.
+    """
+    old_index = new_index = 0
+    for kept_new, kept_old in _matches(old, new) + [(len(new), len(old))]:
+        for line in old[old_index:kept_old]:
+            yield "-", line
+        for line in new[new_index:kept_new]:
+            yield "+", line
+        old_index, new_index = kept_old + 1, kept_new + 1
+
+
+def _section_lines(sign, header, body):
+    if header is not None:
+        yield sign + header
+    for line in _lines(body):
+        yield sign + line
+
+
+def diff_configs(running, candidate):
+    """
+    Return the diff replacing the ``running`` config with ``candidate``.
+
+    Sections are listed in candidate order, the sections removed where they
+    were in the running config, before the sections added in their place.
+    """
+    old = parse_sections(running)
+    new = parse_sections(candidate)
+    old_keys = list(old)
+    old_positions = {key: index for index, key in enumerate(old_keys)}
+    diff = []
+    added = []
+    next_old = 0
+
+    def flush(until):
+        for key in old_keys[next_old:until]:
+            if key not in new:
+                diff.extend(_section_lines("-", *old[key]))
+        diff.extend(added)
+        del added[:]
+
+    for key, (header, body) in new.items():
+        position = old_positions.get(key)
+        if position is None:
+            added.extend(_section_lines("+", header, body))
+            continue
+        if position >= next_old:
+            flush(position)
+            next_old = position + 1
+        old_body = old[key][1]
+        if body == old_body:
+            continue
+        if header is not None:
+            diff.append(header)
+        diff.extend(
+            sign + line for sign, line in diff_lines(_lines(old_body), _lines(body))
+        )
+
+    flush(len(old_keys))
+
+    return "\n".join(diff)
+
+
+def merge_diff(running, candidate):
+    """
+    Return the diff merging ``candidate`` into the ``running`` config.
+
+    Lists the lines of the candidate missing from the running config, with the
+    header of the section they are added to.
+    """
+    old = parse_sections(running)
+    diff = []
+
+    for key, (header, body) in parse_sections(candidate).items():
+        if key not in old:
+            diff.extend(_section_lines("+", header, body))
+            continue
+        if body == old[key][1]:
+            continue
+        present = set(_lines(old[key][1]))
+        added = [line for line in _lines(body) if line not in present]
+        if added:
+            if header is not None:
+                diff.append(header)
+            diff.extend("+" + line for line in added)
+
+    return "\n".join(diff)
+
+
+def config_commands(config):
+    """
+    Return the commands of a config, in order, without comments and blank lines.
+
+    Children keep their indentation.
+    """
+    return [command for _, command in config_command_lines(config)]
+
+
+def config_command_lines(config):
+    """
+    Return the ``(line_number, command)`` pairs of the commands of a config.
+
+    Line numbers start at 1 and count the comments and blank lines skipped.
+    """
+    commands = []
+    for number, line in enumerate(_normalize(config).split("\n"), 1):
+        if not line or line.lstrip().startswith(_COMMENT_PREFIXES):
+            continue
+        commands.append((number, line))
+    return commands
+
+
+def _negate(line):
+    indent = line[: len(line) - len(line.lstrip())]
+    command = line.lstrip()
+    if command.startswith("no "):
+        return indent + command[3:]
+    return indent + "no " + command
+
+
+def _ordered_commands(name, old_body, new_body):
+    """
+    Return the commands removing and adding entries of an ordered section.
+
+    Return them as two lists, the removals and the additions.
+    """
+    old, new = _lines(old_body), _lines(new_body)
+    kept = _matches(old, new)
+    kept_old = {old_index for new_index, old_index in kept}
+    kept_new = {new_index for new_index, old_index in kept}
+
+    removals = [_negate(line) for i, line in enumerate(old) if i not in kept_old]
+    additions = []
+    for index, line in enumerate(new):
+        if index in kept_new:
+            continue
+        if name == "nat":
+            # Appended, manual NAT rules are not moved.
+            additions.append(line)
+        else:
+            # Inserting every new entry at its final position, in order, on top
+            # of the kept ones rebuilds the access-list.
+            additions.append(
+                line.replace(name + " ", "{} line {} ".format(name, index + 1), 1)
+            )
+    return removals, additions
+
+
+def replace_commands(running, candidate):
+    """
+    Return the commands turning the ``running`` config into ``candidate``.
+
+    Removed access-list entries and NAT rules are negated first, then the
+    removed sections, in reverse order so that references go before what they
+    reference. A removed section whose header is still in the candidate, like
+    the second "object network" listing the object NAT rule, only has its
+    children negated. The changed and new sections follow in candidate order.
+    Entries added to an access-list are inserted at their position with
+    ``line``, the NAT rules added are appended.
+    """
+    old = parse_sections(running)
+    new = parse_sections(candidate)
+    entry_removals = []
+    removals = []
+    commands = []
+
+    for key in reversed(list(old)):
+        if key in new:
+            continue
+        header, body = old[key]
+        if header is None:
+            removals.extend(_negate(line) for line in reversed(_lines(body)))
+        elif (header, 0) in new:
+            # Another section with this header is kept, only undo the children.
+            if body:
+                removals.append(header)
+                removals.extend(_negate(line) for line in _lines(body))
+        else:
+            removals.append(_negate(header))
+
+    for key, (header, body) in new.items():
+        if key not in old:
+            commands.extend(_section_lines("", header, body))
+            continue
+        old_body = old[key][1]
+        if body == old_body:
+            continue
+        if header is None:
+            removed, added = _ordered_commands(key[0], old_body, body)
+            entry_removals.extend(removed)
+            commands.extend(added)
+            continue
+        commands.append(header)
+        for sign, line in diff_lines(_lines(old_body), _lines(body)):
+            commands.append(_negate(line) if sign == "-" else line)
+
+    return entry_removals + removals + commands
@@ -0,0 +1,218 @@
+"""
+Indexed object model of an ASA config.
+
+parse_config builds an ASAConfig in a single pass over the sections of a
+config: interfaces, objects, object-groups, access-lists, access-groups and
+NAT rules. Reverse indexes answer "what references this object" or "which
+interface has this nameif" with a dict lookup instead of a scan of the config.
+Models only hold builtins and named tuples, so they pickle and can be cached.
+"""
+
+from __future__ import unicode_literals
+
+import re
+from collections import namedtuple
+
+from napalm_asa.utils.config_diff import parse_sections
+
+Interface = namedtuple(
+    "Interface",
+    ["name", "nameif", "security_level", "ip_address", "shutdown", "lines"],
+)
+ConfigObject = namedtuple("ConfigObject", ["name", "kind", "lines"])
+ObjectGroup = namedtuple("ObjectGroup", ["name", "kind", "lines", "references"])
+# ``line`` is the position of the entry in its access-list, starting at 1.
+AccessListEntry = namedtuple("AccessListEntry", ["acl", "line", "text", "references"])
+AccessGroup = namedtuple("AccessGroup", ["acl", "direction", "interface"])
+# ``object`` is the object of an object NAT rule, None for manual NAT.
+NatRule = namedtuple("NatRule", ["index", "object", "text", "references"])
+
+# Keywords followed by the name of an object or object-group.
+_REFERENCE_RE = re.compile(r" (?:object|object-group|group-object) +(\S+)")
+# NAT keywords followed by real and mapped objects.
+_NAT_KEYWORDS = frozenset(("static", "dynamic", "service"))
+
+
+def _references(text):
+    if "object" not in text:
+        return []
+    return _REFERENCE_RE.findall(text)
+
+
+def _nat_candidates(text):
+    words = text.split()
+    candidates = []
+    for i, word in enumerate(words):
+        if word in _NAT_KEYWORDS:
+            candidates.extend(words[i + 1 : i + 3])
+    return candidates
+
+
+class ASAConfig:
+    """
+    Structured view of an ASA config.
+
+    ``interfaces``, ``objects``, ``object_groups`` and ``access_lists`` are
+    dicts keyed by name, the access-lists holding their AccessListEntry in
+    order. ``access_groups`` maps an access-list to where it is applied, and
+    ``nat_rules`` lists the NAT rules in config order.
+    """
+
+    def __init__(self):
+        """Class init."""
+        self.hostname = ""
+        self.interfaces = {}
+        self.objects = {}
+        self.object_groups = {}
+        self.access_lists = {}
+        self.access_groups = {}
+        self.nat_rules = []
+        self.nameifs = {}
+        self.referrers = {}
+
+    def _add_referrer(self, names, record):
+        for name in names:
+            referrers = self.referrers.get(name)
+            if referrers is None:
+                self.referrers[name] = [record]
+            else:
+                referrers.append(record)
+
+    def interface_by_nameif(self, nameif):
+        """Return the Interface named ``nameif``, or None."""
+        return self.nameifs.get(nameif)
+
+    def referenced_by(self, name):
+        """
+        Return what references the object or object-group ``name`` directly.
+
+        The ObjectGroup, AccessListEntry and NatRule records are listed in
+        config order.
+        """
+        return list(self.referrers.get(name, ()))
+
+    def access_list_entries_using(self, name):
+        """
+        Return the access-list entries using ``name``, directly or through the
+        object-groups that include it.
+        """
+        entries = []
+        seen = {name}
+        pending = [name]
+        while pending:
+            for record in self.referrers.get(pending.pop(), ()):
+                if isinstance(record, AccessListEntry):
+                    entries.append(record)
+                elif isinstance(record, ObjectGroup) and record.name not in seen:
+                    seen.add(record.name)
+                    pending.append(record.name)
+
+        return entries
+
+    def access_lists_using(self, name):
+        """Return the names of the access-lists using ``name``, in config order."""
+        acls = {entry.acl for entry in self.access_list_entries_using(name)}
+        return [acl for acl in self.access_lists if acl in acls]
+
+    def unused_objects(self):
+        """Return the names of the objects and object-groups nothing references."""
+        return [
+            name
+            for names in (self.objects, self.object_groups)
+            for name in names
+            if name not in self.referrers
+        ]
+
+
+def _parse_interface(config, name, body):
+    nameif = security_level = ip_address = None
+    shutdown = False
+    lines = body.split("\n") if body else []
+    for line in lines:
+        command = line.strip()
+        if command.startswith("nameif "):
+            nameif = command[7:]
+        elif command.startswith("security-level "):
+            security_level = int(command[15:])
+        elif command.startswith("ip address "):
+            ip_address = command[11:]
+        elif command == "shutdown":
+            shutdown = True
+
+    interface = Interface(name, nameif, security_level, ip_address, shutdown, lines)
+    config.interfaces[name] = interface
+    if nameif is not None:
+        config.nameifs[nameif] = interface
+
+
+def parse_config(text):
+    """Parse an ASA config, as returned by "show running-config", in an ASAConfig."""
+    config = ASAConfig()
+    nat_candidates = []
+
+    for (name, _), (header, body) in parse_sections(text).items():
+        if header is None:
+            lines = body.split("\n")
+            if name == "nat":
+                for line in lines:
+                    rule = NatRule(len(config.nat_rules), None, line, [])
+                    config.nat_rules.append(rule)
+                    nat_candidates.append((rule, _nat_candidates(line)))
+                continue
+            acl = name[12:]
+            entries = config.access_lists.setdefault(acl, [])
+            for line in lines:
+                entry = AccessListEntry(acl, len(entries) + 1, line, _references(line))
+                entries.append(entry)
+                if entry.references:
+                    config._add_referrer(entry.references, entry)
+            continue
+
+        words = header.split(" ", 3)
+        keyword = words[0]
+        if keyword == "interface":
+            _parse_interface(config, header[10:], body)
+        elif keyword == "object" and len(words) == 3:
+            lines = body.split("\n") if body else []
+            nat = [line for line in lines if line.lstrip().startswith("nat ")]
+            if len(nat) < len(lines) or words[2] not in config.objects:
+                # show running-config lists the object NAT rules in a second
+                # definition of the object, a candidate may not.
+                config.objects[words[2]] = ConfigObject(
+                    words[2], words[1], [line for line in lines if line not in nat]
+                )
+            for line in nat:
+                line = line.strip()
+                rule = NatRule(len(config.nat_rules), words[2], line, [])
+                config.nat_rules.append(rule)
+                nat_candidates.append((rule, [words[2]] + _nat_candidates(line)))
+        elif keyword == "object-group" and len(words) >= 3:
+            lines = body.split("\n") if body else []
+            group = ObjectGroup(
+                words[2],
+                words[1],
+                lines,
+                [ref for line in lines for ref in _references(line)],
+            )
+            config.object_groups[group.name] = group
+            config._add_referrer(group.references, group)
+        elif keyword == "access-group":
+            parts = header.split()
+            direction = parts[2]
+            interface = parts[4] if len(parts) > 4 else None
+            config.access_groups.setdefault(parts[1], []).append(
+                AccessGroup(parts[1], direction, interface)
+            )
+        elif keyword == "hostname":
+            config.hostname = header[9:]
+
+    # NAT rules may name objects defined after them, resolve them at the end.
+    for rule, candidates in nat_candidates:
+        for candidate in candidates:
+            if (
+                candidate in config.objects or candidate in config.object_groups
+            ) and candidate not in rule.references:
+                rule.references.append(candidate)
+        config._add_referrer(rule.references, rule)
+
+    return config
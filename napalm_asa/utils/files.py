@@ -0,0 +1,53 @@
+"""Atomic writes and inter-process locks of the files shared by collectors."""
+
+from __future__ import unicode_literals
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, the files are only guarded within a process.
+    fcntl = None
+
+
+def write_json_atomic(path, data, prefix=".napalm-asa"):
+    """
+    Write ``data`` as JSON to ``path``, replacing the file atomically.
+
+    The file is readable by its owner only, and readers never see it partially
+    written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix)
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on ``path`` + ".lock", across processes.
+
+    Guards a read-modify-write of ``path`` against the other processes doing
+    the same. The lock file is left in place.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file releases the lock.
+        os.close(fd)
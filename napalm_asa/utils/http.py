@@ -0,0 +1,68 @@
+"""HTTP sessions of the REST agent, with tunable connection pools."""
+
+from __future__ import unicode_literals
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_shared_sessions = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def make_session(
+    pool_connections=10,
+    pool_maxsize=10,
+    pool_block=False,
+    keep_alive=True,
+    compression=True,
+):
+    """
+    Build a requests session for the REST agent.
+
+    ``pool_maxsize`` bounds the connections kept open per host, and with
+    ``pool_block`` requests wait for a free connection instead of opening a
+    connection that is discarded after use. Without ``keep_alive`` every
+    request uses a new connection. ``compression`` asks for gzip or deflate
+    encoded responses, otherwise for uncompressed ones.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate" if compression else "identity"
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def shared_session(host, **settings):
+    """
+    Return the session shared by the drivers of ``host`` with the same settings.
+
+    The connections, and their TLS sessions, are reused by every driver of
+    the host until close_shared_sessions() is called.
+    """
+    key = (host, tuple(sorted(settings.items())))
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = _shared_sessions[key] = make_session(**settings)
+
+    return session
+
+
+def close_shared_sessions():
+    """Close the shared sessions and their connections."""
+    with _shared_sessions_lock:
+        sessions = list(_shared_sessions.values())
+        _shared_sessions.clear()
+
+    for session in sessions:
+        session.close()
@@ -0,0 +1,113 @@
+"""JSON decoders for the REST responses."""
+
+from __future__ import unicode_literals
+
+import codecs
+import importlib
+import itertools
+import json
+import re
+
+# Tried in this order when no codec is requested.
+JSON_CODECS = ("orjson", "ujson", "json")
+
+
+def get_json_loads(codec=None):
+    """
+    Return a function decoding JSON from the raw bytes of a response.
+
+    Decoding the bytes directly skips the charset detection requests runs over
+    bodies that don't declare an encoding. ``codec`` names one of
+    JSON_CODECS, or is a callable used as is. By default the fastest installed
+    codec is used, falling back to the standard library.
+    """
+    if callable(codec):
+        return codec
+
+    if codec is not None:
+        if codec not in JSON_CODECS:
+            raise ValueError(
+                "Unknown JSON codec {}, expected one of {}".format(
+                    codec, ", ".join(JSON_CODECS)
+                )
+            )
+        return importlib.import_module(codec).loads
+
+    for name in JSON_CODECS[:-1]:
+        try:
+            return importlib.import_module(name).loads
+        except ImportError:
+            continue
+
+    return json.loads
+
+
+# Compiled patterns of the start of the array, by key.
+_ARRAY_START_RE = {}
+
+# The longest run of a JSON string body made of complete characters and escapes.
+# A high surrogate escape is only complete with the low surrogate following it.
+_STRING_PREFIX_RE = re.compile(
+    r'(?:[^"\\]+|\\["\\/bfnrt]|\\u(?![dD][89abAB])[0-9a-fA-F]{4}'
+    r"|\\u[dD][89abAB][0-9a-fA-F]{2}\\u[0-9a-fA-F]{4})*"
+)
+
+
+def iter_json_strings(chunks, key="response"):
+    """
+    Decode the strings of the ``key`` array of a JSON object incrementally.
+
+    ``chunks`` is an iterable of UTF-8 encoded bytes, such as the body of a
+    /cli response. Yields ``(index, fragment)`` tuples, where ``index`` is
+    the position of the string in the array and the fragments of a string
+    concatenate to its value. Only a chunk and a partial escape sequence are
+    held in memory.
+    """
+    if key not in _ARRAY_START_RE:
+        _ARRAY_START_RE[key] = re.compile(r'"{}"\s*:\s*\['.format(re.escape(key)))
+    array_start_re = _ARRAY_START_RE[key]
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    state = "key"
+    index = -1
+
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is None:
+            buf += decoder.decode(b"", final=True)
+        else:
+            buf += decoder.decode(chunk)
+        pos = 0
+
+        while pos < len(buf):
+            if state == "key":
+                match = array_start_re.search(buf, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                state = "array"
+            elif state == "array":
+                char = buf[pos]
+                pos += 1
+                if char == '"':
+                    index += 1
+                    state = "string"
+                elif char == "]":
+                    return
+                elif not char.isspace() and char != ",":
+                    raise ValueError("Expected a string in the {} array".format(key))
+            else:
+                match = _STRING_PREFIX_RE.match(buf, pos)
+                if match.end() > pos:
+                    yield index, json.loads('"' + match.group() + '"')
+                    pos = match.end()
+                if pos < len(buf) and buf[pos] == '"':
+                    pos += 1
+                    state = "array"
+                else:
+                    # An escape sequence cut by the end of the chunk.
+                    break
+
+        buf = buf[pos:]
+
+    raise ValueError("Truncated JSON, the {} array is not closed".format(key))
@@ -0,0 +1,334 @@
+"""Parsers shared by the sync and async ASA drivers."""
+
+from __future__ import unicode_literals
+
+import re
+from collections import OrderedDict, namedtuple
+
+from netaddr import IPNetwork
+
+_IF_HEADER_RE = re.compile(r"Interface (\S+) [^\n]*line protocol is (\S+)")
+_IF_MAC_RE = re.compile(r"MAC address ([0-9a-fA-F.]{14}),")
+_IF_MTU_RE = re.compile(r"MTU (\d+)")
+_IF_BW_RE = re.compile(r"BW (\d+) ([KMG])bps")
+_BW_UNITS = {"K": 0.001, "M": 1.0, "G": 1000.0}
+
+_VERSION_RE = re.compile(r"Software Version (\S+)")
+_UPTIME_RE = re.compile(r"^\S+ up ((?:\d+ \w+ ?)+)$", re.M)
+_UPTIME_UNIT_RE = re.compile(r"(\d+) (year|week|day|hour|min|sec)")
+_HARDWARE_RE = re.compile(r"^Hardware:\s+([^,\s]+)", re.M)
+_SERIAL_RE = re.compile(r"^Serial Number:\s+(\S+)", re.M)
+_INVENTORY_RE = re.compile(
+    r'Name:\s*"(?P<name>[^"]*)",\s*DESCR:\s*"(?P<descr>[^"]*)"\s*'
+    r"PID:\s*(?P<pid>\S*)\s*,\s*VID:\s*(?P<vid>\S*)\s*,\s*SN:\s*(?P<sn>\S*)"
+)
+_CHECKSUM_RE = re.compile(r"Cryptochecksum:\s*((?:[0-9a-fA-F]+\s*)+)")
+_CLI_ERROR_RE = re.compile(r"^ERROR:.*$", re.M)
+# Compact form of an ARP table entry, with the fields of the get_arp_table dicts.
+ArpEntry = namedtuple("ArpEntry", ["interface", "ip", "mac", "age"])
+AccessRule = namedtuple(
+    "AccessRule",
+    [
+        "interface",
+        "direction",
+        "position",
+        "permit",
+        "protocol",
+        "source",
+        "destination",
+        "service",
+        "active",
+        "log",
+        "remarks",
+        "rule_id",
+    ],
+)
+
+_UPTIME_SECONDS = {
+    "year": 31536000,
+    "week": 604800,
+    "day": 86400,
+    "hour": 3600,
+    "min": 60,
+    "sec": 1,
+}
+
+
+def parse_interfaces(responses):
+    """Build the base interfaces dict from the /interfaces/* REST responses."""
+    interfaces = OrderedDict()
+
+    for response in responses:
+        if response["rangeInfo"]["total"] > 0:
+            for int_info in response["items"]:
+                interfaces[int_info["hardwareID"]] = {
+                    "is_up": False,
+                    "is_enabled": not int_info["shutdown"],
+                    "description": int_info["interfaceDesc"],
+                    "last_flapped": -1.0,
+                    "speed": 0.0,
+                    "mtu": 0,
+                    "mac_address": "",
+                }
+
+    return interfaces
+
+
+def _parse_interface_block(output, if_status, pos, endpos):
+    """Parse the body of one interface, between ``pos`` and ``endpos``."""
+    details = {
+        "mac_address": "",
+        "is_up": if_status == "up",
+        "mtu": 0,
+        "speed": 0.0,
+    }
+
+    match = _IF_MAC_RE.search(output, pos, endpos)
+    if match is not None:
+        details["mac_address"] = match.group(1)
+
+    match = _IF_MTU_RE.search(output, pos, endpos)
+    if match is not None:
+        details["mtu"] = int(match.group(1))
+
+    match = _IF_BW_RE.search(output, pos, endpos)
+    if match is not None:
+        details["speed"] = float(match.group(1)) * _BW_UNITS[match.group(2)]
+
+    return details
+
+
+def parse_show_interface(output):
+    """
+    Split the output of "show interface" into per-interface details.
+
+    Blocks are delimited with plain substring searches for the interface
+    headers, and the precompiled field patterns search each block in place
+    instead of slicing it out.
+    """
+    ifs_details = OrderedDict()
+
+    starts = []
+    if output.startswith("Interface "):
+        starts.append(0)
+    pos = output.find("\nInterface ")
+    while pos >= 0:
+        starts.append(pos + 1)
+        pos = output.find("\nInterface ", pos + 1)
+    starts.append(len(output))
+
+    for start, endpos in zip(starts, starts[1:]):
+        header = _IF_HEADER_RE.match(output, start, endpos)
+        if header is not None:
+            ifs_details[header.group(1)] = _parse_interface_block(
+                output, header.group(2), header.end(), endpos
+            )
+
+    return ifs_details
+
+
+def parse_interfaces_details(results):
+    """Parse the output of "show interface <name>" commands, keyed by command."""
+    ifs_details = {}
+    prefix_len = len("show interface ")
+
+    for command, output in results.items():
+        header = _IF_HEADER_RE.match(output)
+        if_status = header.group(2) if header is not None else ""
+        ifs_details[command[prefix_len:]] = _parse_interface_block(
+            output, if_status, 0, len(output)
+        )
+
+    return ifs_details
+
+
+def parse_show_version(output):
+    """Parse os_version, uptime, model and serial_number from "show version"."""
+    version = {"os_version": "", "uptime": 0.0, "model": "", "serial_number": ""}
+
+    match = _VERSION_RE.search(output)
+    if match is not None:
+        version["os_version"] = match.group(1)
+
+    match = _UPTIME_RE.search(output)
+    if match is not None:
+        version["uptime"] = float(
+            sum(
+                int(value) * _UPTIME_SECONDS[unit]
+                for value, unit in _UPTIME_UNIT_RE.findall(match.group(1))
+            )
+        )
+
+    match = _HARDWARE_RE.search(output)
+    if match is not None:
+        version["model"] = match.group(1)
+
+    match = _SERIAL_RE.search(output)
+    if match is not None:
+        version["serial_number"] = match.group(1)
+
+    return version
+
+
+def parse_show_inventory(output):
+    """Parse "show inventory" into a list of dicts, in the order listed."""
+    return [match.groupdict() for match in _INVENTORY_RE.finditer(output)]
+
+
+def parse_show_checksum(output):
+    """Return the running config checksum of "show checksum", or ""."""
+    match = _CHECKSUM_RE.search(output)
+    if match is None:
+        return ""
+
+    return "".join(match.group(1).split()).lower()
+
+
+def parse_cli_error(output):
+    """Return the ERROR lines of the output of a config command, or ""."""
+    if "ERROR:" not in output:
+        return ""
+
+    return "\n".join(_CLI_ERROR_RE.findall(output))
+
+
+def parse_interfaces_ip(responses):
+    """Build the interfaces ip dict from the /interfaces/* REST responses."""
+    interfaces = {}
+
+    for response in responses:
+        if response["rangeInfo"]["total"] > 0:
+            for int_info in response["items"]:
+                if int_info["ipAddress"] != "NoneSelected":
+                    interfaces[int_info["hardwareID"]] = {}
+                    ipv4 = int_info["ipAddress"]
+                    ip = ipv4["ip"]["value"]
+                    mask = ipv4["netMask"]["value"]
+                    network = ip + "/" + mask
+                    prefix_length = IPNetwork(network).prefixlen
+                    interfaces[int_info["hardwareID"]]["ipv4"] = {
+                        ip: {"prefix_length": prefix_length}
+                    }
+
+                if len(int_info["ipv6Info"]["ipv6Addresses"]) > 0:
+                    if int_info["hardwareID"] not in interfaces:
+                        interfaces[int_info["hardwareID"]] = {}
+
+                    interfaces[int_info["hardwareID"]]["ipv6"] = {}
+                    for ipv6 in int_info["ipv6Info"]["ipv6Addresses"]:
+                        ip = ipv6["address"]["value"]
+                        prefix_length = ipv6["prefixLength"]
+                        interfaces[int_info["hardwareID"]]["ipv6"][ip] = {
+                            "prefix_length": prefix_length
+                        }
+
+    return interfaces
+
+
+def format_mac(mac):
+    """Turn a Cisco dotted MAC address, like 0200.5e02.0253, into 02:00:5e:02:02:53."""
+    if len(mac) == 14 and mac[4] == "." and mac[9] == ".":
+        return ":".join(
+            (mac[0:2], mac[2:4], mac[5:7], mac[7:9], mac[10:12], mac[12:14])
+        )
+
+    mac = mac.replace(".", "")
+    return ":".join(mac[i : i + 2] for i in range(0, len(mac) - 1, 2))
+
+
+def iter_arp_entries(items, compact=False):
+    """
+    Yield the ARP table entries of /monitoring/arp items.
+
+    Entries are get_arp_table dicts, or ArpEntry tuples if ``compact`` is set.
+    """
+    if compact:
+        for item in items:
+            yield ArpEntry(
+                item["interface"],
+                item["ipAddress"],
+                format_mac(item["macAddress"]),
+                0.0,
+            )
+    else:
+        for item in items:
+            yield {
+                "interface": item["interface"],
+                "ip": item["ipAddress"],
+                "mac": format_mac(item["macAddress"]),
+                "age": 0.0,
+            }
+
+
+def parse_arp_table(response):
+    """Build the ARP table from the /monitoring/arp REST response."""
+    if response["rangeInfo"]["total"] > 0:
+        return list(iter_arp_entries(response["items"]))
+
+    return []
+
+
+def format_rest_value(value):
+    """
+    Render an address or service of the REST API as the CLI does.
+
+    References to objects and object-groups become "object NAME" and
+    "object-group NAME", other values are returned as the API reports them,
+    like "any", "10.0.0.0/24" or "tcp/https".
+    """
+    kind = value.get("kind", "")
+    if kind.startswith("objectRef#"):
+        return "{} {}".format(
+            "object-group" if kind.endswith("Group") else "object",
+            value.get("objectId") or value.get("name"),
+        )
+
+    return value.get("value", "")
+
+
+def iter_access_rules(items, interface, direction, compact=False):
+    """
+    Yield the access rules of /access/.../rules items.
+
+    ``interface`` is the nameif the rules apply to, None for the global rules.
+    Rules are dicts, or AccessRule tuples if ``compact`` is set.
+    """
+    for item in items:
+        rule = AccessRule(
+            interface,
+            direction,
+            item["position"],
+            item["permit"],
+            format_rest_value(item["sourceService"]),
+            format_rest_value(item["sourceAddress"]),
+            format_rest_value(item["destinationAddress"]),
+            format_rest_value(item["destinationService"]),
+            item.get("active", True),
+            item.get("ruleLogging", {}).get("logStatus", "Default"),
+            item.get("remarks", []),
+            item["objectId"],
+        )
+        yield rule if compact else dict(zip(AccessRule._fields, rule))
+
+
+def iter_rest_objects(items):
+    """
+    Yield the objects or object-groups of /objects/... items.
+
+    Objects have a ``value``, object-groups the ``members`` they include, both
+    rendered by format_rest_value.
+    """
+    for item in items:
+        obj = {
+            "name": item.get("name") or item["objectId"],
+            "type": item["kind"].split("#", 1)[-1],
+            "description": item.get("description", ""),
+        }
+        if "members" in item:
+            obj["members"] = [format_rest_value(member) for member in item["members"]]
+        else:
+            # Network objects hold their address in "host", services in "value".
+            obj["value"] = format_rest_value(
+                item["host"] if "host" in item else item["value"]
+            )
+        yield obj
@@ -0,0 +1,97 @@
+"""Retry policy and adaptive concurrency limiter for the REST agent."""
+
+from __future__ import unicode_literals
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Statuses the REST agent returns when it is overloaded or restarting.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for idempotent requests.
+
+    Attempt ``n`` waits a random time between 0 and ``backoff * 2 ** n``
+    seconds, capped at ``max_backoff``. A Retry-After header sent by the device
+    takes precedence over the computed delay.
+    """
+
+    def __init__(self, retries=0, backoff=0.5, max_backoff=30, statuses=RETRY_STATUSES):
+        """Class init."""
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def can_retry(self, attempt):
+        """Return True if a request that failed ``attempt`` times may be retried."""
+        return attempt < self.retries
+
+    @staticmethod
+    def _parse_retry_after(retry_after):
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    def delay(self, attempt, retry_after=None):
+        """Return the seconds to wait before retrying after ``attempt`` failures."""
+        if retry_after is not None:
+            seconds = self._parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_backoff)
+
+        return random.uniform(0, min(self.backoff * (1 << attempt), self.max_backoff))
+
+
+class AIMDLimiter:
+    """
+    Additive increase, multiplicative decrease limit of requests in flight.
+
+    The limit grows by about one for every ``limit`` requests that complete
+    fine, and is multiplied by ``decrease`` when a request is answered with an
+    overload status, fails, or takes longer than ``latency_target`` seconds.
+    Share one limiter between all the drivers talking to the same device.
+    """
+
+    def __init__(
+        self, max_concurrency, min_concurrency=1, latency_target=None, decrease=0.5
+    ):
+        """Class init."""
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self.decrease = decrease
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency, overloaded=False):
+        """Record the outcome of a request and let the next one through."""
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded or (
+                self.latency_target is not None and latency > self.latency_target
+            ):
+                self.limit = max(self.min_concurrency, self.limit * self.decrease)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
@@ -0,0 +1,200 @@
+"""
+Single pass sanitizer of ASA configurations.
+
+Applies ASA_SANITIZE_FILTERS line by line with the same result as napalm's
+sanitize_configs, which runs every filter over the whole config in turn. A
+line is only handed to the filters whose keywords it contains, so most lines
+are checked with a single search for any keyword.
+
+Matches never span lines. napalm's filters starting with a whitespace class
+also match across the newline of an empty line, and the snmp-server host filter can
+swallow the rest of the config, leaving the lines after it untouched.
+"""
+
+from __future__ import unicode_literals
+
+import re
+
+from napalm_asa.constants import ASA_SANITIZE_FILTER_KEYWORDS, ASA_SANITIZE_FILTERS
+
+# Headers of the tacacs/radius server blocks matched by the multi-line filter.
+_BLOCK_HEADERS = ("tacacs server ", "radius server ")
+
+
+def _compile_filters():
+    before, block, after = [], [], []
+    for pattern, replacement in ASA_SANITIZE_FILTERS.items():
+        if pattern not in ASA_SANITIZE_FILTER_KEYWORDS:
+            raise ValueError(
+                "Sanitize filter {} has no ASA_SANITIZE_FILTER_KEYWORDS entry".format(
+                    pattern
+                )
+            )
+        keywords = ASA_SANITIZE_FILTER_KEYWORDS[pattern]
+        regex = re.compile(pattern, re.M)
+        if r"\n" in pattern:
+            block.append((regex, replacement))
+        elif block:
+            after.append((keywords, regex, replacement))
+        else:
+            before.append((keywords, regex, replacement))
+
+    line_filters = before + after
+    if any(keywords is None for keywords, regex, replacement in line_filters):
+        all_keywords = None
+    else:
+        all_keywords = sorted(
+            {keyword for entry in line_filters for keyword in entry[0]}
+        )
+
+    return before, block, after, all_keywords
+
+
+_LINE_FILTERS, _BLOCK_FILTERS, _LATE_LINE_FILTERS, _KEYWORDS = _compile_filters()
+if _KEYWORDS is None:
+    _CANDIDATE_RE = re.compile("")
+else:
+    _CANDIDATE_RE = re.compile("|".join(re.escape(k) for k in _KEYWORDS))
+
+
+def _apply(filters, line):
+    if line.endswith("\n"):
+        body, end = line[:-1], "\n"
+    else:
+        body, end = line, ""
+
+    for keywords, regex, replacement in filters:
+        if keywords is not None:
+            for keyword in keywords:
+                if keyword in body:
+                    break
+            else:
+                continue
+        body = regex.sub(replacement, body, 1)
+
+    return body + end
+
+
+def _sanitize_block(block):
+    text = "".join(block)
+    for regex, replacement in _BLOCK_FILTERS:
+        text = regex.sub(replacement, text)
+
+    for line in _split_lines(text):
+        if _CANDIDATE_RE.search(line) is not None:
+            line = _apply(_LATE_LINE_FILTERS, line)
+        yield line
+
+
+def sanitize_lines(lines):
+    """
+    Sanitize an iterable of config lines, yielding them as they are done.
+
+    Lines keep their trailing newline, if any. Only the lines of a tacacs or
+    radius server block are held back, until the end of the block.
+    """
+    block = []
+
+    for line in lines:
+        if block:
+            if line[:1].isspace():
+                if _CANDIDATE_RE.search(line) is not None:
+                    line = _apply(_LINE_FILTERS, line)
+                block.append(line)
+                continue
+            for sanitized in _sanitize_block(block):
+                yield sanitized
+            block = []
+
+        if _CANDIDATE_RE.search(line) is not None:
+            line = _apply(_LINE_FILTERS, line)
+
+        if _BLOCK_FILTERS and line.startswith(_BLOCK_HEADERS):
+            block.append(line)
+            continue
+
+        if _CANDIDATE_RE.search(line) is not None:
+            line = _apply(_LATE_LINE_FILTERS, line)
+        yield line
+
+    if block:
+        for sanitized in _sanitize_block(block):
+            yield sanitized
+
+
+def _split_lines(config):
+    # str.splitlines() also splits on \r and other separators, "$" doesn't.
+    lines = config.split("\n")
+    last = lines.pop()
+    for line in lines:
+        yield line + "\n"
+    if last:
+        yield last
+
+
+def _line_end(config, pos):
+    end = config.find("\n", pos)
+    return len(config) if end < 0 else end + 1
+
+
+def _candidate_lines(config):
+    """Return the sorted offsets of the lines holding a keyword or a block header."""
+    starts = set()
+
+    for keyword in _KEYWORDS:
+        pos = config.find(keyword)
+        while pos >= 0:
+            starts.add(config.rfind("\n", 0, pos) + 1)
+            pos = config.find(keyword, _line_end(config, pos))
+
+    if _BLOCK_FILTERS:
+        for header in _BLOCK_HEADERS:
+            if config.startswith(header):
+                starts.add(0)
+            pos = config.find("\n" + header)
+            while pos >= 0:
+                starts.add(pos + 1)
+                pos = config.find("\n" + header, pos + 1)
+
+    return sorted(starts)
+
+
+def sanitize_config(config):
+    """
+    Remove the secrets from an ASA config.
+
+    The lines holding a keyword or starting a server block are located with
+    plain substring searches over the whole config, the lines in between are
+    copied as they are.
+    """
+    if _KEYWORDS is None:
+        return "".join(sanitize_lines(_split_lines(config)))
+
+    parts = []
+    pos = 0
+
+    for start in _candidate_lines(config):
+        if start < pos:
+            # A line of a server block already sanitized.
+            continue
+        end = _line_end(config, start)
+        if _BLOCK_FILTERS and config.startswith(_BLOCK_HEADERS, start):
+            while end < len(config) and config[end].isspace():
+                end = _line_end(config, end)
+
+        parts.append(config[pos:start])
+        parts.extend(sanitize_lines(_split_lines(config[start:end])))
+        pos = end
+
+    parts.append(config[pos:])
+
+    return "".join(parts)
+
+
+def sanitize_configs(configs):
+    """Apply sanitize_config to the dict of configs returned by get_config."""
+    for cfg_name, config in configs.items():
+        if config.strip():
+            configs[cfg_name] = sanitize_config(config)
+
+    return configs
@@ -0,0 +1,58 @@
+"""Coalescing of concurrent identical calls."""
+
+from __future__ import unicode_literals
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run a single call at a time per key.
+
+    Threads calling do() with a key that is already in flight wait for the
+    running call and share its result, or its exception, instead of making
+    the call again.
+    """
+
+    def __init__(self):
+        """Class init."""
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, *args):
+        """
+        Return ``(func(*args), shared)``.
+
+        ``shared`` is True when the result comes from a call made by another
+        thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
@@ -0,0 +1,81 @@
+"""
+Benchmark the ARP table parsing.
+
+Compares the parser used before, which compiled a regex and ran re.findall
+for every MAC address, with the dict and compact entries of
+napalm_asa.utils.parsers.iter_arp_entries, on the mocked ARP table scaled up.
+
+    python test/benchmark/bench_arp_table.py [entries] [repeat]
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+
+from napalm_asa.utils.parsers import iter_arp_entries  # noqa: E402
+
+MOCK = os.path.join(ROOT, "test/unit/asa/mock_data/_monitoring_arp.json")
+
+
+def legacy_parse_arp_table(response):
+    """The parser used before iter_arp_entries."""
+    arp_table = []
+
+    if response["rangeInfo"]["total"] > 0:
+        for item in response["items"]:
+            mac = item["macAddress"].replace(".", "")
+            regex = re.compile(r".{2}")
+            mac = ":".join(re.findall(regex, mac))
+            arp_table.append(
+                {
+                    "interface": item["interface"],
+                    "ip": item["ipAddress"],
+                    "mac": mac,
+                    "age": 0.0,
+                }
+            )
+
+    return arp_table
+
+
+def synthesize(count):
+    """Build ``count`` ARP entries from the mocked ones."""
+    with open(MOCK) as f:
+        template = json.load(f)["items"][0]
+
+    items = []
+    for i in range(count):
+        item = dict(template)
+        item["ipAddress"] = "10.{}.{}.{}".format(i >> 16, (i >> 8) & 255, i & 255)
+        item["macAddress"] = "0200.{:04x}.{:04x}".format(i >> 16, i & 0xFFFF)
+        items.append(item)
+
+    return {"rangeInfo": {"offset": 0, "limit": count, "total": count}, "items": items}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    response = synthesize(count)
+    items = response["items"]
+
+    cases = (
+        ("legacy", lambda: legacy_parse_arp_table(response)),
+        ("dicts", lambda: list(iter_arp_entries(items))),
+        ("compact", lambda: list(iter_arp_entries(items, compact=True))),
+    )
+
+    print("{} entries, best of {} runs".format(count, repeat))
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print("{:<8} {:>10.3f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
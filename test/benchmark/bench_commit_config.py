@@ -0,0 +1,56 @@
+"""
+Benchmark commit_config against the local ASA REST stand-in.
+
+Merges an access-list of ``lines`` entries with several chunk sizes, over
+HTTPS with ``latency`` seconds added to every response. Chunks of one command,
+like a script sending one /cli request per command, push at most 1000 lines
+and the time of the whole access-list is extrapolated.
+
+    python test/benchmark/bench_commit_config.py [lines] [latency] [sizes]
+"""
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..", "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "test", "unit"))
+
+from napalm_asa.asa import ASADriver  # noqa: E402
+from asa_standin import ASAStandIn  # noqa: E402
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    sizes = sys.argv[3] if len(sys.argv) > 3 else "1,100,500,2000"
+
+    acl = [
+        "access-list BENCH extended permit tcp any host 10.{}.{}.{} eq https".format(
+            i >> 16, (i >> 8) & 255, i & 255
+        )
+        for i in range(lines)
+    ]
+
+    print("{} lines, {} s latency".format(lines, latency))
+    with ASAStandIn(latency=latency) as asa:
+        for size in (int(size) for size in sizes.split(",")):
+            count = min(lines, 1000) if size == 1 else lines
+            device = ASADriver(**asa.driver_args(config_chunk_size=size))
+            device.open()
+            device.load_merge_candidate(config="\n".join(acl[:count]))
+            start = time.perf_counter()
+            device.commit_config()
+            elapsed = (time.perf_counter() - start) * lines / count
+            device.close()
+            print(
+                "chunks of {:<5} {:>9.1f} s {}".format(
+                    size, elapsed, "(extrapolated)" if count < lines else ""
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark compare_config on a large config.
+
+Builds a config of about ``lines`` lines from interfaces, object-groups and
+access-lists, changes one section in a hundred, and times the section aware
+diff of napalm_asa.utils.config_diff against difflib.unified_diff over the
+lines.
+
+    python test/benchmark/bench_config_diff.py [lines] [repeat] [--no-difflib]
+"""
+
+import difflib
+import os
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+
+from napalm_asa.utils.config_diff import diff_configs  # noqa: E402
+
+
+def synthesize(lines, changed=False):
+    """Build a config of about ``lines`` lines, with some sections changed."""
+    sections = lines // 10
+    interfaces, groups, acls = [], [], [[] for _ in range(50)]
+    for i in range(sections):
+        edit = changed and i % 100 == 0
+        net = "10.{}.{}".format(i >> 8, i & 255)
+        interfaces.append("interface GigabitEthernet0/{}".format(i))
+        interfaces.append(" nameif if{}".format(i))
+        interfaces.append(" security-level {}".format(50 if edit else 100))
+        interfaces.append(" ip address {}.1 255.255.255.0".format(net))
+        groups.append("object-group network GROUP{}".format(i))
+        groups.append(" network-object host {}.10".format(net))
+        if not edit:
+            groups.append(" network-object host {}.11".format(net))
+        for j in range(3):
+            acls[i % 50].append(
+                "access-list ACL{} extended permit tcp any object-group GROUP{} "
+                "eq {}".format(i % 50, i, 443 + j + (1 if edit else 0))
+            )
+
+    parts = ["ASA Version 9.8(2)", "hostname fw1"] + interfaces + groups
+    for acl in acls:
+        parts.extend(acl)
+    return "\n".join(parts) + "\n"
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    lines = int(args[0]) if args else 300000
+    repeat = int(args[1]) if len(args) > 1 else 3
+
+    running = synthesize(lines)
+    candidate = synthesize(lines, changed=True)
+    running_lines = running.splitlines()
+    candidate_lines = candidate.splitlines()
+
+    cases = [("sections", lambda: diff_configs(running, candidate))]
+    if "--no-difflib" not in sys.argv:
+        cases.append(
+            (
+                "difflib",
+                lambda: list(difflib.unified_diff(running_lines, candidate_lines)),
+            )
+        )
+
+    print(
+        "{} lines, {} diff lines, best of {} runs".format(
+            len(running_lines),
+            len(diff_configs(running, candidate).splitlines()),
+            repeat,
+        )
+    )
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print("{:<9} {:>10.1f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
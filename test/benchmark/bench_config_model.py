@@ -0,0 +1,58 @@
+"""
+Benchmark parse_config and the config model lookups on a large config.
+
+Parses the config of about ``lines`` lines synthesized by bench_config_diff,
+then times reference lookups against a scan of the config text for the same
+answer.
+
+    python test/benchmark/bench_config_model.py [lines] [repeat]
+"""
+
+import os
+import pickle
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", ".."))
+sys.path.insert(0, HERE)
+
+from napalm_asa.utils.config_model import parse_config  # noqa: E402
+from bench_config_diff import synthesize  # noqa: E402
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    text = synthesize(lines)
+    config = parse_config(text)
+    data = pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+    name = "GROUP{}".format(lines // 20)
+    pattern = " object-group {} ".format(name)
+
+    cases = [
+        ("parse", lambda: parse_config(text), 1),
+        ("pickle.loads", lambda: pickle.loads(data), 1),
+        ("lookup", lambda: config.access_lists_using(name), 1000),
+        (
+            "text scan",
+            lambda: {line.split()[1] for line in text.splitlines() if pattern in line},
+            1,
+        ),
+    ]
+
+    print(
+        "{} lines, {} access-list entries, best of {} runs".format(
+            len(text.splitlines()),
+            sum(len(entries) for entries in config.access_lists.values()),
+            repeat,
+        )
+    )
+    for case, func, number in cases:
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        print("{:<12} {:>10.3f} ms".format(case, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark the getters against the local ASA REST stand-in.
+
+Starts test/unit/asa_standin.py with a data center sized dataset, times every
+getter of a real ASADriver over HTTPS and compares the best run with the
+thresholds of thresholds.json, in milliseconds. Exits with status 1 if a
+getter is slower than its threshold. The thresholds are set for the default
+dataset without latency. Runs offline.
+
+    python test/benchmark/bench_getters.py [--interfaces 1000] [--arp 100000]
+        [--access-rules 100000] [--config-scale 200] [--latency 0]
+        [--page-limit 100] [--repeat 3]
+        [--optional-args '{"parallel_pages": true}'] [--thresholds path]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..", "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "test", "unit"))
+
+from napalm_asa import extensions  # noqa: E402
+from napalm_asa.asa import ASADriver  # noqa: E402
+from asa_standin import ASAStandIn  # noqa: E402
+
+THRESHOLDS = os.path.join(HERE, "thresholds.json")
+
+GETTERS = (
+    ("is_alive", lambda device: device.is_alive()),
+    ("get_facts", lambda device: device.get_facts()),
+    ("get_interfaces", lambda device: device.get_interfaces()),
+    ("get_interfaces_ip", lambda device: device.get_interfaces_ip()),
+    ("get_arp_table", lambda device: device.get_arp_table()),
+    (
+        "iter_access_rules",
+        lambda device: sum(
+            1 for _ in extensions.iter_access_rules(device, compact=True)
+        ),
+    ),
+    ("get_config", lambda device: device.get_config()),
+    ("get_config_sanitized", lambda device: device.get_config(sanitized=True)),
+    ("cli", lambda device: device.cli(["show version", "show interface"])),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--interfaces", type=int, default=1000)
+    parser.add_argument("--arp", type=int, default=100000)
+    parser.add_argument("--access-rules", type=int, default=100000)
+    parser.add_argument("--config-scale", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--page-limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--optional-args", type=json.loads, default={})
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+
+    standin = ASAStandIn(
+        interfaces=args.interfaces,
+        arp_entries=args.arp,
+        config_scale=args.config_scale,
+        latency=args.latency,
+        page_limit=args.page_limit,
+        access_rules=args.access_rules,
+    )
+    regressions = []
+
+    with standin:
+        device = ASADriver(**standin.driver_args(**args.optional_args))
+        device.open()
+        print(
+            "{} interfaces, {} ARP entries, {} access rules, {} config bytes, "
+            "best of {} runs".format(
+                args.interfaces,
+                args.arp,
+                args.access_rules,
+                len(standin.data.run("show running-config")),
+                args.repeat,
+            )
+        )
+        for name, getter in GETTERS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                getter(device)
+                timings.append(time.perf_counter() - start)
+            best = min(timings) * 1000
+            threshold = thresholds.get(name)
+            status = ""
+            if threshold is not None and best > threshold:
+                status = "REGRESSION (threshold {} ms)".format(threshold)
+                regressions.append(name)
+            print("{:<22} {:>10.1f} ms {}".format(name, best, status))
+        device.close()
+
+    if regressions:
+        print("Slower than the thresholds: {}".format(", ".join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the "show interface" parsers.
+
+Compares the per-interface path (one "show interface <name>" per interface),
+as it was parsed before and as it is parsed now, with the bulk path (a single
+"show interface" split into blocks).
+
+    python test/benchmark/bench_interface_details.py [interfaces] [repeat]
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+
+from napalm_asa.utils.parsers import (  # noqa: E402
+    parse_interfaces_details,
+    parse_show_interface,
+)
+
+MOCK = os.path.join(ROOT, "test/unit/asa/mock_data/_cli_get_interfaces_multiple.json")
+
+
+def legacy_parse_interfaces_details(results):
+    """The parser used before the compiled, single pass one."""
+    ifs_details = {}
+    for command, details in results.items():
+        if_name = re.search(r"show interface (.*)", command).group(1)
+        match_mac = re.search(r"MAC address (.{14}),", details)
+        mac = ""
+        if match_mac is not None:
+            mac = match_mac.group(1)
+
+        match_if_status = re.search(r"line protocol is (.{2,4})\n", results[command])
+        if match_if_status.group(1) == "up":
+            if_up = True
+        else:
+            if_up = False
+
+        match_mtu = re.search(r"MTU (.{1,4})\n", details)
+        mtu = 0
+        if match_mtu is not None:
+            mtu = int(match_mtu.group(1))
+
+        ifs_details[if_name] = {"mac_address": mac, "is_up": if_up, "mtu": mtu}
+
+    return ifs_details
+
+
+def synthesize(count):
+    """Build ``count`` subinterfaces of GigabitEthernet0/0 from the mock output."""
+    with open(MOCK) as f:
+        template = json.load(f)["response"][3]
+
+    results = {}
+    for i in range(count):
+        name = "GigabitEthernet0/0.{}".format(i + 1)
+        results["show interface " + name] = template.replace("Management0/0.2", name)
+
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    results = synthesize(count)
+    bulk_output = "".join(results.values())
+    assert len(parse_show_interface(bulk_output)) == count
+
+    cases = (
+        ("legacy per-interface", lambda: legacy_parse_interfaces_details(results)),
+        ("per-interface", lambda: parse_interfaces_details(results)),
+        ("bulk", lambda: parse_show_interface(bulk_output)),
+    )
+
+    print("{} interfaces, best of {} runs".format(count, repeat))
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print("{:<22} {:>10.3f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the decoding of large REST responses.
+
+Compares requests' Response.json(), which runs charset detection over bodies
+that don't declare an encoding, with the codecs of napalm_asa.utils.json_codec
+decoding the raw bytes. The payloads are the mocked "show running-config" and
+ARP table, scaled up.
+
+    python test/benchmark/bench_json_codec.py [scale] [repeat]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+
+from napalm_asa.utils.json_codec import JSON_CODECS, get_json_loads  # noqa: E402
+
+MOCK_DATA = os.path.join(ROOT, "test/unit/asa/mock_data")
+
+
+def load_mock(name):
+    with open(os.path.join(MOCK_DATA, name)) as f:
+        return json.load(f)
+
+
+def synthesize_config(scale):
+    """Repeat the mocked running config ``scale`` times in one CLI response."""
+    config = load_mock("_cli_show_startup-config_show_running-config.json")
+    config = config["response"][1]
+    return {"response": [config * scale]}
+
+
+def synthesize_arp(scale):
+    """Repeat the mocked ARP entries ``scale`` times in one page."""
+    arp = load_mock("_monitoring_arp.json")
+    items = arp["items"] * scale
+    arp["items"] = items
+    arp["rangeInfo"] = {"offset": 0, "limit": len(items), "total": len(items)}
+    return arp
+
+
+def make_response(payload):
+    """Build a response without a declared charset, as the REST agent sends them."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    cases = [("requests Response.json()", lambda response: response.json())]
+    for codec in JSON_CODECS:
+        try:
+            loads = get_json_loads(codec)
+        except ImportError:
+            print("{} is not installed".format(codec))
+            continue
+        cases.append(
+            ("{}.loads(bytes)".format(codec), lambda r, loads=loads: loads(r.content))
+        )
+
+    for label, payload in (
+        ("running-config", synthesize_config(scale)),
+        ("ARP table", synthesize_arp(scale)),
+    ):
+        response = make_response(payload)
+        print(
+            "{}: {:.1f} MB, best of {} runs".format(
+                label, len(response.content) / 1e6, repeat
+            )
+        )
+        for name, func in cases:
+            best = min(timeit.repeat(lambda: func(response), number=1, repeat=repeat))
+            print("  {:<26} {:>10.3f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
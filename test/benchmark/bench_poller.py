@@ -0,0 +1,76 @@
+"""
+Benchmark ASAPoller against the local ASA REST stand-in.
+
+Polls the interfaces and an ARP table of ``arp`` entries, then changes
+``churn`` of the ARP entries between polls. Reports the time of a poll, the
+records reported against the records returned by the getters, and the memory
+of the poller state against keeping the previous results to diff them.
+
+    python test/benchmark/bench_poller.py [arp] [churn] [polls]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..", "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "test", "unit"))
+
+from napalm_asa.asa import ASADriver  # noqa: E402
+from napalm_asa.poller import ASAPoller  # noqa: E402
+from asa_standin import ASAStandIn  # noqa: E402
+
+
+def main():
+    arp = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    churn = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    polls = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    with ASAStandIn(interfaces=1000, arp_entries=arp) as asa:
+        device = ASADriver(**asa.driver_args())
+        device.open()
+        items = asa.data.collections["/monitoring/arp"]["items"]
+        getters = ["get_interfaces", "get_arp_table"]
+
+        tracemalloc.start()
+        results = [getattr(device, getter)() for getter in getters]
+        results_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        records = sum(len(result) for result in results)
+        del results
+
+        poller = ASAPoller(device, getters, interval=0)
+        tracemalloc.start()
+        changes = poller.poll()
+        del changes
+        state_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(
+            "{} records per poll, state {:.1f} MB, previous results {:.1f} MB".format(
+                records, state_size / 1e6, results_size / 1e6
+            )
+        )
+        step = max(1, int(1 / churn)) if churn else 0
+        for number in range(polls):
+            if step:
+                for i in range(number % step, len(items), step):
+                    items[i] = dict(
+                        items[i], macAddress="0201.{:04x}.{:04x}".format(number, i)
+                    )
+            start = time.perf_counter()
+            changes = poller.poll()
+            elapsed = time.perf_counter() - start
+            print(
+                "poll {}: {:>8.1f} ms, {} changes reported".format(
+                    number + 1, elapsed * 1000, len(changes)
+                )
+            )
+        device.close()
+
+
+if __name__ == "__main__":
+    main()
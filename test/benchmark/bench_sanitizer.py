@@ -0,0 +1,69 @@
+"""
+Benchmark the config sanitizers.
+
+Compares napalm's sanitize_config, which runs every filter over the whole
+config, with the single pass napalm_asa.utils.sanitizer on the mocked running
+config scaled up.
+
+    python test/benchmark/bench_sanitizer.py [scale] [repeat]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+from napalm.base.helpers import sanitize_config as napalm_sanitize_config
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+
+from napalm_asa.constants import ASA_SANITIZE_FILTERS  # noqa: E402
+from napalm_asa.utils.sanitizer import sanitize_config  # noqa: E402
+
+MOCK = os.path.join(
+    ROOT, "test/unit/asa/mock_data/_cli_show_startup-config_show_running-config.json"
+)
+
+SECRETS = """username admin password s3cr3t privilege 15
+crypto isakmp key s3cr3t address 0.0.0.0 no-xauth
+tacacs server TAC1
+ address ipv4 10.0.0.5
+ key tacacskey
+"""
+
+
+def synthesize(scale):
+    """Repeat the mocked running config, with a few secrets, ``scale`` times."""
+    with open(MOCK) as f:
+        config = json.load(f)["response"][1]
+
+    return (config + SECRETS) * scale
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    config = synthesize(scale)
+    assert sanitize_config(config) == napalm_sanitize_config(
+        config, ASA_SANITIZE_FILTERS
+    )
+
+    cases = (
+        ("napalm", lambda: napalm_sanitize_config(config, ASA_SANITIZE_FILTERS)),
+        ("single pass", lambda: sanitize_config(config)),
+    )
+
+    print(
+        "{:.1f} MB, {} lines, best of {} runs".format(
+            len(config) / 1e6, config.count("\n"), repeat
+        )
+    )
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print("{:<12} {:>10.3f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
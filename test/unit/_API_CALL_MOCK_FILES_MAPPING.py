@@ -1,6 +1,11 @@
 API_CALL_MOCK_FILES_MAPPING = {
     "_cli_show_hostname_show_hostname_fqdn": "_cli_show_hostname_show_hostname_fqdn.json",
+    "_cli_show_hostname_show_hostname_fqdn_show_version_show_inventory": "_cli_show_\
+hostname_show_hostname_fqdn_show_version_show_inventory.json",
+    "_cli_show_interface": "_cli_show_interface.json",
     "_cli_show_running-config": "_cli_show_running-config.json",
+    "_cli_show_running-config_access-list_show_running-config_nat": "_cli_show_\
+running-config_access-list_show_running-config_nat.json",
     "_cli_show_startup-config": "_cli_show_startup-config.json",
     "_cli_show_startup-config_show_running-config": "_cli_show_\
 startup-config_show_running-config.json",
@@ -8,7 +13,15 @@ startup-config_show_running-config.json",
     "_interfaces_portchannel": "_interfaces_portchannel.json",
     "_interfaces_redundant": "_interfaces_redundant.json",
     "_interfaces_vlan": "_interfaces_vlan.json",
+    "_access_global_rules": "_access_global_rules.json",
+    "_access_in": "_access_in.json",
+    "_access_in_OUTSIDE_rules": "_access_in_OUTSIDE_rules.json",
+    "_access_out": "_access_out.json",
     "_monitoring_arp": "_monitoring_arp.json",
+    "_objects_networkobjectgroups": "_objects_networkobjectgroups.json",
+    "_objects_networkobjects": "_objects_networkobjects.json",
+    "_objects_networkservicegroups": "_objects_networkservicegroups.json",
+    "_objects_networkservices": "_objects_networkservices.json",
     "_monitoring_device_components_version": "_monitoring_device_components_version.json",
     "_monitoring_serialnumber": "_monitoring_serialnumber.json",
     "_cli_show_interface_GigabitEthernet0_0_show_interface_Management0_0_show_interface_\
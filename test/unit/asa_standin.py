@@ -0,0 +1,407 @@
+"""
+Local stand-in for the ASA REST API.
+
+Serves the payloads of test/unit/asa/mock_data over HTTPS, with token
+authentication, paginated collections and the /cli commands used by the
+driver. The interfaces, the ARP table, the access rules and the running config
+can be scaled up, and every response can be delayed, to exercise the driver at
+data center size.
+
+    with ASAStandIn(interfaces=1000, arp_entries=100000, latency=0.01) as asa:
+        device = ASADriver(**asa.driver_args())
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import socketserver
+import ssl
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCK_DATA = os.path.join(HERE, "asa", "mock_data")
+CERTFILE = os.path.join(HERE, "asa", "standin.crt")
+KEYFILE = os.path.join(HERE, "asa", "standin.key")
+
+INVALID_INPUT = "ERROR: % Invalid input detected at '^' marker.\n"
+
+# First words of config commands accepted besides those of the running config.
+_CONFIG_KEYWORDS = frozenset(
+    (
+        "access-group",
+        "access-list",
+        "description",
+        "hostname",
+        "interface",
+        "ip",
+        "logging",
+        "nameif",
+        "nat",
+        "network-object",
+        "no",
+        "object",
+        "object-group",
+        "port-object",
+        "route",
+        "security-level",
+        "service-object",
+        "subnet",
+        "write",
+    )
+)
+
+_IF_HEADER_RE = re.compile(r"^Interface (\S+) ", re.M)
+
+
+def _load(name):
+    with open(os.path.join(MOCK_DATA, name)) as f:
+        return json.load(f)
+
+
+class StandInData:
+    """The data served by the stand-in, built from the mocked payloads."""
+
+    def __init__(
+        self, interfaces=None, arp_entries=None, config_scale=1, access_rules=None
+    ):
+        """
+        Build the dataset.
+
+        ``interfaces`` replaces the physical interfaces with that many
+        synthesized ones, ``arp_entries`` does the same for the ARP table and
+        ``access_rules`` for the inbound rules of OUTSIDE, and the running
+        config is repeated ``config_scale`` times.
+        """
+        self.collections = {}
+        for name in ("physical", "portchannel", "redundant", "vlan"):
+            self.collections["/interfaces/" + name] = _load(
+                "_interfaces_{}.json".format(name)
+            )
+        self.collections["/monitoring/arp"] = _load("_monitoring_arp.json")
+        for path in (
+            "/access/in",
+            "/access/out",
+            "/access/in/OUTSIDE/rules",
+            "/access/global/rules",
+            "/objects/networkobjects",
+            "/objects/networkobjectgroups",
+            "/objects/networkservices",
+            "/objects/networkservicegroups",
+        ):
+            self.collections[path] = _load(path.replace("/", "_") + ".json")
+        self.objects = {
+            "/monitoring/serialnumber": _load("_monitoring_serialnumber.json"),
+            "/monitoring/device/components/version": _load(
+                "_monitoring_device_components_version.json"
+            ),
+        }
+
+        show_interface = _load("_cli_show_interface.json")["response"][0]
+        self.interface_outputs = self._split_interfaces(show_interface)
+        if interfaces is not None:
+            self._synthesize_interfaces(interfaces)
+        if arp_entries is not None:
+            self._synthesize_arp(arp_entries)
+        if access_rules is not None:
+            self._synthesize_access_rules(access_rules)
+
+        hostname, fqdn, version, inventory = _load(
+            "_cli_show_hostname_show_hostname_fqdn_show_version_show_inventory.json"
+        )["response"]
+        startup, running = _load("_cli_show_startup-config_show_running-config.json")[
+            "response"
+        ]
+        self.cli_outputs = {
+            "show hostname": hostname,
+            "show hostname fqdn": fqdn,
+            "show version": version,
+            "show inventory": inventory,
+            "show startup-config": startup,
+        }
+        self.set_running_config(running * config_scale)
+        self.config_keywords = _CONFIG_KEYWORDS.union(
+            line.split()[0] for line in running.splitlines() if line.strip()
+        )
+        self.pushed = []
+
+    @staticmethod
+    def _split_interfaces(output):
+        starts = [match.start() for match in _IF_HEADER_RE.finditer(output)]
+        names = [match.group(1) for match in _IF_HEADER_RE.finditer(output)]
+        return {
+            name: output[start:end]
+            for name, start, end in zip(names, starts, starts[1:] + [len(output)])
+        }
+
+    def _synthesize_interfaces(self, count):
+        collection = self.collections["/interfaces/physical"]
+        template = collection["items"][0]
+        output_template = self.interface_outputs.pop(template["hardwareID"])
+        for item in collection["items"]:
+            self.interface_outputs.pop(item["hardwareID"], None)
+
+        items = []
+        for i in range(count):
+            name = "GigabitEthernet0/{}".format(i)
+            item = json.loads(json.dumps(template))
+            item["hardwareID"] = name
+            item["name"] = "if{}".format(i)
+            item["objectId"] = name.replace("/", "_API_SLASH_")
+            item["ipAddress"]["ip"]["value"] = "10.{}.{}.1".format(i >> 8, i & 255)
+            items.append(item)
+            self.interface_outputs[name] = output_template.replace(
+                template["hardwareID"], name
+            ).replace("008d.e011.ef01", "008d.e0{:02x}.{:04x}".format(i >> 16, i))
+        collection["items"] = items
+
+    def _synthesize_arp(self, count):
+        collection = self.collections["/monitoring/arp"]
+        template = collection["items"][0]
+        items = []
+        for i in range(count):
+            item = dict(template)
+            item["ipAddress"] = "10.{}.{}.{}".format(i >> 16, (i >> 8) & 255, i & 255)
+            item["macAddress"] = "0200.{:04x}.{:04x}".format(i >> 16, i & 0xFFFF)
+            items.append(item)
+        collection["items"] = items
+
+    def _synthesize_access_rules(self, count):
+        collection = self.collections["/access/in/OUTSIDE/rules"]
+        template = collection["items"][0]
+        items = []
+        for i in range(count):
+            item = json.loads(json.dumps(template))
+            item["position"] = i + 1
+            item["objectId"] = str(1000000000 + i)
+            item["sourceAddress"] = {
+                "kind": "IPv4Address",
+                "value": "10.{}.{}.{}".format(i >> 16, (i >> 8) & 255, i & 255),
+            }
+            items.append(item)
+        collection["items"] = items
+
+    def set_running_config(self, config):
+        """Replace the running config, and its checksum."""
+        digest = hashlib.md5(config.encode("utf-8")).hexdigest()
+        self.cli_outputs["show running-config"] = config
+        self.cli_outputs["show checksum"] = "Cryptochecksum: {} \n".format(
+            " ".join(digest[i : i + 8] for i in range(0, 32, 8))
+        )
+
+    def run(self, command):
+        """Return the output of a CLI command."""
+        if command in self.cli_outputs:
+            return self.cli_outputs[command]
+        if command == "show interface":
+            return "".join(self.interface_outputs.values())
+        if command.startswith("show interface "):
+            return self.interface_outputs.get(command[15:], INVALID_INPUT)
+        if command.startswith("show running-config "):
+            section = command[20:]
+            if section.startswith("all "):
+                section = section[4:]
+            return "".join(
+                line
+                for line in self.cli_outputs["show running-config"].splitlines(True)
+                if line.strip().startswith(section)
+            )
+        if not command.startswith("show "):
+            return self.configure(command)
+        return INVALID_INPUT
+
+    def configure(self, command):
+        """Record a config command in ``pushed``, rejecting unknown keywords."""
+        words = command.split()
+        if not words or words[0] not in self.config_keywords:
+            return INVALID_INPUT
+        if command == "write memory":
+            return "Building configuration...\n[OK]\n"
+        self.pushed.append(command)
+        return ""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle would delay the body.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method):
+        standin = self.server.standin
+        url = urlparse(self.path)
+        path = url.path[len("/api") :] if url.path.startswith("/api") else url.path
+        standin.count(method, path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if standin.latency:
+            time.sleep(standin.latency)
+
+        if path == "/tokenservices" and method == "POST":
+            if self.headers.get("Authorization") != standin.basic_auth:
+                return self._reply(401)
+            return self._reply(204, headers={"X-Auth-Token": standin.issue_token()})
+        if path.startswith("/tokenservices/") and method == "DELETE":
+            standin.revoke_token(path[len("/tokenservices/") :])
+            return self._reply(204)
+
+        if not standin.has_token(self.headers.get("X-Auth-Token")):
+            return self._reply(401)
+
+        if path == "/cli" and method == "POST":
+            commands = json.loads(body.decode("utf-8"))["commands"]
+            return self._reply(
+                200, {"response": [standin.data.run(command) for command in commands]}
+            )
+        if method != "GET":
+            return self._reply(405)
+        if path in standin.data.objects:
+            return self._reply(200, standin.data.objects[path])
+        if path in standin.data.collections:
+            query = parse_qs(url.query)
+            return self._reply(
+                200,
+                standin.page(
+                    path,
+                    int(query.get("offset", ["0"])[0]),
+                    int(query.get("limit", [str(standin.page_limit)])[0]),
+                ),
+            )
+        return self._reply(404)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class _Server(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ASAStandIn:
+    """
+    HTTPS server answering like the REST agent of an ASA.
+
+    Collections are served in pages of at most ``page_limit`` items, and every
+    response is delayed by ``latency`` seconds. ``requests`` counts the
+    requests received by method and path.
+    """
+
+    def __init__(
+        self,
+        interfaces=None,
+        arp_entries=None,
+        config_scale=1,
+        latency=0.0,
+        page_limit=100,
+        username="admin",
+        password="secret",
+        access_rules=None,
+    ):
+        """Class init."""
+        self.data = StandInData(interfaces, arp_entries, config_scale, access_rules)
+        self.latency = latency
+        self.page_limit = page_limit
+        self.username = username
+        self.password = password
+        self.basic_auth = "Basic " + base64.b64encode(
+            "{}:{}".format(username, password).encode("utf-8")
+        ).decode("ascii")
+        self.requests = Counter()
+        self.tokens = set()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.port = None
+
+    def count(self, method, path):
+        with self._lock:
+            self.requests[(method, path)] += 1
+
+    def issue_token(self):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.tokens.add(token)
+        return token
+
+    def revoke_token(self, token):
+        with self._lock:
+            self.tokens.discard(token)
+
+    def revoke_tokens(self):
+        """Expire every token, as a reboot of the device would."""
+        with self._lock:
+            self.tokens.clear()
+
+    def has_token(self, token):
+        with self._lock:
+            return token in self.tokens
+
+    def page(self, path, offset, limit):
+        """Return a page of the collection at ``path``."""
+        collection = self.data.collections[path]
+        limit = min(limit, self.page_limit)
+        items = collection["items"]
+        page = dict(collection)
+        page["rangeInfo"] = {"offset": offset, "limit": limit, "total": len(items)}
+        page["items"] = items[offset : offset + limit]
+        return page
+
+    def start(self):
+        """Start serving on a free port of the loopback interface."""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(CERTFILE, KEYFILE)
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def driver_args(self, **optional_args):
+        """Return the arguments of a driver connecting to the stand-in."""
+        optional_args["port"] = self.port
+        optional_args.setdefault("verify", CERTFILE)
+        return {
+            "hostname": "127.0.0.1",
+            "username": self.username,
+            "password": self.password,
+            "optional_args": optional_args,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
@@ -1,5 +1,6 @@
 """Test fixtures."""
 from builtins import super
+from collections import Counter
 
 import pytest
 from napalm.base.test import conftest as parent_conftest
@@ -10,6 +11,7 @@ from napalm_asa import asa
 from _API_CALL_MOCK_FILES_MAPPING import API_CALL_MOCK_FILES_MAPPING
 import json
 import re
+import time
 
 
 @pytest.fixture(scope="class")
@@ -76,3 +78,96 @@ class FakeASADevice(BaseTestDouble):
     def has_active_token(self):
         """Fake method to return token status"""
         return True
+
+
+class CountingFakeASADevice(FakeASADevice):
+    """ASA device test double counting the requests sent per endpoint."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    def get_resp(self, endpoint="", data=None):
+        """Count the request and return the mocked response."""
+        self.calls[endpoint] += 1
+        return super().get_resp(endpoint, data)
+
+
+@pytest.fixture
+def make_driver():
+    """
+    Return a factory of drivers talking to a test double.
+
+    ``make_driver(device, **optional_args)`` builds a PatchedASADriver, or a
+    ``driver_class`` subclass of ASADriver, for host fw1 with ``device`` in place
+    of the REST fetcher. Without ``device`` the driver keeps its default one.
+    """
+
+    def make(device=None, driver_class=None, **optional_args):
+        driver = (driver_class or PatchedASADriver)(
+            "fw1", "admin", "secret", optional_args=optional_args
+        )
+        if device is not None:
+            driver.device = device
+        return driver
+
+    return make
+
+
+class FakeResponse:
+    """requests.Response test double."""
+
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.content = json.dumps(body).encode() if body is not None else b""
+
+    def json(self):
+        """Return the body."""
+        return self.body
+
+    def iter_content(self, chunk_size=1):
+        """Yield the body in chunks."""
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        """Release the connection."""
+
+
+class FakeSession:
+    """Stand-in for requests.Session accepting a single valid token at a time."""
+
+    def __init__(self):
+        self.headers = {}
+        self.valid_token = None
+        self.issued = 0
+        self.deleted = 0
+        self.requests = 0
+        self.latency = 0
+
+    def post(self, url, **kwargs):
+        """Fake POST, issuing a new token on /tokenservices."""
+        if url.endswith("/tokenservices"):
+            self.issued += 1
+            self.valid_token = "token{}".format(self.issued)
+            return FakeResponse(204, {"X-Auth-Token": self.valid_token})
+        return self.get(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Fake GET, answering 401 unless the session carries the valid token."""
+        self.requests += 1
+        token = kwargs.get("headers", {}).get("X-Auth-Token")
+        time.sleep(self.latency)
+        if token != self.valid_token:
+            return FakeResponse(401)
+        return FakeResponse(
+            200, body={"kind": "object#QuerySerialNumber", "serialNumber": "9A"}
+        )
+
+    def delete(self, url, **kwargs):
+        """Fake DELETE, revoking the token."""
+        self.deleted += 1
+        self.valid_token = None
+        return FakeResponse(204)
@@ -0,0 +1,143 @@
+"""Tests for the streaming access rule and object getters."""
+
+import pytest
+
+from napalm_asa import extensions
+from napalm_asa.asa import ASADriver
+from napalm_asa.utils.parsers import AccessRule, format_rest_value
+from conftest import PatchedASADriver
+from asa_standin import ASAStandIn
+
+
+@pytest.fixture
+def driver():
+    return PatchedASADriver("127.0.0.1", "vagrant", "vagrant")
+
+
+def test_format_rest_value():
+    assert format_rest_value({"kind": "AnyIPAddress", "value": "any"}) == "any"
+    assert (
+        format_rest_value({"kind": "objectRef#NetworkObjGroup", "objectId": "WEB"})
+        == "object-group WEB"
+    )
+    assert (
+        format_rest_value({"kind": "objectRef#TcpUdpServiceObj", "objectId": "HTTPS"})
+        == "object HTTPS"
+    )
+
+
+def test_iter_access_rules(driver):
+    rules = list(extensions.iter_access_rules(driver))
+
+    assert rules[0] == {
+        "interface": "OUTSIDE",
+        "direction": "in",
+        "position": 1,
+        "permit": True,
+        "protocol": "tcp",
+        "source": "any",
+        "destination": "object-group WEB_SERVERS",
+        "service": "tcp/https",
+        "active": True,
+        "log": "Default",
+        "remarks": ["Published web servers"],
+        "rule_id": "1928034611",
+    }
+    assert [(rule["interface"], rule["direction"]) for rule in rules] == [
+        ("OUTSIDE", "in"),
+        ("OUTSIDE", "in"),
+        ("OUTSIDE", "in"),
+        (None, "global"),
+    ]
+    assert rules[1]["active"] is False
+    assert rules[3]["source"] == "object INTERNAL_NETWORK"
+
+
+def test_compact_access_rules(driver):
+    rules = list(extensions.iter_access_rules(driver, ["global"], compact=True))
+
+    assert rules == [
+        AccessRule(
+            None,
+            "global",
+            1,
+            True,
+            "icmp",
+            "object INTERNAL_NETWORK",
+            "any",
+            "icmp/echo",
+            True,
+            "Default",
+            [],
+            "844672394",
+        )
+    ]
+
+
+def test_unknown_direction(driver):
+    with pytest.raises(ValueError):
+        list(extensions.iter_access_rules(driver, ["inside"]))
+
+
+def test_iter_objects(driver):
+    objects = list(extensions.iter_objects(driver))
+    groups = list(extensions.iter_objects(driver, "networkobjectgroups"))
+
+    assert objects[0] == {
+        "name": "INTERNAL_NETWORK",
+        "type": "NetworkObj",
+        "description": "Inside users",
+        "value": "172.16.0.0/24",
+    }
+    assert objects[1]["value"] == "172.16.0.10"
+    assert groups == [
+        {
+            "name": "WEB_SERVERS",
+            "type": "NetworkObjGroup",
+            "description": "",
+            "members": ["object WEB1", "172.16.0.11"],
+        }
+    ]
+    with pytest.raises(ValueError):
+        extensions.iter_objects(driver, "users")
+
+
+def test_iter_service_objects(driver):
+    services = list(extensions.iter_objects(driver, "networkservices"))
+    groups = list(extensions.iter_objects(driver, "networkservicegroups"))
+
+    assert services == [
+        {
+            "name": "HTTPS_ALT",
+            "type": "TcpUdpServiceObj",
+            "description": "Alternate HTTPS",
+            "value": "tcp/8443",
+        },
+        {
+            "name": "PING",
+            "type": "ICMPServiceObj",
+            "description": "",
+            "value": "icmp/echo",
+        },
+    ]
+    assert groups == [
+        {
+            "name": "WEB_PORTS",
+            "type": "NetworkServiceGroup",
+            "description": "",
+            "members": ["object HTTPS_ALT", "tcp/https", "object-group MGMT_PORTS"],
+        }
+    ]
+
+
+def test_access_rules_are_streamed():
+    with ASAStandIn(access_rules=1050) as asa:
+        driver = ASADriver(**asa.driver_args())
+        driver.open()
+        rules = extensions.iter_access_rules(driver, ["in"], compact=True)
+
+        assert next(rules).source == "10.0.0.0"
+        assert asa.requests[("GET", "/access/in/OUTSIDE/rules")] == 1
+        assert [rule.position for rule in rules] == list(range(2, 1051))
+        assert asa.requests[("GET", "/access/in/OUTSIDE/rules")] == 11
+        driver.close()
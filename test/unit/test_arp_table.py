@@ -0,0 +1,44 @@
+"""Tests for the streaming ARP table."""
+
+import re
+
+import pytest
+
+from napalm_asa import extensions
+from napalm_asa.utils.parsers import ArpEntry, format_mac
+from conftest import PatchedASADriver
+
+
+def _legacy_format_mac(mac):
+    return ":".join(re.findall(r".{2}", mac.replace(".", "")))
+
+
+@pytest.mark.parametrize(
+    "mac", ["0200.5e02.0253", "A0B1.C2D3.E4F5", "0200.5e02.025", "02005e020253", ""]
+)
+def test_format_mac_as_before(mac):
+    assert format_mac(mac) == _legacy_format_mac(mac)
+
+
+@pytest.fixture
+def driver():
+    return PatchedASADriver("127.0.0.1", "vagrant", "vagrant")
+
+
+def test_iter_arp_table(driver):
+    entries = extensions.iter_arp_table(driver)
+
+    assert next(entries) == {
+        "interface": "inside",
+        "ip": "10.10.20.253",
+        "mac": "02:00:5e:02:02:53",
+        "age": 0.0,
+    }
+    assert [next(entries)] + list(entries) == driver.get_arp_table()[1:]
+
+
+def test_compact_entries(driver):
+    entries = list(extensions.iter_arp_table(driver, compact=True))
+
+    assert entries[0] == ArpEntry("inside", "10.10.20.253", "02:00:5e:02:02:53", 0.0)
+    assert [entry._asdict() for entry in entries] == driver.get_arp_table()
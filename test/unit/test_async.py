@@ -0,0 +1,74 @@
+"""Tests for the asyncio driver."""
+
+import asyncio
+import json
+
+import pytest
+
+from napalm_asa import asa_async
+from conftest import FakeASADevice
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _expected(getter):
+    filename = "test/unit/mocked_data/test_{}/normal/expected_result.json".format(
+        getter
+    )
+    with open(filename) as data_file:
+        return json.load(data_file)
+
+
+@pytest.fixture
+def device():
+    driver = asa_async.AsyncASADriver("127.0.0.1", "vagrant", "vagrant")
+    driver.device = asa_async.AsyncRespFetcherHttps(FakeASADevice(), max_concurrency=2)
+    yield driver
+    driver.device.shutdown()
+
+
+@pytest.mark.parametrize(
+    "getter", ["get_facts", "get_interfaces", "get_interfaces_ip", "get_arp_table"]
+)
+def test_getters_match_sync_driver(device, getter):
+    """The async getters return the same data as the sync driver."""
+    result = _run(getattr(device, getter)())
+
+    assert json.loads(json.dumps(result)) == _expected(getter)
+
+
+def test_is_alive(device):
+    assert _run(device.is_alive()) == {"is_alive": True}
+
+
+class FailingPageDevice:
+    """Serve 250 items in pages of 100, failing the page at offset 200."""
+
+    def get_resp(self, endpoint="", data=None, params=None, throw=True):
+        offset = params.get("offset", 0)
+        if offset == 200:
+            if throw:
+                raise AssertionError("the driver asked to raise")
+            return False
+        return {
+            "rangeInfo": {"offset": offset, "limit": 100, "total": 250},
+            "items": [{"id": i} for i in range(offset, min(offset + 100, 250))],
+        }
+
+
+def test_failed_page_without_throw():
+    driver = asa_async.AsyncASADriver(
+        "127.0.0.1", "vagrant", "vagrant", optional_args={"page_limit": 100}
+    )
+    driver.device = asa_async.AsyncRespFetcherHttps(FailingPageDevice())
+
+    response = _run(driver._send_request("/interfaces/physical", throw=False))
+    driver.device.shutdown()
+
+    assert response["items"] == [{"id": i} for i in range(200)]
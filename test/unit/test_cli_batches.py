@@ -0,0 +1,95 @@
+"""Tests for the batched cli()."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from napalm.base.exceptions import CommandErrorException
+
+from napalm_asa import asa_async
+from napalm_asa.asa import _cli_batches
+
+
+class BatchDevice:
+    """Echo the commands, failing the batches holding a "fail" command."""
+
+    def __init__(self):
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def get_resp(self, endpoint="", data=None):
+        commands = json.loads(data)["commands"]
+        with self._lock:
+            self.batches.append(commands)
+        if any(command.startswith("fail") for command in commands):
+            raise CommandErrorException("Operation returned an error: 500")
+        return {"response": ["output of " + command for command in commands]}
+
+
+COMMANDS = ["show command {}".format(i) for i in range(10)]
+
+
+def test_batches_by_count():
+    assert _cli_batches(COMMANDS, batch_size=4) == [
+        COMMANDS[0:4],
+        COMMANDS[4:8],
+        COMMANDS[8:10],
+    ]
+
+
+def test_batches_by_bytes():
+    batches = _cli_batches(["a" * 10, "b" * 10, "c" * 30, "d"], batch_bytes=30)
+
+    assert batches == [["a" * 10, "b" * 10], ["c" * 30], ["d"]]
+
+
+def test_single_batch_by_default(make_driver):
+    driver = make_driver(BatchDevice())
+
+    driver.cli(COMMANDS)
+
+    assert driver.device.batches == [COMMANDS]
+
+
+def test_results_in_order(make_driver):
+    driver = make_driver(BatchDevice(), cli_batch_size=3, cli_workers=3)
+
+    results = driver.cli(COMMANDS)
+
+    assert list(results) == COMMANDS
+    assert results["show command 7"] == "output of show command 7"
+    assert len(driver.device.batches) == 4
+
+
+def test_failures_per_command(make_driver):
+    driver = make_driver(BatchDevice(), cli_batch_size=2)
+    commands = ["show a", "fail b", "show c", "show d"]
+
+    with pytest.raises(CommandErrorException) as excinfo:
+        driver.cli(commands)
+
+    assert excinfo.value.results == {
+        "show c": "output of show c",
+        "show d": "output of show d",
+    }
+    assert set(excinfo.value.failures) == {"show a", "fail b"}
+
+
+def test_async_batches():
+    class AsyncBatchDevice(BatchDevice):
+        async def get_resp(self, endpoint="", data=None):
+            return BatchDevice.get_resp(self, endpoint, data)
+
+    driver = asa_async.AsyncASADriver(
+        "fw1", "admin", "secret", optional_args={"cli_batch_bytes": 40}
+    )
+    driver.device = AsyncBatchDevice()
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(driver.cli(COMMANDS))
+    finally:
+        loop.close()
+
+    assert list(results) == COMMANDS
+    assert len(driver.device.batches) == 5
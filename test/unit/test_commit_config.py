@@ -0,0 +1,244 @@
+"""Tests for the chunked commit_config."""
+
+import json
+import os
+import random
+
+import pytest
+from napalm.base.exceptions import CommitError
+
+from napalm_asa.asa import ASADriver, _config_chunks
+from napalm_asa.utils.config_diff import replace_commands
+from asa_standin import ASAStandIn
+
+CONFIGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asa")
+INVALID_INPUT = "ERROR: % Invalid input detected at '^' marker.\n"
+
+
+def _read(name):
+    with open(os.path.join(CONFIGS, name)) as f:
+        return f.read()
+
+
+class ConfigDevice:
+    """Record the /cli requests, failing the commands in ``bad``."""
+
+    def __init__(self, bad=()):
+        self.requests = []
+        self.bad = set(bad)
+
+    def get_resp(self, endpoint="", data=None):
+        commands = json.loads(data)["commands"]
+        if commands == ["show running-config"]:
+            return {"response": [_read("initial.conf")]}
+        self.requests.append(commands)
+        return {
+            "response": [
+                INVALID_INPUT if command in self.bad else "" for command in commands
+            ]
+        }
+
+
+def test_chunks_end_before_a_command():
+    commands = [
+        "hostname fw1",
+        "interface Gi0/0",
+        " nameif A",
+        " no shutdown",
+        "mtu A 1500",
+    ]
+
+    chunks = list(_config_chunks(commands, chunk_size=3))
+
+    assert chunks == [
+        [(0, "hostname fw1")],
+        [(1, "interface Gi0/0"), (2, "nameif A"), (3, "no shutdown")],
+        [(4, "mtu A 1500")],
+    ]
+
+
+def test_large_sections_repeat_their_header():
+    commands = ["object-group network G"] + [
+        " network-object host 10.0.0.{}".format(i) for i in range(5)
+    ]
+
+    chunks = list(_config_chunks(commands, chunk_bytes=100))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk[0] == (0, "object-group network G")
+        assert sum(len(json.dumps(command)) + 2 for _, command in chunk) <= 100
+    assert [index for chunk in chunks for index, _ in chunk[1:]] == list(range(1, 6))
+
+
+def test_merge_commit(make_driver):
+    progress = []
+    config = "\n".join(
+        "access-list A extended permit ip host 10.0.{}.{} any".format(i >> 8, i & 255)
+        for i in range(1200)
+    )
+    driver = make_driver(
+        ConfigDevice(),
+        commit_progress=lambda sent, total: progress.append((sent, total)),
+        write_memory=True,
+    )
+
+    driver.load_merge_candidate(config=config)
+    driver.commit_config()
+
+    assert [len(request) for request in driver.device.requests] == [500, 500, 200, 1]
+    assert driver.device.requests[-1] == ["write memory"]
+    assert progress == [(500, 1200), (1000, 1200), (1200, 1200), (1, 1)]
+    assert driver.candidate_config is None
+
+
+def test_commit_stops_at_the_first_failed_chunk(make_driver):
+    commands = ["logging host INSIDE 10.0.0.{}".format(i) for i in range(10)]
+    driver = make_driver(ConfigDevice([commands[4], commands[5]]), config_chunk_size=3)
+    driver.load_merge_candidate(config="\n".join(commands))
+
+    with pytest.raises(CommitError) as excinfo:
+        driver.commit_config()
+
+    assert len(driver.device.requests) == 2
+    assert excinfo.value.sent == 6
+    assert excinfo.value.errors == [
+        {
+            "command_index": 5,
+            "line": 5,
+            "command": commands[4],
+            "error": INVALID_INPUT.strip(),
+        },
+        {
+            "command_index": 6,
+            "line": 6,
+            "command": commands[5],
+            "error": INVALID_INPUT.strip(),
+        },
+    ]
+    assert driver.candidate_config is not None
+
+
+def test_errors_point_at_the_candidate_line(make_driver):
+    config = ": Saved\n!\nhostname fw1\n\n!\nlogging host INSIDE 10.0.0.1\n"
+    driver = make_driver(ConfigDevice(["logging host INSIDE 10.0.0.1"]))
+    driver.load_merge_candidate(config=config)
+
+    with pytest.raises(CommitError) as excinfo:
+        driver.commit_config()
+
+    (error,) = excinfo.value.errors
+    assert (error["command_index"], error["line"]) == (2, 6)
+    assert "first at line 6" in str(excinfo.value)
+
+
+def test_replace_errors_have_no_candidate_line(make_driver):
+    driver = make_driver(ConfigDevice(["hostname fw-edge-1"]))
+    driver.load_replace_candidate(filename=os.path.join(CONFIGS, "new_good.conf"))
+
+    with pytest.raises(CommitError) as excinfo:
+        driver.commit_config()
+
+    (error,) = excinfo.value.errors
+    assert (error["command_index"], error["line"]) == (3, None)
+
+
+def test_replace_commit(make_driver):
+    driver = make_driver(ConfigDevice())
+    driver.load_replace_candidate(filename=os.path.join(CONFIGS, "new_good.conf"))
+
+    driver.commit_config()
+
+    assert driver.device.requests[0] == [
+        "no http 172.16.0.0 255.255.255.0 INSIDE",
+        "no hostname ciscoasa",
+        "hostname fw-edge-1",
+        "object-group network WEB_SERVERS",
+        "no network-object host 172.16.0.11",
+        "network-object host 172.16.0.12",
+        "access-list OUTSIDE_IN line 2 extended permit tcp any object-group "
+        "WEB_SERVERS eq www",
+        "interface GigabitEthernet0/2",
+        "nameif DMZ",
+        "security-level 50",
+        "ip address 192.168.1.1 255.255.255.0",
+    ]
+
+
+def test_replace_keeps_objects_still_defined():
+    running = _read("initial.conf")
+    candidate = running.replace(
+        "object network INTERNAL_NETWORK\n nat (any,OUTSIDE) dynamic interface\n", ""
+    )
+
+    assert replace_commands(running, candidate) == [
+        "object network INTERNAL_NETWORK",
+        " no nat (any,OUTSIDE) dynamic interface",
+    ]
+
+
+def test_replace_ignores_the_banner():
+    running = _read("initial.conf")
+    candidate = running.replace("ASA Version 9.8(2)", "ASA Version 9.12(4)")
+
+    assert replace_commands(running, candidate) == []
+
+
+def test_commit_without_candidate(make_driver):
+    with pytest.raises(CommitError):
+        make_driver(ConfigDevice()).commit_config()
+
+
+def _apply_acl(entries, commands):
+    """Apply access-list commands the way the ASA does."""
+    entries = list(entries)
+    for command in commands:
+        if command.startswith("no "):
+            entries.remove(command[3:])
+            continue
+        words = command.split(" ")
+        if words[2] == "line":
+            entries.insert(int(words[3]) - 1, " ".join(words[:2] + words[4:]))
+        else:
+            entries.append(command)
+    return entries
+
+
+def test_replace_rebuilds_access_lists():
+    old = [
+        "access-list A extended permit ip host 10.0.0.{} any".format(i)
+        for i in range(8)
+    ]
+    new = [old[5], old[0], "access-list A extended deny ip any any", old[1], old[7]]
+    rng = random.Random(3)
+    cases = [(old, new)]
+    for _ in range(100):
+        pool = old + [
+            "access-list A extended deny ip host 10.0.1.{} any".format(i)
+            for i in range(4)
+        ]
+        cases.append(
+            (rng.sample(pool, rng.randint(1, 12)), rng.sample(pool, rng.randint(1, 12)))
+        )
+
+    for old, new in cases:
+        commands = replace_commands("\n".join(old), "\n".join(new))
+        assert _apply_acl(old, commands) == new
+
+
+def test_commit_to_the_standin():
+    with ASAStandIn() as asa:
+        driver = ASADriver(**asa.driver_args(write_memory=True))
+        driver.open()
+
+        driver.load_merge_candidate(filename=os.path.join(CONFIGS, "merge_good.conf"))
+        driver.commit_config()
+        assert asa.data.pushed == [
+            line.strip() for line in _read("merge_good.conf").splitlines()
+        ]
+
+        driver.load_merge_candidate(filename=os.path.join(CONFIGS, "merge_typo.conf"))
+        with pytest.raises(CommitError) as excinfo:
+            driver.commit_config()
+        assert excinfo.value.errors[0]["line"] == 2
+        driver.close()
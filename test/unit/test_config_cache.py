@@ -0,0 +1,162 @@
+"""Tests for the checksum based config change detection."""
+
+import json
+
+from napalm_asa import extensions
+from napalm_asa.config_cache import FileConfigCache
+from napalm_asa.utils.parsers import parse_show_checksum
+
+
+class ChecksumDevice:
+    """
+    Answer the config commands with a running config that can be changed.
+
+    Like the ASA, the checksum only follows the config when it is saved. Other
+    commands are appended to the running config.
+    """
+
+    def __init__(self):
+        self.commands = []
+        self.config = "hostname fw1\n username admin password s3cr3t\n"
+        self.save()
+
+    def save(self):
+        self.startup = self.config
+        self.checksum = "{:08x} 0000000a 0000000b 0000000c".format(
+            hash(self.startup) & 0xFFFFFFFF
+        )
+
+    def get_resp(self, endpoint="", data=None):
+        commands = json.loads(data)["commands"]
+        self.commands.extend(commands)
+        response = []
+        for command in commands:
+            if command == "show checksum":
+                response.append("Cryptochecksum: {} \n".format(self.checksum))
+            elif command == "show running-config":
+                response.append(self.config)
+            elif command == "show startup-config":
+                response.append(self.startup)
+            elif command == "write memory":
+                self.save()
+                response.append("[OK]\n")
+            else:
+                self.config += command + "\n"
+                response.append("")
+        return {"response": response}
+
+
+def test_parse_show_checksum():
+    output = "Cryptochecksum: 7d8f3a2b 1C2E4F6A 8b9c0d1e 2f3a4b5c \n"
+
+    assert parse_show_checksum(output) == "7d8f3a2b1c2e4f6a8b9c0d1e2f3a4b5c"
+    assert parse_show_checksum("% Invalid input") == ""
+
+
+def test_unchanged_startup_config_is_served_from_cache(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+
+    first = driver.get_config()
+    second = driver.get_config(retrieve="startup")
+
+    assert first["startup"] == second["startup"] == driver.device.startup
+    assert first["running"] == driver.device.config
+    assert driver.device.commands.count("show startup-config") == 1
+    assert driver.device.commands.count("show checksum") == 2
+
+
+def test_saved_config_is_downloaded(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+    driver.get_config(retrieve="startup")
+    driver.device.config = "hostname fw2\n"
+    driver.device.save()
+
+    assert driver.get_config(retrieve="startup")["startup"] == "hostname fw2\n"
+    assert driver.device.commands.count("show startup-config") == 2
+
+
+def test_running_config_is_always_live(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+    driver.get_config()
+    # An unsaved change leaves the checksum as it was.
+    driver.device.config = "hostname fw2\n"
+
+    config = driver.get_config()
+
+    assert config["running"] == "hostname fw2\n"
+    assert config["startup"] == driver.device.startup
+    assert driver.device.commands.count("show running-config") == 2
+
+
+def test_commit_drops_the_cached_config(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+    driver.get_config()
+
+    driver.load_merge_candidate(config="logging enable")
+    driver.commit_config()
+
+    assert driver.config_cache.get("fw1") is None
+    assert driver.get_config()["running"].endswith("logging enable\n")
+    assert "logging enable" not in driver.get_config()["startup"]
+
+
+def test_cached_config_is_sanitized(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+    driver.get_config(retrieve="startup")
+
+    config = driver.get_config(retrieve="startup", sanitized=True)
+
+    assert "s3cr3t" not in config["startup"]
+    assert "s3cr3t" in driver.get_config(retrieve="startup")["startup"]
+
+
+def test_no_checksum_without_cache(make_driver):
+    driver = make_driver(ChecksumDevice())
+
+    driver.get_config()
+
+    assert "show checksum" not in driver.device.commands
+
+
+def test_file_cache_survives_the_driver(tmp_path, make_driver):
+    make_driver(ChecksumDevice(), config_cache=str(tmp_path)).get_config(
+        retrieve="startup"
+    )
+    driver = make_driver(ChecksumDevice(), config_cache=str(tmp_path))
+
+    driver.get_config(retrieve="startup")
+
+    assert driver.device.commands == ["show checksum"]
+    assert FileConfigCache(str(tmp_path)).get("fw1")[1] == driver.device.startup
+
+    FileConfigCache(str(tmp_path)).delete("fw1")
+    assert FileConfigCache(str(tmp_path)).get("fw1") is None
+
+
+def test_get_config_if_changed(make_driver):
+    driver = make_driver(ChecksumDevice())
+    checksum = extensions.get_config_checksum(driver)
+
+    assert extensions.get_config_if_changed(driver, checksum) == (checksum, None)
+
+    driver.device.config = "hostname fw2\n username admin password x\n"
+    driver.device.save()
+    new_checksum, running = extensions.get_config_if_changed(
+        driver, checksum, sanitized=True
+    )
+    assert new_checksum != checksum
+    assert running == "hostname fw2\n username admin password <removed>\n"
+
+
+def test_candidate_compares_with_the_live_config(make_driver):
+    driver = make_driver(ChecksumDevice(), config_cache=True)
+    driver.get_config(retrieve="running")
+    # An unsaved change leaves the checksum as it was.
+    driver.device.config = "hostname fw2\n"
+
+    driver.load_replace_candidate(config="hostname fw2\n")
+
+    assert driver.compare_config() == ""
+
+    driver.commit_config()
+    assert driver.device.commands[-1] == "show running-config"
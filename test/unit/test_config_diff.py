@@ -0,0 +1,132 @@
+"""Tests for the candidate configs and compare_config."""
+
+import json
+import os
+import random
+from collections import Counter
+
+import pytest
+from napalm.base.exceptions import MergeConfigException, ReplaceConfigException
+
+from napalm_asa.utils.config_diff import diff_configs, diff_lines, parse_sections
+from conftest import PatchedASADriver
+
+CONFIGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asa")
+
+
+def _read(name):
+    with open(os.path.join(CONFIGS, name)) as f:
+        return f.read()
+
+
+class RunningConfigDevice:
+    """Answer show running-config with initial.conf."""
+
+    def __init__(self):
+        self.commands = []
+
+    def get_resp(self, endpoint="", data=None):
+        commands = json.loads(data)["commands"]
+        self.commands.extend(commands)
+        return {"response": [_read("initial.conf") for command in commands]}
+
+
+@pytest.fixture
+def driver():
+    driver = PatchedASADriver("fw1", "admin", "secret")
+    driver.device = RunningConfigDevice()
+    return driver
+
+
+def test_replace_diff(driver):
+    driver.load_replace_candidate(filename=os.path.join(CONFIGS, "new_good.conf"))
+
+    assert driver.compare_config() == _read("new_good.diff").strip()
+    assert driver.device.commands == ["show running-config"]
+
+
+def test_merge_diff(driver):
+    driver.load_merge_candidate(config=_read("merge_good.conf"))
+
+    assert driver.compare_config() == _read("merge_good.diff").strip()
+
+
+def test_no_diff(driver):
+    assert driver.compare_config() == ""
+
+    driver.load_replace_candidate(config=_read("initial.conf"))
+    assert driver.compare_config() == ""
+
+    driver.discard_config()
+    assert driver.candidate_config is None
+    assert driver.compare_config() == ""
+
+
+def test_load_errors(driver):
+    with pytest.raises(ReplaceConfigException):
+        driver.load_replace_candidate()
+    with pytest.raises(MergeConfigException):
+        driver.load_merge_candidate(filename=os.path.join(CONFIGS, "missing.conf"))
+
+
+def test_sections():
+    sections = parse_sections(_read("initial.conf"))
+
+    assert sections[("interface GigabitEthernet0/1", 0)] == (
+        "interface GigabitEthernet0/1",
+        " nameif INSIDE\n security-level 100\n ip address 172.16.0.1 255.255.255.0",
+    )
+    assert sections[("access-list OUTSIDE_IN", 0)][0] is None
+    assert len(sections[("access-list OUTSIDE_IN", 0)][1].splitlines()) == 2
+    assert sections[("object network INTERNAL_NETWORK", 1)][1] == (
+        " nat (any,OUTSIDE) dynamic interface"
+    )
+    assert not any(key[0].startswith((":", "!", "Crypto")) for key in sections)
+
+
+def test_comments_and_whitespace():
+    running = "interface Gi0/0\n nameif A\n!\nhostname fw1\n"
+    candidate = (
+        ": Saved\r\ninterface Gi0/0 \r\n !\r\n nameif A\t\r\n\r\nhostname fw1\r\n"
+    )
+
+    assert diff_configs(running, candidate) == ""
+
+
+def test_access_list_order():
+    running = "access-list A extended permit ip host 1.1.1.1 any\n" * 2
+    running += "access-list A extended deny ip any any\n"
+    candidate = "access-list A extended deny ip any any\n"
+    candidate += "access-list A extended permit ip host 1.1.1.1 any\n"
+
+    # The deny entry moved to the top, one of the permit entries is gone.
+    assert diff_configs(running, candidate).splitlines() == [
+        "+access-list A extended deny ip any any",
+        "-access-list A extended permit ip host 1.1.1.1 any",
+        "-access-list A extended deny ip any any",
+    ]
+
+
+def _lcs_length(old, new):
+    lengths = [[0] * (len(new) + 1) for _ in range(len(old) + 1)]
+    for i, a in enumerate(old):
+        for j, b in enumerate(new):
+            if a == b:
+                lengths[i + 1][j + 1] = lengths[i][j] + 1
+            else:
+                lengths[i + 1][j + 1] = max(lengths[i][j + 1], lengths[i + 1][j])
+    return lengths[-1][-1]
+
+
+def test_diff_lines():
+    rng = random.Random(7)
+    for _ in range(200):
+        # Unique lines, like the children of a section.
+        old = rng.sample("abcdefghij", rng.randint(0, 10))
+        new = rng.sample("abcdefghij", rng.randint(0, 10))
+        changes = list(diff_lines(old, new))
+        removed = Counter(line for sign, line in changes if sign == "-")
+        added = Counter(line for sign, line in changes if sign == "+")
+
+        assert Counter(old) - removed + added == Counter(new)
+        assert len(old) - sum(removed.values()) == _lcs_length(old, new)
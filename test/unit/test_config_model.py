@@ -0,0 +1,161 @@
+"""Tests for the indexed config model."""
+
+import json
+import os
+import pickle
+
+from napalm_asa import extensions
+from napalm_asa.utils.config_model import (
+    AccessListEntry,
+    NatRule,
+    ObjectGroup,
+    parse_config,
+)
+
+CONFIGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asa")
+
+NESTED = """hostname fw1
+object network WEB1
+ host 10.0.0.10
+object network WEB2
+ host 10.0.0.11
+object network MAPPED
+ host 192.0.2.10
+object network UNUSED
+ host 10.0.0.99
+object-group network WEB
+ network-object object WEB1
+object-group network ALL_WEB
+ group-object WEB
+ network-object object WEB2
+access-list IN extended permit tcp any object-group ALL_WEB eq https
+access-list IN extended permit tcp any object WEB2 eq www
+access-list IN extended deny ip any any
+access-list DMZ extended permit tcp any object-group WEB eq https
+nat (INSIDE,OUTSIDE) source static WEB1 MAPPED
+object network WEB2
+ nat (INSIDE,OUTSIDE) static 192.0.2.11
+access-group IN in interface OUTSIDE
+access-group DMZ global
+"""
+
+
+def _read(name):
+    with open(os.path.join(CONFIGS, name)) as f:
+        return f.read()
+
+
+def test_initial_config():
+    config = parse_config(_read("initial.conf"))
+
+    assert config.hostname == "ciscoasa"
+    assert config.interface_by_nameif("INSIDE").name == "GigabitEthernet0/1"
+    assert config.interface_by_nameif("OUTSIDE").security_level == 0
+    assert config.interface_by_nameif("DMZ") is None
+    assert config.objects["INTERNAL_NETWORK"].lines == [
+        " subnet 172.16.0.0 255.255.255.0"
+    ]
+    assert [entry.line for entry in config.access_lists["OUTSIDE_IN"]] == [1, 2]
+    assert config.access_groups["OUTSIDE_IN"][0].interface == "OUTSIDE"
+    assert config.nat_rules == [
+        NatRule(
+            0,
+            "INTERNAL_NETWORK",
+            "nat (any,OUTSIDE) dynamic interface",
+            ["INTERNAL_NETWORK"],
+        )
+    ]
+    assert config.referenced_by("WEB_SERVERS") == [config.access_lists["OUTSIDE_IN"][0]]
+
+
+def test_nested_groups():
+    config = parse_config(NESTED)
+
+    assert [type(record) for record in config.referenced_by("WEB2")] == [
+        ObjectGroup,
+        AccessListEntry,
+        NatRule,
+    ]
+    assert sorted(
+        (entry.acl, entry.line) for entry in config.access_list_entries_using("WEB1")
+    ) == [("DMZ", 1), ("IN", 1)]
+    assert config.access_lists_using("WEB1") == ["IN", "DMZ"]
+    assert config.access_lists_using("WEB2") == ["IN"]
+    assert config.access_groups["DMZ"][0].interface is None
+    assert config.unused_objects() == ["UNUSED"]
+
+
+def test_nat_rules():
+    config = parse_config(NESTED)
+
+    manual, auto = config.nat_rules
+    assert manual.object is None
+    assert manual.references == ["WEB1", "MAPPED"]
+    assert auto.object == "WEB2"
+    assert auto.references == ["WEB2"]
+    # The object NAT rule is not part of the object definition.
+    assert config.objects["WEB2"].lines == [" host 10.0.0.11"]
+
+
+def test_pickle():
+    config = parse_config(NESTED)
+
+    copy = pickle.loads(pickle.dumps(config))
+
+    assert copy.access_lists == config.access_lists
+    assert copy.access_lists_using("WEB1") == ["IN", "DMZ"]
+
+
+class RunningConfigDevice:
+    """Answer "show running-config" with NESTED, other commands are appended."""
+
+    def __init__(self):
+        self.commands = []
+        self.config = NESTED
+
+    def get_resp(self, endpoint="", data=None):
+        commands = json.loads(data)["commands"]
+        self.commands.extend(commands)
+        response = []
+        for command in commands:
+            if command == "show running-config":
+                response.append(self.config)
+            else:
+                self.config += command + "\n"
+                response.append("")
+        return {"response": response}
+
+
+def test_model_follows_the_running_config(make_driver):
+    driver = make_driver(RunningConfigDevice(), config_cache=True)
+
+    first = extensions.get_config_model(driver)
+    assert extensions.get_config_model(driver) is first
+
+    # An unsaved change, the checksum would not have changed.
+    driver.device.config = "hostname fw2\n"
+    assert extensions.get_config_model(driver).hostname == "fw2"
+    assert "show checksum" not in driver.device.commands
+
+
+def test_commit_resets_the_model(make_driver):
+    driver = make_driver(RunningConfigDevice(), config_cache=True)
+    extensions.get_config_model(driver)
+
+    driver.load_merge_candidate(config="object network WEB3\n host 10.0.0.12")
+    driver.commit_config()
+
+    assert driver._config_model is None
+    assert extensions.get_config_model(driver).unused_objects() == [
+        "UNUSED",
+        "WEB3",
+    ]
+
+
+def test_model_without_cache(make_driver):
+    driver = make_driver(RunningConfigDevice())
+
+    assert extensions.get_config_model(driver) is not extensions.get_config_model(
+        driver
+    )
+    assert driver.device.commands == ["show running-config"] * 2
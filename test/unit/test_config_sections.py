@@ -0,0 +1,31 @@
+"""Tests for the retrieval of running config sections."""
+
+import pytest
+
+from napalm_asa import extensions
+from conftest import CountingFakeASADevice, PatchedASADriver
+
+
+@pytest.fixture
+def driver():
+    driver = PatchedASADriver("127.0.0.1", "vagrant", "vagrant")
+    driver.device = CountingFakeASADevice()
+    return driver
+
+
+def test_sections_in_one_request(driver):
+    config = extensions.get_config_sections(driver, ["access-list", "nat"])
+
+    assert list(config) == ["access-list", "nat"]
+    assert config["access-list"].startswith("access-list OUTSIDE_IN extended")
+    assert config["nat"] == (
+        "object network INTERNAL_NETWORK\n nat (any,OUTSIDE) static interface\n"
+    )
+    assert driver.device.calls["/cli"] == 1
+
+
+def test_unknown_section(driver):
+    with pytest.raises(ValueError):
+        extensions.get_config_sections(driver, ["access-lists"])
+
+    assert driver.device.calls["/cli"] == 0
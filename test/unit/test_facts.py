@@ -0,0 +1,63 @@
+"""Tests for the fast facts path."""
+
+import json
+
+from napalm_asa.utils.parsers import parse_show_inventory, parse_show_version
+from conftest import CountingFakeASADevice, PatchedASADriver
+
+
+def test_fast_facts_match_get_facts():
+    driver = PatchedASADriver(
+        "127.0.0.1", "vagrant", "vagrant", optional_args={"fast_facts": True}
+    )
+    driver.device = CountingFakeASADevice()
+
+    facts = driver.get_facts()
+
+    with open("test/unit/mocked_data/test_get_facts/normal/expected_result.json") as f:
+        assert facts == json.load(f)
+    assert isinstance(facts["uptime"], float)
+    assert sorted(driver.device.calls) == [
+        "/cli",
+        "/interfaces/physical",
+        "/interfaces/portchannel",
+        "/interfaces/redundant",
+        "/interfaces/vlan",
+    ]
+    assert driver.device.calls["/cli"] == 1
+
+
+def test_parse_show_version_hardware_appliance():
+    output = (
+        "Cisco Adaptive Security Appliance Software Version 9.8(2)\n"
+        "Firepower Extensible Operating System Version 2.2(2.52)\n"
+        "\n"
+        "fw01 up 1 year 2 days\n"
+        "failover cluster up 1 year 2 days\n"
+        "\n"
+        "Hardware:   ASA5516, 8192 MB RAM, CPU Atom C2000 series 2416 MHz, 1 CPU\n"
+        "Serial Number: JAD21230ABC\n"
+    )
+
+    assert parse_show_version(output) == {
+        "os_version": "9.8(2)",
+        "uptime": 31536000.0 + 2 * 86400,
+        "model": "ASA5516",
+        "serial_number": "JAD21230ABC",
+    }
+
+
+def test_parse_show_inventory():
+    output = (
+        'Name: "Chassis", DESCR: "ASA 5516-X with FirePOWER services, 8GE, AC, DC"\n'
+        "PID: ASA5516            , VID: V05     , SN: JAD21230ABC\n"
+        "\n"
+        'Name: "Storage Device 1", DESCR: "ASA 5516-X SSD"\n'
+        "PID: ASA5516-SSD        , VID: N/A     , SN: MSA2041XYZ\n"
+    )
+
+    inventory = parse_show_inventory(output)
+
+    assert [item["pid"] for item in inventory] == ["ASA5516", "ASA5516-SSD"]
+    assert inventory[0]["sn"] == "JAD21230ABC"
+    assert inventory[1]["name"] == "Storage Device 1"
@@ -0,0 +1,92 @@
+"""Tests for the fleet runner."""
+
+import time
+
+from napalm.base.exceptions import ConnectionException
+
+from napalm_asa import fleet
+from conftest import PatchedASADriver
+
+
+class UnreachableASADriver(PatchedASADriver):
+    """Driver for a host that refuses connections."""
+
+    def open(self):
+        raise ConnectionException("Cannot connect to {}".format(self.hostname))
+
+
+class SlowASADriver(PatchedASADriver):
+    """Driver whose getters hang."""
+
+    def get_facts(self):
+        time.sleep(0.5)
+        return super().get_facts()
+
+
+def _by_host(results):
+    return {result.host: result for result in results}
+
+
+def test_run_collects_every_host():
+    results = _by_host(
+        fleet.run(
+            ["fw1", "fw2", "fw3"],
+            ["get_facts", ("get_arp_table", {"vrf": ""})],
+            max_workers=2,
+            pool=fleet.DriverPool(PatchedASADriver),
+        )
+    )
+
+    assert sorted(results) == ["fw1", "fw2", "fw3"]
+    for result in results.values():
+        assert result.error is None
+        assert result.failed == {}
+        assert result.results["get_facts"]["hostname"] == "ASAvL1"
+        assert len(result.results["get_arp_table"]) > 0
+
+
+def test_failures_do_not_stop_the_batch():
+    drivers = {"bad": UnreachableASADriver}
+
+    def mixed_driver(hostname, *args, **kwargs):
+        driver_class = drivers.get(hostname, PatchedASADriver)
+        return driver_class(hostname, *args, **kwargs)
+
+    results = _by_host(
+        fleet.run(
+            ["good", "bad"],
+            ["get_facts", "get_bgp_config"],
+            pool=fleet.DriverPool(mixed_driver),
+        )
+    )
+
+    assert isinstance(results["bad"].error, ConnectionException)
+    assert results["good"].error is None
+    assert "get_facts" in results["good"].results
+    assert isinstance(results["good"].failed["get_bgp_config"], NotImplementedError)
+
+
+def test_pool_reuses_drivers():
+    with fleet.DriverPool(PatchedASADriver) as pool:
+        list(fleet.run(["fw1"], ["is_alive"], pool=pool))
+        first = pool.acquire(fleet._host_spec("fw1", None, None, 60, None))
+        pool.release(fleet._host_spec("fw1", None, None, 60, None), first)
+        list(fleet.run(["fw1"], ["is_alive"], pool=pool))
+        second = pool.acquire(fleet._host_spec("fw1", None, None, 60, None))
+
+    assert first is second
+
+
+def test_per_host_timeout():
+    start = time.time()
+    results = list(
+        fleet.run(
+            ["slow"],
+            ["get_facts"],
+            timeout=0.1,
+            pool=fleet.DriverPool(SlowASADriver),
+        )
+    )
+
+    assert time.time() - start < 0.5
+    assert isinstance(results[0].error, fleet.TimeoutError)
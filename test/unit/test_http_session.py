@@ -0,0 +1,71 @@
+"""Tests for the HTTP session options."""
+
+import pytest
+
+from napalm_asa import asa
+from napalm_asa.utils.http import close_shared_sessions, make_session, shared_session
+from conftest import FakeSession
+
+
+@pytest.fixture(autouse=True)
+def no_shared_sessions():
+    yield
+    close_shared_sessions()
+
+
+def test_pool_settings():
+    session = make_session(pool_maxsize=32, pool_block=True, keep_alive=False)
+    adapter = session.get_adapter("https://fw1/api")
+
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+    assert session.headers["Connection"] == "close"
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_compression_can_be_disabled():
+    assert make_session(compression=False).headers["Accept-Encoding"] == "identity"
+
+
+def test_shared_sessions():
+    session = shared_session("fw1:443", pool_maxsize=4)
+
+    assert shared_session("fw1:443", pool_maxsize=4) is session
+    assert shared_session("fw2:443", pool_maxsize=4) is not session
+    assert shared_session("fw1:443", pool_maxsize=8) is not session
+
+    close_shared_sessions()
+    assert shared_session("fw1:443", pool_maxsize=4) is not session
+
+
+def test_drivers_share_the_session_of_a_host():
+    first = asa.ASADriver(
+        "fw1", "admin", "secret", optional_args={"share_session": True}
+    )
+    second = asa.ASADriver(
+        "fw1", "ops", "secret", optional_args={"share_session": True}
+    )
+    other = asa.ASADriver(
+        "fw2", "admin", "secret", optional_args={"share_session": True}
+    )
+    private = asa.ASADriver("fw1", "admin", "secret")
+
+    assert first.device.session is second.device.session
+    assert other.device.session is not first.device.session
+    assert private.device.session is not first.device.session
+
+
+def test_tls_verification():
+    class RecordingSession(FakeSession):
+        def get(self, url, **kwargs):
+            self.verify = kwargs["verify"]
+            return super().get(url, **kwargs)
+
+    driver = asa.ASADriver(
+        "fw1", "admin", "secret", optional_args={"verify": "/etc/ssl/asa-ca.pem"}
+    )
+    driver.device.session = RecordingSession()
+    driver.open()
+    driver.is_alive()
+
+    assert driver.device.session.verify == "/etc/ssl/asa-ca.pem"
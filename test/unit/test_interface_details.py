@@ -0,0 +1,54 @@
+"""Tests for the "show interface" parser."""
+
+import json
+
+from napalm_asa.utils.parsers import parse_interfaces_details, parse_show_interface
+from conftest import PatchedASADriver
+
+
+def _expected():
+    with open(
+        "test/unit/mocked_data/test_get_interfaces/normal/expected_result.json"
+    ) as f:
+        return json.load(f)
+
+
+def test_bulk_interface_details_match_per_interface_path():
+    driver = PatchedASADriver(
+        "127.0.0.1",
+        "vagrant",
+        "vagrant",
+        optional_args={"bulk_interface_details": True},
+    )
+
+    assert driver.get_interfaces() == _expected()
+
+
+def test_parse_show_interface_admin_down_and_units():
+    output = (
+        'Interface GigabitEthernet0/2 "", is administratively down, line protocol is down\n'
+        "  Hardware is i82540EM rev03, BW 10 Gbps, DLY 10 usec\n"
+        "\tMAC address 008d.e011.ef03, MTU 9000\n"
+        'Interface Tunnel1 "vti", is up, line protocol is up\n'
+        "  Hardware is Virtual Tunnel, BW 500 Kbps\n"
+    )
+
+    details = parse_show_interface(output)
+
+    assert details["GigabitEthernet0/2"] == {
+        "mac_address": "008d.e011.ef03",
+        "is_up": False,
+        "mtu": 9000,
+        "speed": 10000.0,
+    }
+    assert details["Tunnel1"]["is_up"] is True
+    assert details["Tunnel1"]["speed"] == 0.5
+
+
+def test_parse_interfaces_details_without_header():
+    details = parse_interfaces_details(
+        {"show interface Foo1": "ERROR: % Invalid input\n"}
+    )
+
+    assert details["Foo1"]["is_up"] is False
+    assert details["Foo1"]["mtu"] == 0
@@ -0,0 +1,60 @@
+"""Tests for the pluggable JSON codec."""
+
+import json
+
+import pytest
+from napalm.base.exceptions import ConnectionException
+
+from napalm_asa import asa
+from napalm_asa.utils.json_codec import get_json_loads
+from conftest import FakeResponse
+
+
+class RawSession:
+    def __init__(self, content):
+        self.headers = {}
+        self.content = content
+
+    def get(self, url, **kwargs):
+        response = FakeResponse(200)
+        response.content = self.content
+        return response
+
+
+def _fetcher(content, **kwargs):
+    fetcher = asa.RespFetcherHttps("admin", "secret", "https://fw1/api", **kwargs)
+    fetcher.session = RawSession(content)
+    return fetcher
+
+
+def test_named_codec():
+    assert get_json_loads("json") is json.loads
+
+
+def test_callable_codec():
+    assert get_json_loads(len) is len
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_json_loads("yaml")
+
+
+def test_default_codec_decodes_bytes():
+    assert get_json_loads()(b'{"a": [1, "\xc3\xa9"]}') == {"a": [1, "é"]}
+
+
+@pytest.mark.parametrize("codec", [None, "json"])
+def test_response_is_decoded_from_bytes(codec):
+    body = {"response": ["hostname fw1\ndescription café\n"]}
+    fetcher = _fetcher(json.dumps(body, ensure_ascii=False).encode(), json_codec=codec)
+
+    assert fetcher.get_resp("/cli") == body
+
+
+def test_invalid_json():
+    fetcher = _fetcher(b"<html>", json_codec="json")
+
+    assert fetcher.get_resp("/cli", throw=False) is False
+    with pytest.raises(ConnectionException):
+        fetcher.get_resp("/cli")
@@ -0,0 +1,193 @@
+"""Tests for the instrumentation hooks and the metrics collector."""
+
+import json
+
+import requests
+
+from napalm.base.base import NetworkDriver
+
+from napalm_asa import asa
+from napalm_asa.metrics import Hooks, MetricsCollector
+from napalm_asa.utils.retry import RetryPolicy
+from conftest import FakeResponse
+from asa_standin import ASAStandIn
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def request_start(self, event):
+        self.events.append(("request_start", dict(event)))
+
+    def request_end(self, event):
+        self.events.append(("request_end", dict(event)))
+
+    def page(self, event):
+        self.events.append(("page", dict(event)))
+
+    def span_start(self, event):
+        self.events.append(("span_start", dict(event)))
+
+    def span_end(self, event):
+        self.events.append(("span_end", dict(event)))
+
+
+class FlakySession:
+    def __init__(self, *responses):
+        self.headers = {}
+        self.responses = list(responses)
+
+    def get(self, url, **kwargs):
+        if self.responses:
+            return self.responses.pop(0)
+        return FakeResponse(200, body={"ok": True})
+
+
+def test_request_events(monkeypatch):
+    monkeypatch.setattr(asa.time, "sleep", lambda delay: None)
+    hooks = RecordingHooks()
+    fetcher = asa.RespFetcherHttps(
+        "admin",
+        "secret",
+        "https://fw1:443/api",
+        retry_policy=RetryPolicy(retries=2),
+        hooks=[hooks],
+    )
+    fetcher.session = FlakySession(FakeResponse(503))
+
+    assert fetcher.get_resp("/monitoring/arp") == {"ok": True}
+
+    (start_name, start), (end_name, end) = hooks.events
+    assert (start_name, end_name) == ("request_start", "request_end")
+    assert start["host"] == "fw1:443"
+    assert start["method"] == "GET"
+    assert start["endpoint"] == "/monitoring/arp"
+    assert end["status"] == 200
+    assert end["retries"] == 1
+    assert end["bytes"] == len(json.dumps({"ok": True}))
+    assert end["duration"] >= 0
+
+
+def test_request_error_is_reported():
+    hooks = RecordingHooks()
+    fetcher = asa.RespFetcherHttps("admin", "secret", "https://fw1/api", hooks=[hooks])
+
+    class BrokenSession(FlakySession):
+        def get(self, url, **kwargs):
+            raise requests.exceptions.ConnectionError("refused")
+
+    fetcher.session = BrokenSession()
+
+    assert fetcher.get_resp("/monitoring/arp", throw=False) is False
+    name, end = hooks.events[-1]
+    assert name == "request_end"
+    assert isinstance(end["error"], requests.exceptions.ConnectionError)
+    assert "status" not in end
+
+
+def test_getter_spans_and_pages(make_driver):
+    hooks = RecordingHooks()
+    driver = make_driver(hooks=[hooks])
+
+    driver.get_arp_table()
+
+    names = [name for name, event in hooks.events]
+    assert names == ["span_start", "page", "span_end"]
+    page, span = hooks.events[1][1], hooks.events[2][1]
+    assert page == {
+        "host": "fw1:443",
+        "endpoint": "/monitoring/arp",
+        "page": 1,
+        "items": 4,
+    }
+    assert span["getter"] == "get_arp_table"
+    assert "error" not in span
+
+
+def test_nested_spans(make_driver):
+    hooks = RecordingHooks()
+    driver = make_driver(hooks=[hooks])
+
+    driver.get_facts()
+
+    spans = [event["getter"] for name, event in hooks.events if name == "span_start"]
+    assert spans == ["get_facts", "cli", "get_interfaces", "cli"]
+
+
+def test_instrumentation_keeps_the_class_untouched(make_driver):
+    driver = make_driver(hooks=[Hooks()])
+
+    assert "get_facts" in vars(driver)
+    assert asa.ASADriver.get_facts is not NetworkDriver.get_facts
+    assert "get_facts" not in vars(make_driver(hooks=[]))
+
+
+def test_collector_against_a_paging_driver():
+    collector = MetricsCollector()
+    with ASAStandIn(arp_entries=150) as standin:
+        driver = asa.ASADriver(**standin.driver_args(hooks=[collector]))
+        driver.open()
+        driver.get_arp_table()
+        driver.close()
+
+    data = collector.to_dict()
+    (request,) = [r for r in data["requests"] if r["endpoint"] == "/monitoring/arp"]
+    assert request["count"] == 2
+    assert request["pages"] == 2
+    hosts = {entry["host"] for entry in data["requests"] + data["getters"]}
+    assert hosts == {"127.0.0.1:{}".format(standin.port)}
+
+
+def test_collector_exports():
+    collector = MetricsCollector(buckets=(0.1, 1))
+    collector.request_end(
+        {
+            "host": "fw1",
+            "method": "GET",
+            "endpoint": "/monitoring/arp",
+            "status": 200,
+            "bytes": 120,
+            "retries": 1,
+            "duration": 0.05,
+        }
+    )
+    collector.request_end(
+        {
+            "host": "fw1",
+            "method": "GET",
+            "endpoint": "/monitoring/arp",
+            "error": Exception(),
+            "duration": 2,
+        }
+    )
+    collector.page({"host": "fw1", "endpoint": "/monitoring/arp", "page": 1})
+    collector.span_end(
+        {"host": "fw1", "getter": "get_arp_table", "duration": 0.5, "error": None}
+    )
+
+    data = json.loads(collector.to_json())
+    (request,) = data["requests"]
+    assert request["count"] == 2
+    assert request["bytes"] == 120
+    assert request["retries"] == 1
+    assert request["pages"] == 1
+    assert request["statuses"] == {"200": 1, "error": 1}
+    assert request["buckets"] == {"0.1": 1, "1": 1}
+    (getter,) = data["getters"]
+    assert getter["errors"] == 0
+
+    text = collector.to_prometheus()
+    labels = 'host="fw1",method="GET",endpoint="/monitoring/arp"'
+    assert (
+        "napalm_asa_request_duration_seconds_bucket{" + labels + ',le="0.1"} 1'
+    ) in text
+    assert (
+        "napalm_asa_request_duration_seconds_bucket{" + labels + ',le="+Inf"} 2'
+    ) in text
+    assert "napalm_asa_requests_total{" + labels + ',status="error"} 1' in text
+    assert "napalm_asa_response_bytes_total{" + labels + "} 120" in text
+    assert (
+        'napalm_asa_getter_duration_seconds_count{host="fw1",getter="get_arp_table"} 1'
+        in text
+    )
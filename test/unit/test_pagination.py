@@ -0,0 +1,61 @@
+"""Tests for paginated REST collections."""
+
+import threading
+
+import pytest
+
+from napalm_asa import extensions
+
+
+class PagedFakeDevice:
+    """Serve a collection of ``total`` items, ``page_size`` items per page."""
+
+    def __init__(self, total, page_size=100):
+        self.items = [{"id": i} for i in range(total)]
+        self.page_size = page_size
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get_resp(self, endpoint="", data=None, params=None, throw=True):
+        params = params or {}
+        with self.lock:
+            self.requests.append(params)
+        offset = params.get("offset", 0)
+        limit = min(params.get("limit", self.page_size), self.page_size)
+        return {
+            "rangeInfo": {"offset": offset, "limit": limit, "total": len(self.items)},
+            "items": self.items[offset : offset + limit],
+        }
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_send_request_collects_every_page(parallel, make_driver):
+    device = PagedFakeDevice(1050)
+    driver = make_driver(device, parallel_pages=parallel)
+
+    response = driver._send_request("/monitoring/arp")
+
+    assert response["items"] == device.items
+    assert len(device.requests) == 11
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_iter_items_streams_in_order(parallel, make_driver):
+    device = PagedFakeDevice(250, page_size=100)
+    driver = make_driver(device)
+
+    items = extensions.iter_items(driver, "/monitoring/arp", parallel=parallel)
+
+    assert next(items) == {"id": 0}
+    assert len(device.requests) == 1
+    assert list(items) == device.items[1:]
+
+
+def test_parallel_pages_request_largest_page_size(make_driver):
+    device = PagedFakeDevice(300, page_size=1000)
+    driver = make_driver(device, parallel_pages=True)
+
+    driver._send_request("/monitoring/arp")
+
+    assert [r["limit"] for r in device.requests] == [100, 100, 100]
+    assert sorted(r.get("offset", 0) for r in device.requests) == [0, 100, 200]
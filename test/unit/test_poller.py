@@ -0,0 +1,119 @@
+"""Tests for the change polling."""
+
+from napalm_asa.asa import ASADriver
+from napalm_asa.poller import ASAPoller, PollChange
+from conftest import PatchedASADriver
+from asa_standin import ASAStandIn
+
+
+class CountingASADriver(PatchedASADriver):
+    """Count the getter calls, with an ARP table that can be changed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+        self.arp_table = [
+            {"interface": "inside", "ip": "10.0.0.1", "mac": "02:00:00:00:00:01"},
+            {"interface": "inside", "ip": "10.0.0.2", "mac": "02:00:00:00:00:02"},
+        ]
+
+    def get_arp_table(self, vrf=""):
+        self.calls.append("get_arp_table")
+        return [dict(entry) for entry in self.arp_table]
+
+    def get_facts(self):
+        self.calls.append("get_facts")
+        return {"hostname": "fw1", "uptime": 10}
+
+    def get_environment(self):
+        raise NotImplementedError
+
+
+def test_first_poll_adds_everything(make_driver):
+    driver = make_driver(driver_class=CountingASADriver)
+    poller = ASAPoller(driver, ["get_arp_table", "get_facts"])
+
+    changes = poller.poll(now=100.0)
+
+    assert [(change.getter, change.kind) for change in changes] == [
+        ("get_arp_table", "add"),
+        ("get_arp_table", "add"),
+        ("get_facts", "add"),
+        ("get_facts", "add"),
+    ]
+    assert changes[0].key == ("inside", "10.0.0.1")
+
+
+def test_only_changes_are_reported(make_driver):
+    driver = make_driver(driver_class=CountingASADriver)
+    poller = ASAPoller(driver, [("get_arp_table", {"vrf": ""})], interval=30)
+    poller.poll(now=100.0)
+
+    assert poller.poll(now=130.0) == []
+
+    driver.arp_table[0]["mac"] = "02:00:00:00:00:ff"
+    del driver.arp_table[1]
+    driver.arp_table.append(
+        {"interface": "outside", "ip": "192.0.2.1", "mac": "02:00:00:00:00:03"}
+    )
+    assert poller.poll(now=160.0) == [
+        PollChange(
+            "get_arp_table", "change", ("inside", "10.0.0.1"), driver.arp_table[0]
+        ),
+        PollChange(
+            "get_arp_table", "add", ("outside", "192.0.2.1"), driver.arp_table[1]
+        ),
+        PollChange("get_arp_table", "remove", ("inside", "10.0.0.2"), None),
+    ]
+
+
+def test_per_getter_intervals(make_driver):
+    driver = make_driver(driver_class=CountingASADriver)
+    poller = ASAPoller(
+        driver, ["get_arp_table", "get_facts"], interval=30, intervals={"get_facts": 90}
+    )
+
+    for now in range(1000, 1200, 30):
+        poller.poll(now=float(now))
+
+    assert driver.calls.count("get_arp_table") == 7
+    assert driver.calls.count("get_facts") == 3
+    assert poller.next_due() == 1210.0
+
+
+def test_failed_getter_keeps_its_state(make_driver):
+    driver = make_driver(driver_class=CountingASADriver)
+    poller = ASAPoller(driver, ["get_environment", "get_facts"])
+
+    assert len(poller.poll(now=100.0)) == 2
+    assert isinstance(poller.failed["get_environment"], NotImplementedError)
+
+    poller.reset()
+    assert len(poller.poll(now=200.0)) == 2
+
+
+def test_custom_keys(make_driver):
+    driver = make_driver(driver_class=CountingASADriver)
+    poller = ASAPoller(
+        driver,
+        ["get_facts"],
+        keys={"get_facts": lambda facts: [("hostname", facts["hostname"])]},
+    )
+
+    assert poller.poll(now=100.0) == [PollChange("get_facts", "add", "hostname", "fw1")]
+
+
+def test_run_against_the_standin():
+    with ASAStandIn(arp_entries=500) as asa:
+        driver = ASADriver(**asa.driver_args())
+        driver.open()
+        poller = ASAPoller(driver, ["get_arp_table"], interval=0.01)
+        changes = poller.run(cycles=1)
+        assert sum(1 for _ in changes) == 500
+
+        items = asa.data.collections["/monitoring/arp"]["items"]
+        items[7] = dict(items[7], macAddress="0200.0000.ffff")
+        assert [change.key for change in poller.run(cycles=1)] == [
+            ("inside", "10.0.0.7")
+        ]
+        driver.close()
@@ -0,0 +1,135 @@
+"""Tests for retries and the adaptive concurrency limiter."""
+
+import threading
+
+import pytest
+import requests
+from napalm.base.exceptions import CommandErrorException
+
+from napalm_asa import asa
+from napalm_asa.utils.retry import AIMDLimiter, RetryPolicy
+from conftest import FakeResponse
+
+
+class FlakySession:
+    """Answer with the queued responses, then 200."""
+
+    def __init__(self, *responses):
+        self.headers = {}
+        self.responses = list(responses)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return FakeResponse(200, body={"ok": True})
+
+    def get(self, url, **kwargs):
+        return self._next()
+
+    def post(self, url, **kwargs):
+        return self._next()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(asa.time, "sleep", delays.append)
+    return delays
+
+
+def _fetcher(session, **kwargs):
+    fetcher = asa.RespFetcherHttps("admin", "secret", "https://fw1:443/api", **kwargs)
+    fetcher.session = session
+    return fetcher
+
+
+def test_get_is_retried_on_overload(sleeps):
+    session = FlakySession(
+        FakeResponse(503),
+        requests.exceptions.ConnectTimeout("slow"),
+        FakeResponse(429, {"Retry-After": "7"}),
+    )
+    fetcher = _fetcher(session, retry_policy=RetryPolicy(retries=3, backoff=1))
+
+    assert fetcher.get_resp("/monitoring/arp") == {"ok": True}
+    assert session.calls == 4
+    assert 0 <= sleeps[0] <= 1
+    assert 0 <= sleeps[1] <= 2
+    assert sleeps[2] == 7
+
+
+def test_retries_are_bounded_and_posts_never_retried(sleeps):
+    session = FlakySession(FakeResponse(503), FakeResponse(503))
+    fetcher = _fetcher(session, retry_policy=RetryPolicy(retries=1))
+    with pytest.raises(CommandErrorException):
+        fetcher.get_resp("/monitoring/arp")
+    assert session.calls == 2
+
+    session = FlakySession(FakeResponse(503))
+    fetcher = _fetcher(session, retry_policy=RetryPolicy(retries=3))
+    with pytest.raises(CommandErrorException):
+        fetcher.get_resp("/cli", data='{"commands": ["write memory"]}')
+    assert session.calls == 1
+
+
+def test_no_retries_by_default(sleeps):
+    session = FlakySession(FakeResponse(503))
+    assert _fetcher(session).get_resp("/monitoring/arp", throw=False) is False
+    assert session.calls == 1
+    assert sleeps == []
+
+
+def test_retry_after_is_capped():
+    policy = RetryPolicy(retries=1, max_backoff=10)
+
+    assert policy.delay(0, "3600") == 10
+    assert policy.delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert 0 <= policy.delay(5, "not a date") <= 10
+
+
+def test_limiter_backs_off_and_recovers():
+    limiter = AIMDLimiter(8, latency_target=1.0)
+
+    limiter.acquire()
+    limiter.release(0.1, overloaded=True)
+    assert limiter.limit == 4
+    limiter.acquire()
+    limiter.release(2.0)
+    assert limiter.limit == 2
+
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 8
+
+
+def test_limiter_caps_requests_in_flight():
+    limiter = AIMDLimiter(2)
+    limiter.acquire()
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not acquired.wait(0.05)
+    limiter.release(0.1)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_driver_options():
+    driver = asa.ASADriver(
+        "fw1", "admin", "secret", optional_args={"retries": 2, "max_concurrency": 3}
+    )
+
+    assert driver.device.retry_policy.retries == 2
+    assert driver.device.limiter.max_concurrency == 3
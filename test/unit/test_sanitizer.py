@@ -0,0 +1,83 @@
+"""Tests for the single pass config sanitizer."""
+
+import re
+
+import pytest
+from napalm.base.helpers import sanitize_config as napalm_sanitize_config
+
+from napalm_asa.constants import ASA_SANITIZE_FILTER_KEYWORDS, ASA_SANITIZE_FILTERS
+from napalm_asa.utils.sanitizer import sanitize_config, sanitize_lines
+
+CONFIG = """hostname fw1
+ enable password 8Ry2YjIyt7RRXU24 encrypted
+ username admin password s3cr3t privilege 15
+ username backup secret 5 $1$abcd
+ password 7 0822455D0A16
+ wpa-psk ascii 0 wireless
+ authentication key 7 0822455D
+tacacs-server host 10.0.0.5 key tacacs
+crypto isakmp key s3cr3t address 0.0.0.0 no-xauth
+ ip ospf message-digest-key 1 md5 ospfkey
+ ip ospf authentication-key ospfkey
+ neighbor 10.0.0.1 password 7 bgppass
+ vrrp 1 authentication text vrrppw
+ standby 1 authentication hsrppw
+ standby 1 authentication md5 key-string hsrpkey timeout 30
+ key-string 7 chainkey
+tacacs server TAC1
+ address ipv4 10.0.0.5
+ key tacacskey
+radius server RAD1
+ key 7 first
+ key last
+ timeout 5
+!
+ ppp chap password 0 ppppw
+interface GigabitEthernet0
+ description key 7 is not a secret here
+"""
+
+
+def test_filters_have_keywords():
+    assert set(ASA_SANITIZE_FILTER_KEYWORDS) == set(ASA_SANITIZE_FILTERS)
+
+    for pattern, keywords in ASA_SANITIZE_FILTER_KEYWORDS.items():
+        if keywords is None:
+            continue
+        for match in re.finditer(pattern, CONFIG, re.M):
+            assert any(keyword in match.group() for keyword in keywords), pattern
+
+
+@pytest.mark.parametrize("config", [CONFIG, CONFIG.rstrip("\n"), "", "\n\n"])
+def test_same_as_napalm(config):
+    expected = napalm_sanitize_config(config, ASA_SANITIZE_FILTERS)
+
+    assert sanitize_config(config) == expected
+
+
+def test_secrets_are_removed():
+    sanitized = sanitize_config(CONFIG)
+
+    for secret in ("s3cr3t", "wireless", "tacacskey", "ppppw", "hsrpkey"):
+        assert secret not in sanitized
+    assert " key <removed>\n timeout 5\n" in sanitized
+
+
+def test_lines_are_streamed():
+    lines = sanitize_lines(iter(["hostname fw1\n", " enable password x\n"]))
+
+    assert next(lines) == "hostname fw1\n"
+    assert next(lines) == " enable password <removed>\n"
+
+
+def test_server_block_is_held_back():
+    lines = sanitize_lines(
+        iter(["radius server R1\n", " key abc\n", "hostname fw1\n", " secret 5 x"])
+    )
+
+    assert list(lines) == [
+        "radius server R1\n",
+        " key <removed>\n",
+        "hostname fw1\n",
+        " secret <removed>",
+    ]
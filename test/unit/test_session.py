@@ -0,0 +1,71 @@
+"""Tests for the auth token lifecycle."""
+
+import threading
+import time
+
+from napalm_asa import asa
+from conftest import FakeSession
+
+
+def _fetcher(**kwargs):
+    fetcher = asa.RespFetcherHttps("admin", "secret", "https://fw1:443/api", **kwargs)
+    fetcher.session = FakeSession()
+    fetcher.get_auth_token()
+    return fetcher
+
+
+def test_is_alive_answers_from_recent_use():
+    fetcher = _fetcher(alive_freshness=60)
+    fetcher.get_resp("/monitoring/serialnumber")
+    requests = fetcher.session.requests
+
+    assert fetcher.has_active_token()
+    assert fetcher.session.requests == requests
+
+
+def test_is_alive_checks_the_device_by_default():
+    fetcher = _fetcher()
+
+    assert fetcher.has_active_token()
+    assert fetcher.session.requests == 1
+
+
+def test_token_age_is_tracked():
+    fetcher = _fetcher()
+
+    assert 0 <= fetcher.token_age < 1
+    fetcher.delete_token()
+    assert fetcher.last_success is None
+
+
+def test_concurrent_expiry_reauthenticates_once():
+    fetcher = _fetcher()
+    fetcher.session.valid_token = "revoked"
+    fetcher.session.latency = 0.05
+    errors = []
+
+    def worker():
+        try:
+            fetcher.get_resp("/monitoring/serialnumber")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert fetcher.session.issued == 2
+
+
+def test_idle_token_is_renewed_before_the_request():
+    fetcher = _fetcher(token_idle_timeout=0.01)
+    time.sleep(0.02)
+    fetcher.session.valid_token = "expired"
+
+    fetcher.get_resp("/monitoring/serialnumber")
+
+    assert fetcher.session.issued == 2
+    assert fetcher.session.requests == 1
@@ -0,0 +1,40 @@
+"""Tests for the interface snapshot cache."""
+
+from napalm_asa import extensions
+from conftest import CountingFakeASADevice
+
+
+def test_interface_endpoints_fetched_once_per_cycle(make_driver):
+    driver = make_driver(CountingFakeASADevice(), snapshot_cache=True)
+
+    driver.get_facts()
+    driver.get_interfaces()
+    driver.get_interfaces_ip()
+
+    assert driver.device.calls["/interfaces/physical"] == 1
+    assert driver.device.calls["/interfaces/portchannel"] == 1
+
+
+def test_cache_disabled_by_default(make_driver):
+    driver = make_driver(CountingFakeASADevice())
+
+    driver.get_interfaces()
+    driver.get_interfaces_ip()
+
+    assert driver.device.calls["/interfaces/physical"] == 2
+
+
+def test_expired_and_invalidated_snapshots_are_refetched(make_driver):
+    driver = make_driver(
+        CountingFakeASADevice(), snapshot_cache=True, snapshot_cache_ttl=0
+    )
+    driver.get_interfaces_ip()
+    driver.get_interfaces_ip()
+    assert driver.device.calls["/interfaces/vlan"] == 2
+
+    driver = make_driver(CountingFakeASADevice(), snapshot_cache=True)
+    driver.get_interfaces_ip()
+    extensions.invalidate_cache(driver, "/interfaces/vlan")
+    driver.get_interfaces_ip()
+    assert driver.device.calls["/interfaces/vlan"] == 2
+    assert driver.device.calls["/interfaces/physical"] == 1
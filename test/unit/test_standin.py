@@ -0,0 +1,96 @@
+"""Tests of the driver over HTTPS against the local ASA REST stand-in."""
+
+import io
+
+import pytest
+
+from napalm_asa import extensions
+from napalm_asa.asa import ASADriver
+from asa_standin import ASAStandIn
+
+
+@pytest.fixture(scope="module")
+def standin():
+    with ASAStandIn(interfaces=250, arp_entries=1000, config_scale=3) as asa:
+        yield asa
+
+
+@pytest.fixture
+def device(standin):
+    driver = ASADriver(**standin.driver_args())
+    driver.open()
+    yield driver
+    driver.close()
+
+
+def test_get_facts(device, standin):
+    facts = device.get_facts()
+
+    assert facts["hostname"] == "ASAvL1"
+    assert facts["serial_number"] == "9AVP5MLG543"
+    assert len(facts["interface_list"]) == 254
+
+
+def test_collections_are_paged(standin):
+    driver = ASADriver(**standin.driver_args(page_limit=50))
+    driver.open()
+    standin.requests.clear()
+
+    arp_table = driver.get_arp_table()
+    interfaces = driver.get_interfaces_ip()
+    driver.close()
+
+    assert len(arp_table) == 1000
+    assert len({entry["ip"] for entry in arp_table}) == 1000
+    assert len(interfaces) == 251
+    assert standin.requests[("GET", "/monitoring/arp")] == 20
+    assert standin.requests[("GET", "/interfaces/physical")] == 5
+
+
+def test_parallel_pages(standin):
+    driver = ASADriver(**standin.driver_args(parallel_pages=True, pool_maxsize=4))
+    driver.open()
+
+    assert len(driver.get_arp_table()) == 1000
+    assert len(driver.get_interfaces()) == 254
+    driver.close()
+
+
+def test_get_interfaces(device):
+    interfaces = device.get_interfaces()
+
+    assert len(interfaces) == 254
+    assert interfaces["GigabitEthernet0/7"]["mac_address"] == "008d.e000.0007"
+
+
+def test_config(device, standin):
+    running = standin.data.run("show running-config")
+    config = device.get_config(retrieve="running")
+    sink = io.StringIO()
+    extensions.stream_config(device, "running", sink, chunk_size=1024)
+
+    assert config["running"] == running
+    assert sink.getvalue() == running
+    assert (
+        extensions.get_config_if_changed(
+            device, extensions.get_config_checksum(device)
+        )[1]
+        is None
+    )
+
+
+def test_expired_token_is_renewed(device, standin):
+    standin.revoke_tokens()
+
+    assert len(device.get_arp_table()) == 1000
+    assert device.is_alive()["is_alive"]
+
+
+def test_close_deletes_the_token(standin):
+    driver = ASADriver(**standin.driver_args())
+    driver.open()
+    token = driver.device.token
+
+    assert standin.has_token(token)
+    driver.close()
+    assert not standin.has_token(token)
@@ -0,0 +1,113 @@
+"""Tests for streaming the configs to files."""
+
+import io
+import json
+
+import pytest
+from napalm.base.exceptions import CommandErrorException
+
+from napalm_asa import asa, extensions
+from napalm_asa.utils.json_codec import iter_json_strings
+from napalm_asa.utils.sanitizer import sanitize_config
+from conftest import FakeResponse, FakeSession
+
+STARTUP = "hostname fw1\n enable password startup\n"
+RUNNING = (
+    "hostname fw1\n"
+    ' description café "quoted" \\ back\n'
+    " username admin password s3cr3t\n"
+    "tacacs server TAC1\n"
+    " key tacacskey\n"
+    "!\n"
+) * 50
+
+
+class ConfigSession(FakeSession):
+    """Answer "show startup/running-config" with the configs above."""
+
+    def post(self, url, **kwargs):
+        if url.endswith("/tokenservices"):
+            return super().post(url, **kwargs)
+        self.requests += 1
+        if kwargs["headers"].get("X-Auth-Token") != self.valid_token:
+            return FakeResponse(401)
+        command = json.loads(kwargs["data"])["commands"][0]
+        config = STARTUP if command == "show startup-config" else RUNNING
+        return FakeResponse(200, body={"response": [config]})
+
+
+@pytest.fixture
+def device():
+    driver = asa.ASADriver("fw1", "admin", "secret")
+    driver.device.session = ConfigSession()
+    driver.open()
+    return driver
+
+
+def test_file_like_sink(device):
+    sink = io.StringIO()
+
+    written = extensions.stream_config(device, "all", sink, chunk_size=7)
+
+    assert sink.getvalue() == STARTUP + RUNNING
+    assert written == {"startup": len(STARTUP), "running": len(RUNNING)}
+
+
+def test_path_sinks(device, tmp_path):
+    paths = {"startup": str(tmp_path / "startup"), "running": str(tmp_path / "running")}
+
+    extensions.stream_config(device, "all", paths, sanitized=True, chunk_size=5)
+
+    with open(paths["running"], encoding="utf-8", newline="") as f:
+        assert f.read() == sanitize_config(RUNNING)
+    with open(paths["startup"], encoding="utf-8", newline="") as f:
+        assert f.read() == sanitize_config(STARTUP)
+
+
+def test_single_path_sink(device, tmp_path):
+    path = str(tmp_path / "configs")
+
+    written = extensions.stream_config(device, "all", path, chunk_size=5)
+
+    with open(path, encoding="utf-8", newline="") as f:
+        assert f.read() == STARTUP + RUNNING
+    assert written == {"startup": len(STARTUP), "running": len(RUNNING)}
+
+
+def test_retrieve_one_config(device):
+    sink = io.StringIO()
+
+    assert list(extensions.stream_config(device, "Running", sink)) == ["running"]
+    assert sink.getvalue() == RUNNING
+
+
+def test_expired_token_is_renewed(device):
+    device.device.session.valid_token = "revoked"
+    sink = io.StringIO()
+
+    extensions.stream_config(device, "startup", sink)
+
+    assert sink.getvalue() == STARTUP
+
+
+def test_error_status(device):
+    device.device.session.post = lambda url, **kwargs: FakeResponse(500)
+
+    with pytest.raises(CommandErrorException):
+        extensions.stream_config(device, "running", io.StringIO())
+
+
+def test_iter_json_strings_across_chunks():
+    body = json.dumps({"response": ["aé\\\n", "", "\U0001f600x"]}).encode()
+    chunks = [body[i : i + 1] for i in range(len(body))]
+
+    strings = {}
+    for index, fragment in iter_json_strings(chunks):
+        strings[index] = strings.get(index, "") + fragment
+
+    assert strings == {0: "aé\\\n", 2: "\U0001f600x"}
+
+
+def test_iter_json_strings_truncated():
+    with pytest.raises(ValueError):
+        list(iter_json_strings([b'{"response": ["abc']))
@@ -0,0 +1,113 @@
+"""Tests for sharing a driver between threads."""
+
+import threading
+
+import pytest
+from napalm.base.exceptions import ConnectionException
+
+from napalm_asa import asa
+from napalm_asa.metrics import MetricsCollector
+from napalm_asa.utils.singleflight import SingleFlight
+from conftest import FakeSession
+
+
+def _fetcher(**kwargs):
+    fetcher = asa.RespFetcherHttps("admin", "secret", "https://fw1/api", **kwargs)
+    fetcher.session = FakeSession()
+    fetcher.get_auth_token()
+    fetcher.session.latency = 0.1
+    return fetcher
+
+
+def _concurrently(func, count=5):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_token_is_not_stored_in_the_session():
+    fetcher = _fetcher()
+
+    assert "X-Auth-Token" not in fetcher.session.headers
+    assert fetcher.get_resp("/monitoring/serialnumber")["serialNumber"] == "9A"
+
+
+def test_concurrent_identical_gets_are_coalesced():
+    metrics = MetricsCollector()
+    fetcher = _fetcher(hooks=[metrics])
+
+    results = _concurrently(lambda: fetcher.get_resp("/monitoring/serialnumber"))
+
+    assert fetcher.session.requests == 1
+    assert all(result == results[0] for result in results)
+    # Every caller gets its own decoded response, safe to modify.
+    assert len({id(result) for result in results}) == len(results)
+    assert metrics.to_dict()["requests"][0]["count"] == len(results)
+
+
+def test_coalescing_can_be_disabled():
+    fetcher = _fetcher(coalesce=False)
+
+    _concurrently(lambda: fetcher.get_resp("/monitoring/serialnumber"))
+
+    assert fetcher.session.requests == 5
+
+
+def test_different_requests_are_not_coalesced():
+    fetcher = _fetcher()
+    offsets = iter(range(5))
+    lock = threading.Lock()
+
+    def get_page():
+        with lock:
+            offset = next(offsets)
+        return fetcher.get_resp("/monitoring/arp", params={"offset": offset})
+
+    _concurrently(get_page)
+
+    assert fetcher.session.requests == 5
+
+
+def test_errors_are_shared():
+    fetcher = _fetcher()
+    fetcher.session.valid_token = None
+
+    results = _concurrently(
+        lambda: fetcher.get_resp("/monitoring/serialnumber", reauth=False)
+    )
+
+    assert all(isinstance(result, Exception) for result in results)
+    assert fetcher.session.requests == 1
+
+
+def test_single_flight_calls_in_sequence():
+    calls = []
+    single_flight = SingleFlight()
+
+    assert single_flight.do("key", calls.append, 1) == (None, False)
+    assert single_flight.do("key", calls.append, 2) == (None, False)
+    assert calls == [1, 2]
+
+
+def test_single_flight_error():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ConnectionException("down")
+
+    with pytest.raises(ConnectionException):
+        single_flight.do("key", fail)
+    assert single_flight._calls == {}
@@ -0,0 +1,94 @@
+"""Tests for auth token reuse."""
+
+import json
+import multiprocessing
+import os
+import stat
+
+from napalm_asa import asa
+from napalm_asa.token_store import FileTokenStore, MemoryTokenStore
+from conftest import FakeSession
+
+
+def _driver(session, token_store):
+    driver = asa.ASADriver(
+        "fw1", "admin", "secret", optional_args={"token_store": token_store}
+    )
+    driver.device.session = session
+    return driver
+
+
+def test_open_reuses_stored_token_and_close_keeps_it():
+    session = FakeSession()
+    store = MemoryTokenStore()
+
+    driver = _driver(session, store)
+    driver.open()
+    driver.close()
+    driver = _driver(session, store)
+    driver.open()
+    driver.close()
+
+    assert session.issued == 1
+    assert session.deleted == 0
+    assert store.get("admin@https://fw1:443/api") == "token1"
+
+
+def test_expired_token_is_reacquired_transparently():
+    session = FakeSession()
+    store = MemoryTokenStore()
+    driver = _driver(session, store)
+    driver.open()
+
+    session.valid_token = "revoked"
+    assert driver._send_request("/monitoring/serialnumber")["serialNumber"] == "9A"
+
+    assert session.issued == 2
+    assert store.get("admin@https://fw1:443/api") == "token2"
+
+
+def test_file_token_store(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    store = FileTokenStore(path)
+
+    store.set("admin@https://fw1:443/api", "abc")
+    assert FileTokenStore(path).get("admin@https://fw1:443/api") == "abc"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    store.delete("admin@https://fw1:443/api")
+    assert FileTokenStore(path).get("admin@https://fw1:443/api") is None
+    assert FileTokenStore(str(tmp_path / "missing.json")).get("x") is None
+
+
+def test_token_store_path_option(tmp_path):
+    driver = asa.ASADriver(
+        "fw1",
+        "admin",
+        "secret",
+        optional_args={"token_store": str(tmp_path / "tokens.json")},
+    )
+
+    assert isinstance(driver.device.token_store, FileTokenStore)
+
+
+def _store_tokens(path, worker):
+    store = FileTokenStore(path)
+    for i in range(20):
+        store.set("user{}@fw{}".format(worker, i), "token")
+
+
+def test_file_token_store_across_processes(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    workers = [
+        context.Process(target=_store_tokens, args=(path, worker))
+        for worker in range(6)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with open(path) as token_file:
+        assert len(json.load(token_file)) == 120